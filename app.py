@@ -14,6 +14,8 @@ load_dotenv()
 
 # Import authentication routes
 from auth_routes import setup_auth_routes, create_user_session, DATABASE
+from utils.migrations import migrate_database
+from utils.rate_limit import install_rate_limiter
 
 # Create standalone Flask app for authentication
 app = Flask(__name__)
@@ -24,6 +26,7 @@ app.permanent_session_lifetime = timedelta(days=30)
 
 # Setup authentication routes
 setup_auth_routes(app)
+install_rate_limiter(app)
 
 
 # Environment check
@@ -49,45 +52,8 @@ def check_environment():
 
 
 def init_database():
-    """Initialize the database with required tables"""
-    import sqlite3
-
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
-
-    # Users table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT UNIQUE NOT NULL,
-            username TEXT UNIQUE NOT NULL,
-            password_hash TEXT,
-            full_name TEXT,
-            role TEXT DEFAULT 'user',
-            is_active INTEGER DEFAULT 1,
-            is_approved INTEGER DEFAULT 0,
-            google_auth INTEGER DEFAULT 0,
-            google_id TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            last_login TIMESTAMP
-        )
-    ''')
-
-    # User sessions table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS user_sessions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            session_token TEXT UNIQUE NOT NULL,
-            user_id INTEGER NOT NULL,
-            user_email TEXT NOT NULL,
-            expires_at TIMESTAMP NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
-
-    conn.commit()
-    conn.close()
+    """Bring the database up to the current schema (see migrate_db.py)"""
+    migrate_database(DATABASE)
     print("✅ Database initialized")
 
 
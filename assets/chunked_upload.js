@@ -0,0 +1,133 @@
+// Admin Data Upload form: sends the chosen file to /upload in chunks (see utils/data_upload.py),
+// then polls the server while it validates and publishes the dataset.
+(function () {
+    var POLL_MS = 2000;
+    var ACCEPT = '.xlsx,.xls,.csv';
+    var chosenFile = null;
+
+    function escapeHtml(text) {
+        var div = document.createElement('div');
+        div.textContent = text;
+        return div.innerHTML;
+    }
+
+    function showStatus(color, message, percent, details) {
+        var target = document.getElementById('upload-status');
+        if (!target) {
+            return;
+        }
+        var html = '<div class="alert alert-' + color + ' mb-0">' + escapeHtml(message);
+        if (percent !== null) {
+            html += '<div class="progress mt-2"><div class="progress-bar progress-bar-striped progress-bar-animated"' +
+                ' style="width: ' + percent + '%">' + percent + '%</div></div>';
+        }
+        if (details && details.length) {
+            html += '<ul class="mb-0 mt-2 small">' + details.map(function (item) {
+                return '<li>' + escapeHtml(item) + '</li>';
+            }).join('') + '</ul>';
+        }
+        target.innerHTML = html + '</div>';
+    }
+
+    function request(method, url, body, headers) {
+        return fetch(url, {method: method, body: body, headers: headers || {}, credentials: 'same-origin'})
+            .then(function (response) {
+                return response.json().then(function (data) {
+                    if (!response.ok) {
+                        throw new Error(data.error || response.statusText);
+                    }
+                    return data;
+                });
+            });
+    }
+
+    function sendChunks(file, status) {
+        if (status.received >= file.size) {
+            return Promise.resolve(status);
+        }
+        var end = Math.min(status.received + status.chunk_size, file.size);
+        showStatus('info', 'Uploading ' + file.name, Math.round(100 * status.received / file.size), null);
+        return request('PUT', '/upload/' + status.id + '/chunk?offset=' + status.received,
+            file.slice(status.received, end), {'Content-Type': 'application/octet-stream'})
+            .then(function (next) {
+                return sendChunks(file, next);
+            });
+    }
+
+    function poll(id, button) {
+        request('GET', '/upload/' + id + '/status').then(function (status) {
+            if (status.state === 'done') {
+                showStatus('success', status.message, null, status.warnings);
+                button.disabled = false;
+            } else if (status.state === 'failed') {
+                showStatus('danger', status.message, null, status.errors);
+                button.disabled = false;
+            } else {
+                showStatus('info', status.message, null, null);
+                setTimeout(function () { poll(id, button); }, POLL_MS);
+            }
+        }).catch(function (error) {
+            showStatus('danger', error.message, null, null);
+            button.disabled = false;
+        });
+    }
+
+    function chooseFile() {
+        var input = document.createElement('input');
+        input.type = 'file';
+        input.accept = ACCEPT;
+        input.addEventListener('change', function () {
+            chosenFile = input.files[0] || null;
+            var label = document.getElementById('upload-file-name');
+            if (label && chosenFile) {
+                label.textContent = chosenFile.name;
+            }
+        });
+        input.click();
+    }
+
+    // Dash renders the form after load (and again on every visit to the tab), so listen at the document
+    document.addEventListener('click', function (event) {
+        if (event.target.closest('#upload-choose-btn')) {
+            event.preventDefault();
+            chooseFile();
+            return;
+        }
+
+        var button = event.target.closest('#upload-data-btn');
+        if (!button) {
+            return;
+        }
+        event.preventDefault();
+
+        // A re-rendered form shows no file again, so only upload the one it names
+        var label = document.getElementById('upload-file-name');
+        var file = chosenFile;
+        if (!file || !label || label.textContent !== file.name) {
+            showStatus('warning', 'Choose a file to upload first', null, null);
+            return;
+        }
+
+        button.disabled = true;
+        var body = JSON.stringify({
+            dataset: document.getElementById('upload-dataset-select').value,
+            filename: file.name,
+            size: file.size
+        });
+        request('POST', '/upload/start', body, {'Content-Type': 'application/json'})
+            .then(function (status) {
+                return sendChunks(file, status);
+            })
+            .then(function (status) {
+                return request('POST', '/upload/' + status.id + '/complete');
+            })
+            .then(function (status) {
+                showStatus('info', status.message, null, null);
+                poll(status.id, button);
+            })
+            .catch(function (error) {
+                showStatus('danger', error.message, null, null);
+                button.disabled = false;
+            });
+    });
+})();
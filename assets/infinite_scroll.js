@@ -0,0 +1,37 @@
+// Infinite scroll for windowed lists: any button with the class "load-more-on-scroll"
+// is clicked when it scrolls into view, so the next window loads without a click.
+(function () {
+    var THROTTLE_MS = 500;
+    var lastClick = 0;
+
+    var observer = new IntersectionObserver(function (entries) {
+        entries.forEach(function (entry) {
+            var button = entry.target;
+            if (!entry.isIntersecting || button.disabled) {
+                return;
+            }
+            // Wait for the previous window to arrive before asking for another
+            if (button.closest('[data-dash-is-loading="true"]') || Date.now() - lastClick < THROTTLE_MS) {
+                return;
+            }
+            lastClick = Date.now();
+            button.click();
+        });
+    });
+
+    // Dash renders pages after load, so (re)observe buttons whenever the DOM changes.
+    // Re-observing also re-checks a button that is still visible after a short window.
+    var pending = null;
+    new MutationObserver(function () {
+        if (pending) {
+            return;
+        }
+        pending = setTimeout(function () {
+            pending = null;
+            document.querySelectorAll('.load-more-on-scroll').forEach(function (button) {
+                observer.unobserve(button);
+                observer.observe(button);
+            });
+        }, THROTTLE_MS);
+    }).observe(document.documentElement, {childList: true, subtree: true});
+})();
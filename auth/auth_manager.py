@@ -1,9 +1,13 @@
-import hashlib
 import secrets
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta
 import sqlite3
 from typing import Dict, Optional, Any
 
+from auth.credential_verifier import (credential_verifier, hash_password,
+                                      verify_password, VerifierBusyError)
+from auth.login_lockout import format_lockout_message, get_login_lockout
+
 
 class AuthManager:
     """Handles all authentication and session management"""
@@ -11,12 +15,24 @@ class AuthManager:
     def __init__(self, db_path: str = "usc_ir.db"):
         self.db_path = db_path
         self.session_duration = timedelta(hours=8)  # 8-hour sessions
+        self.lockout = get_login_lockout(db_path)
 
-    def authenticate(self, username: str, password: str) -> Dict[str, Any]:
+    def authenticate(self, username: str, password: str,
+                     ip_address: Optional[str] = None) -> Dict[str, Any]:
         """
         Authenticate user credentials
+        Password verification runs on the shared credential pool, limited per ip_address
+        Locked-out usernames/addresses are rejected before any database or hashing work
         Returns: {"success": bool, "user": dict, "message": str}
         """
+        locked_for = self.lockout.locked_for(username, ip_address)
+        if locked_for > 0:
+            return {
+                "success": False,
+                "user": None,
+                "message": format_lockout_message(locked_for)
+            }
+
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
@@ -32,21 +48,34 @@ class AuthManager:
             conn.close()
 
             if not user_row:
+                self.lockout.record_failure(username, ip_address)
                 return {
                     "success": False,
                     "user": None,
                     "message": "Invalid username or password"
                 }
 
-            # Verify password
+            # Verify password off the request thread
             stored_hash = user_row[2]
-            if not self._verify_password(password, stored_hash):
+            try:
+                password_ok = credential_verifier.verify(password, stored_hash, client_id=ip_address)
+            except (VerifierBusyError, FutureTimeoutError):
+                return {
+                    "success": False,
+                    "user": None,
+                    "message": "Too many sign-in attempts in progress. Please try again shortly."
+                }
+
+            if not password_ok:
+                self.lockout.record_failure(username, ip_address)
                 return {
                     "success": False,
                     "user": None,
                     "message": "Invalid username or password"
                 }
 
+            self.lockout.record_success(username, ip_address)
+
             # Create user object
             user = {
                 "id": user_row[0],
@@ -185,30 +214,17 @@ class AuthManager:
 
     def _hash_password(self, password: str) -> str:
         """Hash password with salt"""
-        salt = secrets.token_hex(16)
-        password_hash = hashlib.pbkdf2_hmac('sha256',
-                                            password.encode('utf-8'),
-                                            salt.encode('utf-8'),
-                                            100000)
-        return f"{salt}:{password_hash.hex()}"
+        return hash_password(password)
 
     def _verify_password(self, password: str, stored_hash: str) -> bool:
-        """Verify password against stored hash"""
-        try:
-            salt, hash_hex = stored_hash.split(':')
-            password_hash = hashlib.pbkdf2_hmac('sha256',
-                                                password.encode('utf-8'),
-                                                salt.encode('utf-8'),
-                                                100000)
-            return password_hash.hex() == hash_hex
-        except:
-            return False
+        """Verify password against stored hash (constant-time comparison)"""
+        return verify_password(password, stored_hash)
 
     def create_user(self, username: str, password: str, email: str,
                     full_name: str, department: str, is_admin: bool = False) -> bool:
         """Create a new user (admin function)"""
         try:
-            password_hash = self._hash_password(password)
+            password_hash = credential_verifier.hash(password)
 
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
@@ -0,0 +1,125 @@
+"""
+Pooled PBKDF2 credential hashing and verification
+
+Password hashing runs on a small bounded thread pool (hashlib releases the GIL
+while deriving keys), so a burst of logins cannot occupy every request thread
+or starve dashboard callbacks of CPU.
+"""
+
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import AUTH_CONFIG
+
+PBKDF2_ITERATIONS = 100000
+
+
+class VerifierBusyError(Exception):
+    """Raised when the verification queue or a client's concurrency limit is full"""
+
+
+def hash_password(password: str) -> str:
+    """Hash password with salt"""
+    salt = secrets.token_hex(16)
+    password_hash = hashlib.pbkdf2_hmac('sha256',
+                                        password.encode('utf-8'),
+                                        salt.encode('utf-8'),
+                                        PBKDF2_ITERATIONS)
+    return f"{salt}:{password_hash.hex()}"
+
+
+def verify_password(password: str, stored_hash: str) -> bool:
+    """Verify password against stored hash using a constant-time comparison"""
+    try:
+        salt, hash_hex = stored_hash.split(':')
+    except (AttributeError, ValueError):
+        return False
+
+    password_hash = hashlib.pbkdf2_hmac('sha256',
+                                        password.encode('utf-8'),
+                                        salt.encode('utf-8'),
+                                        PBKDF2_ITERATIONS)
+    return hmac.compare_digest(password_hash.hex(), hash_hex)
+
+
+class CredentialVerifier:
+    """Runs password hashing on a bounded worker pool with per-client limits"""
+
+    def __init__(self, workers: int = None, queue_size: int = None,
+                 per_client_limit: int = None, timeout: float = None):
+        self.workers = workers or AUTH_CONFIG['password_hash_workers']
+        self.queue_size = queue_size if queue_size is not None else AUTH_CONFIG['password_hash_queue_size']
+        self.per_client_limit = per_client_limit or AUTH_CONFIG['max_login_attempts']
+        self.timeout = timeout or AUTH_CONFIG['password_hash_timeout_seconds']
+
+        # Running + queued jobs; anything beyond this is rejected instead of waiting
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self._client_counts = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the pool lazily, once per process (gunicorn forks after import)"""
+        if self._executor is None or self._pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                        thread_name_prefix="credential-verifier")
+                    self._pid = os.getpid()
+        return self._executor
+
+    def _acquire(self, client_id):
+        if not self._slots.acquire(blocking=False):
+            raise VerifierBusyError("Too many sign-in attempts in progress")
+
+        if client_id is None:
+            return
+
+        with self._lock:
+            in_flight = self._client_counts.get(client_id, 0)
+            if in_flight >= self.per_client_limit:
+                self._slots.release()
+                raise VerifierBusyError(f"Too many concurrent sign-in attempts from {client_id}")
+            self._client_counts[client_id] = in_flight + 1
+
+    def _release(self, client_id):
+        if client_id is not None:
+            with self._lock:
+                remaining = self._client_counts.get(client_id, 1) - 1
+                if remaining > 0:
+                    self._client_counts[client_id] = remaining
+                else:
+                    self._client_counts.pop(client_id, None)
+
+        self._slots.release()
+
+    def submit(self, func, *args, client_id=None):
+        """Queue a hashing job; raises VerifierBusyError when the pool is saturated"""
+        self._acquire(client_id)
+        try:
+            future = self._get_executor().submit(func, *args)
+        except Exception:
+            self._release(client_id)
+            raise
+
+        future.add_done_callback(lambda _: self._release(client_id))
+        return future
+
+    def verify(self, password: str, stored_hash: str, client_id: str = None) -> bool:
+        """Verify a password on the pool, waiting at most the configured timeout"""
+        return self.submit(verify_password, password, stored_hash,
+                           client_id=client_id).result(timeout=self.timeout)
+
+    def hash(self, password: str, client_id: str = None) -> str:
+        """Hash a password on the pool, waiting at most the configured timeout"""
+        return self.submit(hash_password, password,
+                           client_id=client_id).result(timeout=self.timeout)
+
+
+# Global instance shared by the request handlers
+credential_verifier = CredentialVerifier()
@@ -0,0 +1,235 @@
+"""
+Failed sign-in tracking and lockout
+
+Failures are counted per username and per client IP in a sliding window of
+AUTH_CONFIG['login_attempt_window_minutes'], approximated with two fixed
+windows (this one plus a weighted share of the previous one), so each key costs
+three integers and every update is O(1). Reaching max_login_attempts locks the
+key for lockout_duration_minutes.
+
+The lockout check is a dict lookup and runs before the user lookup and the
+PBKDF2 verification, so a locked-out brute-force client costs microseconds
+instead of a hashing job. Counters are persisted to the login_lockouts table
+every lockout_persist_seconds by a background thread; lockouts recorded there
+by other gunicorn workers are picked up on the same cycle.
+"""
+
+import atexit
+import math
+import os
+import sqlite3
+import threading
+import time
+
+from config import AUTH_CONFIG
+
+UPSERT_LOCKOUT_SQL = '''
+    INSERT INTO login_lockouts (key, window_index, current_failures, previous_failures, locked_until, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(key) DO UPDATE SET
+        window_index = excluded.window_index,
+        current_failures = excluded.current_failures,
+        previous_failures = excluded.previous_failures,
+        -- A reset (successful sign-in) clears the lockout; otherwise keep the later one
+        locked_until = CASE WHEN excluded.current_failures = 0 AND excluded.previous_failures = 0
+                            THEN excluded.locked_until
+                            ELSE MAX(locked_until, excluded.locked_until) END,
+        updated_at = excluded.updated_at
+'''
+
+
+class LoginLockout:
+    """Sliding-window failure counters and lockouts for one database"""
+
+    def __init__(self, db_path: str = "usc_ir.db", max_attempts: int = None,
+                 max_attempts_per_ip: int = None, window_minutes: float = None,
+                 lockout_minutes: float = None, persist_interval: float = None):
+        self.db_path = db_path
+        self.max_attempts = max_attempts or AUTH_CONFIG['max_login_attempts']
+        self.max_attempts_per_ip = max_attempts_per_ip or AUTH_CONFIG['max_login_attempts_per_ip']
+        self.window = (window_minutes or AUTH_CONFIG['login_attempt_window_minutes']) * 60
+        self.lockout = (lockout_minutes or AUTH_CONFIG['lockout_duration_minutes']) * 60
+        self.persist_interval = persist_interval or AUTH_CONFIG['lockout_persist_seconds']
+
+        self._counters = {}  # key -> (window_index, current_failures, previous_failures)
+        self._locked_until = {}  # key -> epoch seconds
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._thread = None
+        self._pid = None
+
+    @staticmethod
+    def keys_for(username: str = None, ip_address: str = None):
+        keys = []
+        if username:
+            keys.append(f"user:{username.strip().lower()}")
+        if ip_address:
+            keys.append(f"ip:{ip_address}")
+        return keys
+
+    def locked_for(self, username: str = None, ip_address: str = None) -> float:
+        """Seconds until sign-in is allowed again for this username/IP (0 when not locked)"""
+        self._ensure_started()
+        now = time.time()
+        remaining = 0
+        for key in self.keys_for(username, ip_address):
+            remaining = max(remaining, self._locked_until.get(key, 0) - now)
+        return remaining
+
+    @staticmethod
+    def _roll(counter, window_index: int):
+        """(current, previous) failure counts as seen from window_index"""
+        index, current, previous = counter
+        if index == window_index:
+            return current, previous
+        if index == window_index - 1:
+            return 0, current
+        return 0, 0
+
+    def record_failure(self, username: str = None, ip_address: str = None) -> float:
+        """Count a failed sign-in; returns the lockout length in seconds if this one triggered it"""
+        self._ensure_started()
+        now = time.time()
+        window_index = int(now // self.window)
+        locked = 0
+
+        with self._lock:
+            for key in self.keys_for(username, ip_address):
+                current, previous = self._roll(self._counters.get(key, (window_index, 0, 0)), window_index)
+                current += 1
+                self._counters[key] = (window_index, current, previous)
+                self._dirty.add(key)
+
+                # Sliding-window estimate: this window plus the unexpired share of the last one
+                failures = current + previous * (1 - (now % self.window) / self.window)
+                limit = self.max_attempts_per_ip if key.startswith('ip:') else self.max_attempts
+                if failures >= limit:
+                    self._locked_until[key] = now + self.lockout
+                    locked = self.lockout
+
+        return locked
+
+    def record_success(self, username: str = None, ip_address: str = None):
+        """Clear the username's failures (the IP keeps its count: one success doesn't vouch for it)"""
+        key = self.keys_for(username)[0] if username else None
+        if key is None or key not in self._counters:
+            return
+
+        with self._lock:
+            self._counters.pop(key, None)
+            self._locked_until.pop(key, None)
+            self._dirty.add(key)
+
+    # ---------- persistence ----------
+
+    def _ensure_started(self):
+        """Load persisted counters and start the persist thread, once per process"""
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+
+            if not self._loaded:
+                self._load()
+                self._loaded = True
+
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="login-lockout", daemon=True)
+            self._thread.start()
+
+    def _load(self):
+        now = time.time()
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                rows = conn.execute('''
+                    SELECT key, window_index, current_failures, previous_failures, locked_until
+                    FROM login_lockouts
+                    WHERE locked_until > ? OR window_index >= ?
+                ''', (now, int(now // self.window) - 1)).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Could not load login lockouts: {e}")
+            return
+
+        for key, window_index, current, previous, locked_until in rows:
+            self._counters[key] = (window_index, current, previous)
+            if locked_until and locked_until > now:
+                self._locked_until[key] = locked_until
+
+    def _run(self):
+        while True:
+            time.sleep(self.persist_interval)
+            self.flush()
+
+    def flush(self):
+        """Write changed counters and pick up lockouts recorded by other processes"""
+        now = time.time()
+        current_window = int(now // self.window)
+
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            rows = []
+            for key in dirty:
+                window_index, current, previous = self._counters.get(key, (current_window, 0, 0))
+                rows.append((key, window_index, current, previous,
+                             self._locked_until.get(key, 0), now))
+
+            # Forget keys whose window has passed and that are not locked
+            for key, (window_index, _, _) in list(self._counters.items()):
+                if window_index < current_window - 1 and self._locked_until.get(key, 0) <= now:
+                    self._counters.pop(key, None)
+                    self._locked_until.pop(key, None)
+
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            try:
+                with conn:
+                    if rows:
+                        conn.executemany(UPSERT_LOCKOUT_SQL, rows)
+                    conn.execute('DELETE FROM login_lockouts WHERE locked_until < ? AND window_index < ?',
+                                 (now, current_window - 1))
+                remote = conn.execute('SELECT key, locked_until FROM login_lockouts WHERE locked_until > ?',
+                                      (now,)).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Could not persist login lockouts: {e}")
+            with self._lock:
+                self._dirty.update(dirty)
+            return
+
+        with self._lock:
+            for key, locked_until in remote:
+                if locked_until > self._locked_until.get(key, 0):
+                    self._locked_until[key] = locked_until
+
+
+def format_lockout_message(seconds: float) -> str:
+    minutes = max(math.ceil(seconds / 60), 1)
+    return f"Too many failed sign-in attempts. Please try again in {minutes} minute{'s' if minutes != 1 else ''}."
+
+
+_lockouts = {}
+_lockouts_lock = threading.Lock()
+
+
+def get_login_lockout(db_path: str = "usc_ir.db") -> LoginLockout:
+    """Shared lockout tracker for a database"""
+    with _lockouts_lock:
+        lockout = _lockouts.get(db_path)
+        if lockout is None:
+            lockout = _lockouts[db_path] = LoginLockout(db_path)
+        return lockout
+
+
+@atexit.register
+def flush_login_lockouts():
+    """Persist outstanding counters on interpreter shutdown"""
+    for lockout in list(_lockouts.values()):
+        if lockout._dirty:
+            lockout.flush()
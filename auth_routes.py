@@ -7,22 +7,16 @@ from datetime import datetime, timedelta
 from flask import request, jsonify, session, redirect, make_response
 import traceback
 
-# Google Auth imports
-try:
-    from google.auth.transport import requests
-    from google.oauth2 import id_token
-
-    GOOGLE_AUTH_AVAILABLE = True
-except ImportError:
-    print(
-        "⚠️ Google Auth libraries not installed. Run: pip install google-auth google-auth-oauthlib google-auth-httplib2")
-    GOOGLE_AUTH_AVAILABLE = False
+# Google Auth (certificates cached and signatures verified locally)
+from google_token_verifier import verify_google_id_token, GOOGLE_AUTH_AVAILABLE
 
 # Configuration
 DATABASE = 'usc_portal.db'
 GOOGLE_CLIENT_ID = os.getenv('GOOGLE_CLIENT_ID',
                              '890006312213-3k7f200g3a94je1j9trfjru716v3kidc.apps.googleusercontent.com')
-MAIN_APP_URL = "http://localhost:8050"
+# Set both to '' when the auth routes are mounted on the Dash server (see unified_app.py)
+MAIN_APP_URL = os.getenv('MAIN_APP_URL', "http://localhost:8050")
+AUTH_SERVER_URL = os.getenv('AUTH_SERVER_URL', "http://localhost:5000")
 
 print(f"🔍 Auth routes loaded with Client ID: {GOOGLE_CLIENT_ID[:20]}...")
 
@@ -55,6 +49,20 @@ def create_user_session(user_id, email):
     return session_token
 
 
+def get_session_payload():
+    """Build the session summary shared with Dash (works in-process or over HTTP)"""
+    if session.get('authenticated'):
+        return {
+            'authenticated': True,
+            'token': session.get('token'),
+            'user_id': session.get('user_id'),
+            'email': session.get('email'),
+            'full_name': session.get('full_name'),
+            'role': session.get('role', 'user')
+        }
+    return {'authenticated': False}
+
+
 def setup_auth_routes(app):
     """Setup authentication routes with fixed session handling"""
 
@@ -71,6 +79,10 @@ def setup_auth_routes(app):
             with open('login.html', 'r', encoding='utf-8') as f:
                 content = f.read()
 
+            # login.html targets the two-server layout; point it at this server when unified
+            content = content.replace('http://localhost:5000', AUTH_SERVER_URL)
+            content = content.replace('http://localhost:8050', MAIN_APP_URL)
+
             # Create response with no-cache headers to prevent the "small page" issue
             response = make_response(content)
             response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
@@ -107,11 +119,7 @@ def setup_auth_routes(app):
             print(f"🔍 Received Google credential: {len(credential)} characters")
 
             # Verify Google token
-            idinfo = id_token.verify_oauth2_token(
-                credential,
-                requests.Request(),
-                GOOGLE_CLIENT_ID
-            )
+            idinfo = verify_google_id_token(credential, GOOGLE_CLIENT_ID)
 
             # Validate token issuer
             if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
@@ -233,17 +241,7 @@ def setup_auth_routes(app):
     def get_session_data():
         """Get current session data for Dash synchronization"""
         try:
-            if session.get('authenticated'):
-                return jsonify({
-                    'authenticated': True,
-                    'token': session.get('token'),
-                    'user_id': session.get('user_id'),
-                    'email': session.get('email'),
-                    'full_name': session.get('full_name'),
-                    'role': session.get('role', 'user')
-                })
-            else:
-                return jsonify({'authenticated': False})
+            return jsonify(get_session_payload())
         except Exception as e:
             print(f"Session data error: {e}")
             return jsonify({'authenticated': False, 'error': str(e)})
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+USC IR Portal - Payload Compression Benchmark
+Measures the bytes the heaviest callback responses put on the wire, raw and
+compressed the way utils/compression.py does it, plus the time spent compressing
+
+USAGE:
+    python benchmark_payloads.py
+"""
+
+import time
+
+from dash._utils import to_json
+
+from utils.compression import brotli, compress
+
+
+def callback_response(output_id: str, prop: str, value) -> bytes:
+    """The body Dash sends back for a single-output callback"""
+    return to_json({'multi': True, 'response': {output_id: {prop: value}}}).encode('utf-8')
+
+
+def heavy_payloads():
+    """(name, callback response body) for the heaviest callbacks"""
+    from pages.ultra_safe_student_labour import (create_employment_chart, create_expense_chart,
+                                                 create_monthly_expense_chart)
+    from components.admin_dashboard import create_admin_dashboard
+    from components.factbook import create_factbook_layout
+    import simple_app
+
+    return [
+        ('Employment chart (figure)', callback_response(
+            'employment-chart', 'figure', create_employment_chart('numbers', 'both', None))),
+        ('Expense chart (figure)', callback_response(
+            'expense-chart', 'figure', create_expense_chart('bar', 'numbers', None))),
+        ('Monthly expense chart (figure)', callback_response(
+            'monthly-expense-chart', 'figure', create_monthly_expense_chart('bar', None))),
+        ('Factbook page (layout)', callback_response('page-content', 'children', create_factbook_layout())),
+        ('Admin dashboard (layout)', callback_response('page-content', 'children', create_admin_dashboard())),
+        ('Landing page (simple_app routing)', callback_response(
+            'page-layout', 'children', simple_app.display_page_content('', None))),
+    ]
+
+
+def measure(data: bytes, encoding: str):
+    started = time.perf_counter()
+    for _ in range(5):
+        compressed = compress(data, encoding)
+    return len(compressed), (time.perf_counter() - started) / 5 * 1000
+
+
+def main():
+    encodings = ['gzip'] + (['br'] if brotli is not None else [])
+
+    header = f"{'Payload':<36}{'raw':>10}"
+    for encoding in encodings:
+        header += f"{encoding:>10}{'ratio':>8}{'ms':>7}"
+    print(header)
+    print('-' * len(header))
+
+    totals = {'raw': 0, **{encoding: 0 for encoding in encodings}}
+    for name, data in heavy_payloads():
+        line = f"{name:<36}{len(data) / 1024:>8.1f}KB"
+        totals['raw'] += len(data)
+        for encoding in encodings:
+            size, elapsed = measure(data, encoding)
+            totals[encoding] += size
+            line += f"{size / 1024:>8.1f}KB{size / len(data):>8.0%}{elapsed:>7.1f}"
+        print(line)
+
+    line = f"{'Total':<36}{totals['raw'] / 1024:>8.1f}KB"
+    for encoding in encodings:
+        line += f"{totals[encoding] / 1024:>8.1f}KB{totals[encoding] / totals['raw']:>8.0%}{'':>7}"
+    print('-' * len(header))
+    print(line)
+
+    if brotli is None:
+        print("\n(install Brotli to include br)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+USC IR Portal - Asset Build
+Generates the resized AVIF/WebP/JPEG variants of large images (see utils/image_pipeline.py)
+Run once per deploy, before export_static.py
+
+USAGE:
+    python build_assets.py            # Build variants for changed source images
+    python build_assets.py --force    # Rebuild every variant
+"""
+
+import sys
+
+from utils.image_pipeline import build_all
+
+
+def main():
+    try:
+        manifest = build_all(force='--force' in sys.argv)
+    except ImportError:
+        print("❌ Pillow is required to build image variants: pip install Pillow")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Asset build failed: {e}")
+        sys.exit(1)
+
+    for name, entry in manifest.items():
+        print(f"✅ {name} ({entry['width']}x{entry['height']})")
+        for fmt, variants in entry['variants'].items():
+            sizes = ', '.join(f"{variant['width']}w {variant['bytes'] / 1024:.0f} KB" for variant in variants)
+            print(f"   {fmt:<5} {sizes}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+"""
+Dash callbacks for the component pages
+Importing the package registers them (main_app.py)
+"""
+
+from callbacks import admin_callbacks
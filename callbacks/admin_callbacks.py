@@ -0,0 +1,277 @@
+"""
+Admin dashboard callbacks
+
+Registered on import (callbacks/__init__.py). The admin page itself is only
+served to admins, but callbacks can be called directly, so each one checks
+the session-store token against the portal's sessions again.
+"""
+
+import sqlite3
+from datetime import datetime
+
+import dash_bootstrap_components as dbc
+from dash import callback, ctx, dcc, html, Input, Output, State, no_update
+
+from components.admin_dashboard import (AUDIT_PAGE_SIZE, create_access_requests_tab, create_audit_log_tab,
+                                        create_data_management_tab, create_system_settings_tab,
+                                        create_user_management_tab)
+from utils.audit_log import query_audit_log
+from utils.table_query import fetch_table_page
+from utils.background_jobs import background_manager
+from utils.backup import backup_all, format_backup_summary
+from utils.report_jobs import build_admin_report
+
+# Signed-in sessions (auth_routes.py)
+PORTAL_DATABASE = 'usc_portal.db'
+# Users, access requests and the audit log
+ADMIN_DATABASE = 'usc_ir.db'
+
+# Pending requests rendered as cards on the requests tab (the rest are in the table)
+MAX_PENDING_CARDS = 50
+
+# Server-side DataTable queries: column id -> SQL expression (see utils/table_query.py)
+USERS_TABLE_QUERY = {
+    'from': 'users',
+    'columns': {
+        'id': 'id',
+        'username': 'username',
+        'full_name': 'full_name',
+        'email': 'email',
+        'department': 'department',
+        'role': "CASE WHEN is_admin = 1 THEN 'Admin' ELSE 'User' END",
+        'status': "CASE WHEN is_active = 1 THEN 'Active' ELSE 'Inactive' END",
+        'last_login': "COALESCE(last_login, 'Never')"
+    },
+    'default_order': 'created_at DESC, id DESC'
+}
+
+ACCESS_REQUESTS_TABLE_QUERY = {
+    'from': 'access_requests',
+    'columns': {
+        'id': 'id',
+        'name': 'name',
+        'email': 'email',
+        'department': 'department',
+        'position': 'position',
+        'access_type': 'access_type',
+        'usc_employee': "CASE WHEN is_usc_employee = 1 THEN 'Yes' ELSE 'No' END",
+        'requested_duration': 'requested_duration',
+        'status': 'status',
+        'requested_date': 'DATE(timestamp)',
+        'justification': 'justification'
+    },
+    'default_order': 'timestamp DESC, id DESC'
+}
+
+
+def is_admin_session(session_data) -> bool:
+    """The session-store belongs to a signed-in admin whose session hasn't expired"""
+    token = (session_data or {}).get('token')
+    if not token:
+        return False
+
+    try:
+        conn = sqlite3.connect(PORTAL_DATABASE)
+        row = conn.execute('''
+            SELECT u.role FROM user_sessions s JOIN users u ON u.id = s.user_id
+            WHERE s.session_token = ? AND s.expires_at > ?
+        ''', (token, datetime.now())).fetchone()
+        conn.close()
+    except sqlite3.Error as e:
+        print(f"Admin session check failed: {e}")
+        return False
+
+    return row is not None and row[0] == 'admin'
+
+
+SESSION_EXPIRED = dbc.Alert("Session expired. Please login again.", color="danger")
+
+
+def load_access_requests_tab():
+    """Access requests tab with the pending requests shown as cards"""
+    try:
+        # Only pending requests are loaded up front; the history table pages server-side
+        pending, _ = fetch_table_page(ADMIN_DATABASE, ACCESS_REQUESTS_TABLE_QUERY, page_size=MAX_PENDING_CARDS,
+                                      base_filter=("status = ?", ['pending']))
+
+        conn = sqlite3.connect(ADMIN_DATABASE)
+        pending_count = conn.execute("SELECT COUNT(*) FROM access_requests WHERE status = 'pending'").fetchone()[0]
+        conn.close()
+    except Exception as e:
+        return dbc.Alert(f"Error loading requests: {str(e)}", color="danger")
+
+    return create_access_requests_tab(pending, pending_count)
+
+
+TAB_CONTENT = {
+    "users-tab": create_user_management_tab,
+    "requests-tab": load_access_requests_tab,
+    "settings-tab": create_system_settings_tab,
+    "audit-tab": create_audit_log_tab,
+    "data-tab": create_data_management_tab
+}
+
+
+@callback(
+    Output("admin-dashboard-content", "children"),
+    [Input("admin-tabs", "active_tab")],
+    [State("session-store", "data")]
+)
+def render_admin_tab(active_tab, session_data):
+    if not is_admin_session(session_data):
+        return SESSION_EXPIRED
+
+    return TAB_CONTENT.get(active_tab, create_user_management_tab)()
+
+
+# Server-side paging, sorting and filtering of the users and access requests tables
+@callback(
+    [Output("users-table", "data"),
+     Output("users-table", "page_count")],
+    [Input("users-table", "page_current"),
+     Input("users-table", "page_size"),
+     Input("users-table", "sort_by"),
+     Input("users-table", "filter_query")],
+    [State("session-store", "data")]
+)
+def update_users_table(page_current, page_size, sort_by, filter_query, session_data):
+    if not is_admin_session(session_data):
+        return [], 1
+
+    return fetch_table_page(ADMIN_DATABASE, USERS_TABLE_QUERY, page_current, page_size,
+                            sort_by, filter_query)
+
+
+@callback(
+    [Output("requests-table", "data"),
+     Output("requests-table", "page_count")],
+    [Input("requests-table", "page_current"),
+     Input("requests-table", "page_size"),
+     Input("requests-table", "sort_by"),
+     Input("requests-table", "filter_query")],
+    [State("session-store", "data")]
+)
+def update_requests_table(page_current, page_size, sort_by, filter_query, session_data):
+    if not is_admin_session(session_data):
+        return [], 1
+
+    return fetch_table_page(ADMIN_DATABASE, ACCESS_REQUESTS_TABLE_QUERY, page_current, page_size,
+                            sort_by, filter_query)
+
+
+# Audit log pages (keyset pagination, see utils/audit_log.py)
+@callback(
+    [Output("audit-log-table", "data"),
+     Output("audit-log-cursors", "data"),
+     Output("audit-newer-btn", "disabled"),
+     Output("audit-older-btn", "disabled"),
+     Output("audit-page-label", "children")],
+    [Input("audit-filter-user", "value"),
+     Input("audit-filter-action", "value"),
+     Input("audit-filter-dates", "start_date"),
+     Input("audit-filter-dates", "end_date"),
+     Input("audit-newer-btn", "n_clicks"),
+     Input("audit-older-btn", "n_clicks")],
+    [State("audit-log-cursors", "data"),
+     State("audit-log-table", "data"),
+     State("session-store", "data")]
+)
+def update_audit_log_page(username, action, start_date, end_date, newer_clicks, older_clicks,
+                          cursors, current_rows, session_data):
+    if not is_admin_session(session_data):
+        return [], [None], True, True, ""
+
+    cursors = cursors or [None]
+    if ctx.triggered_id == "audit-older-btn" and current_rows:
+        # Continue after the last row on screen
+        last = current_rows[-1]
+        cursors = cursors + [[last['timestamp'], last['id']]]
+    elif ctx.triggered_id == "audit-newer-btn" and len(cursors) > 1:
+        cursors = cursors[:-1]
+    elif ctx.triggered_id not in ("audit-older-btn", "audit-newer-btn"):
+        # A filter changed: start again from the newest entry
+        cursors = [None]
+
+    try:
+        rows, next_cursor = query_audit_log(ADMIN_DATABASE, before=cursors[-1], limit=AUDIT_PAGE_SIZE,
+                                            username=(username or '').strip() or None,
+                                            action=(action or '').strip() or None,
+                                            start=start_date, end=end_date)
+    except Exception as e:
+        return [], [None], True, True, f"Error loading audit log: {str(e)}"
+
+    return rows, cursors, len(cursors) == 1, next_cursor is None, f"Page {len(cursors)}"
+
+
+# Backup button callback
+@callback(
+    Output("backup-result", "children"),
+    [Input("backup-db-btn", "n_clicks")],
+    [State("session-store", "data")],
+    prevent_initial_call=True
+)
+def backup_databases_now(n_clicks, session_data):
+    if not is_admin_session(session_data):
+        return SESSION_EXPIRED
+
+    results = backup_all()
+    failed = [entry for entry in results if entry.get('error')]
+
+    return dbc.Alert([
+        html.I(className="fas fa-database me-2"),
+        html.Strong("Backup failed for some databases" if failed else "Backup complete"),
+        html.Ul([html.Li(format_backup_summary(entry)) for entry in results], className="mb-0 mt-2 small")
+    ], color="warning" if failed else "success", dismissable=True)
+
+
+def _job_progress(set_progress):
+    """Adapt a report job's progress(done, total, message) to a progress bar's (value, label)"""
+    def progress(done, total, message):
+        set_progress((int(100 * done / total), message))
+    return progress
+
+
+def _job_running(job, button_id, cancel_id):
+    return [
+        (Output(button_id, "disabled"), True, False),
+        (Output(cancel_id, "disabled"), False, True),
+        (Output(f"{job}-progress", "style"), {"display": "flex"}, {"display": "none"})
+    ]
+
+
+# The export button links to the streamed /export route for the chosen type and format
+@callback(
+    Output("export-data-btn", "href"),
+    [Input("export-type-select", "value"),
+     Input("export-format-radio", "value")]
+)
+def update_export_link(export_type, export_format):
+    return f"/export/{export_type}.{export_format}"
+
+
+# Admin report (runs as a background job: the worker process streams progress back)
+@callback(
+    [Output("report-download", "data"),
+     Output("report-status", "children")],
+    [Input("generate-report-btn", "n_clicks")],
+    [State("session-store", "data")],
+    background=True,
+    manager=background_manager,
+    progress=[Output("report-progress", "value"), Output("report-progress", "label")],
+    running=_job_running("report", "generate-report-btn", "cancel-report-btn"),
+    cancel=[Input("cancel-report-btn", "n_clicks")],
+    prevent_initial_call=True
+)
+def generate_admin_report(set_progress, n_clicks, session_data):
+    if not is_admin_session(session_data):
+        return no_update, SESSION_EXPIRED
+
+    try:
+        filename, data, _ = build_admin_report(_job_progress(set_progress))
+    except Exception as e:
+        return no_update, dbc.Alert(f"Report failed: {str(e)}", color="danger", dismissable=True)
+
+    return dcc.send_bytes(data, filename), dbc.Alert([
+        html.I(className="fas fa-chart-bar me-2"),
+        f"Report ready: {filename}"
+    ], color="success", dismissable=True)
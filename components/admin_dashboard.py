@@ -1,6 +1,7 @@
 import dash_bootstrap_components as dbc
-from dash import html, dash_table
+from dash import dcc, html, dash_table
 import pandas as pd
+from utils.backup import load_backup_history
 from utils.database import get_user_stats
 from config import USC_COLORS
 
@@ -15,6 +16,8 @@ def create_admin_dashboard():
 
         create_admin_stats_section(),
         create_admin_tabs(),
+        # Filled with the active tab by callbacks/admin_callbacks.py
+        html.Div(id="admin-dashboard-content")
 
     ], className="py-4")
 
@@ -100,7 +103,7 @@ def create_admin_tabs():
 
 
 def create_user_management_tab():
-    """User management interface"""
+    """User management interface (the users table is paged server-side by callbacks/admin_callbacks.py)"""
     return html.Div([
         dbc.Row([
             dbc.Col([
@@ -115,141 +118,160 @@ def create_user_management_tab():
             ], md=4, className="text-end")
         ]),
 
-        # User table placeholder
         dbc.Card([
-            dbc.CardHeader("Active Users"),
+            dbc.CardHeader("System Users"),
             dbc.CardBody([
-                html.Div(id="users-table-container"),
-                create_sample_users_table()
+                dash_table.DataTable(
+                    id="users-table",
+                    data=[],
+                    columns=[
+                        {"name": "ID", "id": "id"},
+                        {"name": "Username", "id": "username"},
+                        {"name": "Full Name", "id": "full_name"},
+                        {"name": "Email", "id": "email"},
+                        {"name": "Department", "id": "department"},
+                        {"name": "Role", "id": "role"},
+                        {"name": "Status", "id": "status"},
+                        {"name": "Last Login", "id": "last_login"}
+                    ],
+                    style_cell={'textAlign': 'left', 'padding': '10px'},
+                    style_header={'backgroundColor': USC_COLORS['primary_green'], 'color': 'white',
+                                  'fontWeight': 'bold'},
+                    style_data_conditional=[
+                        {
+                            'if': {'filter_query': '{role} = Admin'},
+                            'backgroundColor': '#fff3cd',
+                            'color': 'black',
+                        }
+                    ],
+                    page_current=0,
+                    page_size=10,
+                    page_action="custom",
+                    sort_action="custom",
+                    sort_mode="single",
+                    filter_action="custom"
+                )
             ])
         ])
     ])
 
 
-def create_sample_users_table():
-    """Create a sample users table"""
-    sample_data = [
-        {
-            "ID": 1,
-            "Username": "admin",
-            "Full Name": "System Administrator",
-            "Email": "ir@usc.edu.tt",
-            "Department": "Institutional Research",
-            "Role": "Admin",
-            "Status": "Active",
-            "Last Login": "2025-01-08 10:30"
-        },
-        {
-            "ID": 2,
-            "Username": "nswaby",
-            "Full Name": "Nordian C. Swaby Robinson",
-            "Email": "ir@usc.edu.tt",
-            "Department": "Institutional Research",
-            "Role": "Admin",
-            "Status": "Active",
-            "Last Login": "2025-01-08 09:15"
-        },
-        {
-            "ID": 3,
-            "Username": "lwebster",
-            "Full Name": "Liam Webster",
-            "Email": "websterl@usc.edu.tt",
-            "Department": "Institutional Research",
-            "Role": "Admin",
-            "Status": "Active",
-            "Last Login": "2025-01-08 08:45"
-        }
-    ]
-
-    return dash_table.DataTable(
-        data=sample_data,
-        columns=[
-            {"name": "ID", "id": "ID"},
-            {"name": "Username", "id": "Username"},
-            {"name": "Full Name", "id": "Full Name"},
-            {"name": "Email", "id": "Email"},
-            {"name": "Department", "id": "Department"},
-            {"name": "Role", "id": "Role"},
-            {"name": "Status", "id": "Status"},
-            {"name": "Last Login", "id": "Last Login"}
-        ],
-        style_cell={'textAlign': 'left', 'padding': '10px'},
-        style_header={'backgroundColor': USC_COLORS['primary_green'], 'color': 'white', 'fontWeight': 'bold'},
-        style_data_conditional=[
-            {
-                'if': {'filter_query': '{Role} = Admin'},
-                'backgroundColor': '#fff3cd',
-                'color': 'black',
-            }
-        ],
-        page_size=10,
-        sort_action="native",
-        filter_action="native"
-    )
-
-
-def create_access_requests_tab():
-    """Access requests management interface"""
+def create_access_requests_tab(pending_requests, pending_count):
+    """
+    Access requests management interface
+    pending_requests are shown as cards (at most a page of them); the history table is paged server-side
+    """
     return html.Div([
-        html.H4("Access Requests", className="mb-4"),
-        dbc.Alert([
-            html.I(className="fas fa-info-circle me-2"),
-            "Review and manage access requests from external users and staff."
-        ], color="info", className="mb-4"),
+        html.H4("Access Requests Management", className="mb-4"),
+
+        # Pending requests section
+        dbc.Card([
+            dbc.CardHeader([
+                html.H5([
+                    html.I(className="fas fa-clock me-2"),
+                    f"Pending Requests ({pending_count})"
+                ], className="mb-0")
+            ]),
+            dbc.CardBody([
+                create_pending_requests_cards(pending_requests)
+            ])
+        ], className="mb-4"),
 
+        # All requests table
         dbc.Card([
-            dbc.CardHeader("Pending Requests"),
+            dbc.CardHeader("All Requests History"),
             dbc.CardBody([
-                html.Div(id="requests-table-container"),
-                create_sample_requests_table()
+                dash_table.DataTable(
+                    id="requests-table",
+                    data=[],
+                    columns=[
+                        {"name": "ID", "id": "id"},
+                        {"name": "Name", "id": "name"},
+                        {"name": "Email", "id": "email"},
+                        {"name": "Department", "id": "department"},
+                        {"name": "USC Employee", "id": "usc_employee"},
+                        {"name": "Access Type", "id": "access_type"},
+                        {"name": "Duration", "id": "requested_duration"},
+                        {"name": "Status", "id": "status"},
+                        {"name": "Requested", "id": "requested_date"}
+                    ],
+                    style_cell={'textAlign': 'left', 'padding': '10px'},
+                    style_header={'backgroundColor': USC_COLORS['primary_green'], 'color': 'white',
+                                  'fontWeight': 'bold'},
+                    style_data_conditional=[
+                        {
+                            'if': {'filter_query': '{status} = pending'},
+                            'backgroundColor': '#fff3cd',
+                        },
+                        {
+                            'if': {'filter_query': '{status} = approved'},
+                            'backgroundColor': '#d4edda',
+                        },
+                        {
+                            'if': {'filter_query': '{status} = denied'},
+                            'backgroundColor': '#f8d7da',
+                        }
+                    ],
+                    page_current=0,
+                    page_size=15,
+                    page_action="custom",
+                    sort_action="custom",
+                    sort_mode="single",
+                    filter_action="custom"
+                )
             ])
         ])
     ])
 
 
-def create_sample_requests_table():
-    """Create sample access requests table"""
-    sample_requests = [
-        {
-            "ID": 1,
-            "Name": "John Smith",
-            "Email": "john.smith@external.com",
-            "Department": "Research Institute",
-            "Position": "Research Analyst",
-            "Access Type": "Factbook",
-            "Requested": "2025-01-07",
-            "Status": "Pending"
-        },
-        {
-            "ID": 2,
-            "Name": "Sarah Johnson",
-            "Email": "s.johnson@usc.edu.tt",
-            "Department": "Finance",
-            "Position": "Financial Analyst",
-            "Access Type": "Factbook, Alumni",
-            "Requested": "2025-01-06",
-            "Status": "Pending"
-        }
-    ]
+def create_pending_requests_cards(pending_requests):
+    """Create cards for pending requests (rows of the access requests table query)"""
+    if not pending_requests:
+        return html.P("No pending requests.", className="text-center text-muted py-4")
 
-    return dash_table.DataTable(
-        data=sample_requests,
-        columns=[
-            {"name": "ID", "id": "ID"},
-            {"name": "Name", "id": "Name"},
-            {"name": "Email", "id": "Email"},
-            {"name": "Department", "id": "Department"},
-            {"name": "Position", "id": "Position"},
-            {"name": "Access Type", "id": "Access Type"},
-            {"name": "Requested", "id": "Requested"},
-            {"name": "Status", "id": "Status"}
-        ],
-        style_cell={'textAlign': 'left', 'padding': '10px'},
-        style_header={'backgroundColor': USC_COLORS['primary_green'], 'color': 'white', 'fontWeight': 'bold'},
-        page_size=10,
-        sort_action="native",
-        filter_action="native"
-    )
+    cards = []
+    for row in pending_requests:
+        employee_badge = dbc.Badge("USC Employee" if row['usc_employee'] == 'Yes' else "External",
+                                   color="success" if row['usc_employee'] == 'Yes' else "warning")
+
+        card = dbc.Card([
+            dbc.CardHeader([
+                html.Div([
+                    html.H6(f"{row['name']} - {row['email']}", className="mb-0"),
+                    employee_badge
+                ], className="d-flex justify-content-between align-items-center")
+            ]),
+            dbc.CardBody([
+                html.P([
+                    html.Strong("Department: "), row['department'], html.Br(),
+                    html.Strong("Position: "), row['position'], html.Br(),
+                    html.Strong("Access Type: "), row['access_type'], html.Br(),
+                    html.Strong("Duration: "), f"{row['requested_duration']} days", html.Br(),
+                    html.Strong("Requested: "), row['requested_date']
+                ], className="mb-3"),
+
+                html.Details([
+                    html.Summary("View Justification", className="mb-2"),
+                    html.P(row['justification'], className="text-muted small")
+                ], className="mb-3"),
+
+                dbc.Row([
+                    dbc.Col([
+                        dbc.Button([
+                            html.I(className="fas fa-check me-2"),
+                            "Approve"
+                        ], id=f"approve-{row['id']}", color="success", size="sm", className="me-2"),
+                        dbc.Button([
+                            html.I(className="fas fa-times me-2"),
+                            "Deny"
+                        ], id=f"deny-{row['id']}", color="danger", size="sm")
+                    ])
+                ])
+            ])
+        ], className="mb-3")
+        cards.append(card)
+
+    return html.Div(cards)
 
 
 def create_system_settings_tab():
@@ -316,8 +338,12 @@ def create_system_settings_tab():
     ])
 
 
+# Rows per audit log page; pages are fetched by keyset (see utils/audit_log.py)
+AUDIT_PAGE_SIZE = 25
+
+
 def create_audit_log_tab():
-    """Audit log interface"""
+    """Audit log interface (filled page by page by the audit log callback)"""
     return html.Div([
         html.H4("Audit Log", className="mb-4"),
         dbc.Alert([
@@ -326,59 +352,63 @@ def create_audit_log_tab():
         ], color="info", className="mb-4"),
 
         dbc.Card([
-            dbc.CardHeader("Recent Activity"),
+            dbc.CardHeader("Activity"),
             dbc.CardBody([
-                create_sample_audit_table()
+                dbc.Row([
+                    dbc.Col([
+                        dbc.Label("User"),
+                        dbc.Input(id="audit-filter-user", type="text", placeholder="Username", debounce=True)
+                    ], md=3),
+                    dbc.Col([
+                        dbc.Label("Action"),
+                        dbc.Input(id="audit-filter-action", type="text", placeholder="e.g. login", debounce=True)
+                    ], md=3),
+                    dbc.Col([
+                        dbc.Label("Date Range"),
+                        html.Div(dcc.DatePickerRange(id="audit-filter-dates", clearable=True))
+                    ], md=6)
+                ], className="mb-3"),
+
+                dash_table.DataTable(
+                    id="audit-log-table",
+                    data=[],
+                    columns=[
+                        {"name": "Timestamp", "id": "timestamp"},
+                        {"name": "User", "id": "username"},
+                        {"name": "Action", "id": "action"},
+                        {"name": "Resource", "id": "resource"},
+                        {"name": "IP Address", "id": "ip_address"},
+                        {"name": "Details", "id": "details"}
+                    ],
+                    style_cell={'textAlign': 'left', 'padding': '10px'},
+                    style_header={'backgroundColor': USC_COLORS['primary_green'], 'color': 'white',
+                                  'fontWeight': 'bold'}
+                ),
+
+                html.Div([
+                    dbc.Button([html.I(className="fas fa-chevron-left me-2"), "Newer"],
+                               id="audit-newer-btn", color="outline-secondary", size="sm",
+                               className="me-2", disabled=True),
+                    dbc.Button(["Older", html.I(className="fas fa-chevron-right ms-2")],
+                               id="audit-older-btn", color="outline-secondary", size="sm", disabled=True),
+                    html.Span(id="audit-page-label", className="ms-3 text-muted small")
+                ], className="mt-3"),
+
+                # Cursor that starts each page viewed so far; the last entry is the current page
+                dcc.Store(id="audit-log-cursors", data=[None])
             ])
         ])
     ])
 
 
-def create_sample_audit_table():
-    """Create sample audit log table"""
-    sample_audit = [
-        {
-            "Timestamp": "2025-01-08 10:30:15",
-            "User": "admin",
-            "Action": "Login",
-            "Resource": "System",
-            "IP Address": "192.168.1.100",
-            "Details": "Successful login"
-        },
-        {
-            "Timestamp": "2025-01-08 10:25:30",
-            "User": "nswaby",
-            "Action": "Data Export",
-            "Resource": "Enrollment Data",
-            "IP Address": "192.168.1.101",
-            "Details": "Exported 2024 enrollment data"
-        },
-        {
-            "Timestamp": "2025-01-08 10:20:45",
-            "User": "lwebster",
-            "Action": "User Created",
-            "Resource": "User Management",
-            "IP Address": "192.168.1.102",
-            "Details": "Created user: faculty1"
-        }
-    ]
-
-    return dash_table.DataTable(
-        data=sample_audit,
-        columns=[
-            {"name": "Timestamp", "id": "Timestamp"},
-            {"name": "User", "id": "User"},
-            {"name": "Action", "id": "Action"},
-            {"name": "Resource", "id": "Resource"},
-            {"name": "IP Address", "id": "IP Address"},
-            {"name": "Details", "id": "Details"}
-        ],
-        style_cell={'textAlign': 'left', 'padding': '10px'},
-        style_header={'backgroundColor': USC_COLORS['primary_green'], 'color': 'white', 'fontWeight': 'bold'},
-        page_size=15,
-        sort_action="native",
-        filter_action="native"
-    )
+def create_job_progress(job):
+    """Progress bar, status and download target of a background job (e.g. "report")"""
+    return html.Div([
+        dbc.Progress(id=f"{job}-progress", value=0, label="", striped=True, animated=True,
+                     className="mt-3", style={"display": "none"}),
+        html.Div(id=f"{job}-status", className="mt-3"),
+        dcc.Download(id=f"{job}-download")
+    ])
 
 
 def create_data_management_tab():
@@ -392,6 +422,9 @@ def create_data_management_tab():
                     dbc.CardHeader("Data Upload"),
                     dbc.CardBody([
                         html.P("Upload new data files to update system information."),
+                        html.P("An Excel file replaces the whole dataset; a CSV named after a sheet "
+                               "(e.g. 2025-2026.csv) adds or replaces just that sheet.",
+                               className="text-muted small"),
                         dbc.Form([
                             dbc.Label("Select Data Type"),
                             dbc.Select([
@@ -399,13 +432,23 @@ def create_data_management_tab():
                                 {"label": "Financial Data", "value": "financial"},
                                 {"label": "Graduation Data", "value": "graduation"},
                                 {"label": "Faculty Data", "value": "faculty"}
-                            ], value="enrollment"),
+                            ], value="enrollment", id="upload-dataset-select"),
                             html.Br(),
                             dbc.Label("Upload File"),
-                            dbc.Input(type="file", accept=".xlsx,.xls,.csv"),
+                            # Dash has no file input: assets/chunked_upload.js opens the file picker
+                            # and sends the chosen file in chunks (see utils/data_upload.py)
+                            html.Div([
+                                dbc.Button([
+                                    html.I(className="fas fa-folder-open me-2"),
+                                    "Choose File"
+                                ], id="upload-choose-btn", color="secondary", outline=True, className="me-2"),
+                                html.Span("No file chosen (.xlsx, .xls or .csv)", id="upload-file-name",
+                                          className="text-muted small")
+                            ]),
                             html.Br(),
-                            dbc.Button("Upload Data", color="primary")
-                        ])
+                            dbc.Button("Upload Data", id="upload-data-btn", color="primary")
+                        ]),
+                        html.Div(id="upload-status", className="mt-3")
                     ])
                 ])
             ], md=6),
@@ -418,19 +461,24 @@ def create_data_management_tab():
                             dbc.Label("Select Export Type"),
                             dbc.Select([
                                 {"label": "Complete Database", "value": "complete"},
-                                {"label": "User Data Only", "value": "users"},
+                                {"label": "User Data Only", "value": "user_data"},
                                 {"label": "Academic Data Only", "value": "academic"},
                                 {"label": "Financial Data Only", "value": "financial"}
-                            ], value="complete"),
+                            ], value="complete", id="export-type-select"),
                             html.Br(),
                             dbc.Label("Export Format"),
                             dbc.RadioItems([
                                 {"label": "Excel (.xlsx)", "value": "xlsx"},
-                                {"label": "CSV", "value": "csv"},
-                                {"label": "JSON", "value": "json"}
-                            ], value="xlsx"),
+                                {"label": "CSV (a .zip of one file per sheet)", "value": "csv"}
+                            ], value="xlsx", id="export-format-radio"),
                             html.Br(),
-                            dbc.Button("Export Data", color="success")
+                            # Streamed by /export/<type>.<format> (utils/streaming_export.py); the link
+                            # follows the choices above (callbacks/admin_callbacks.py)
+                            dbc.Button([
+                                html.I(className="fas fa-file-export me-2"),
+                                "Export Data"
+                            ], id="export-data-btn", color="success", href="/export/complete.xlsx",
+                                external_link=True)
                         ])
                     ])
                 ])
@@ -447,7 +495,7 @@ def create_data_management_tab():
                         dbc.Button([
                             html.I(className="fas fa-database me-2"),
                             "Backup Database"
-                        ], color="info", className="me-2 mb-2")
+                        ], id="backup-db-btn", color="info", className="me-2 mb-2")
                     ], md=3),
                     dbc.Col([
                         dbc.Button([
@@ -465,9 +513,44 @@ def create_data_management_tab():
                         dbc.Button([
                             html.I(className="fas fa-chart-bar me-2"),
                             "Generate Report"
-                        ], color="primary", className="mb-2")
+                        ], id="generate-report-btn", color="primary", className="me-2 mb-2"),
+                        dbc.Button("Cancel", id="cancel-report-btn", color="outline-secondary",
+                                   className="mb-2", disabled=True)
                     ], md=3)
-                ])
+                ]),
+                create_job_progress("report"),
+                dcc.Loading(html.Div(id="backup-result", className="mt-3")),
+                create_backup_history()
             ])
         ])
-    ])
\ No newline at end of file
+    ])
+
+
+def create_backup_history():
+    """Recent backups with their duration and throughput"""
+    history = load_backup_history()[:10]
+    if not history:
+        return html.P("No backups yet.", className="text-muted small mt-3 mb-0")
+
+    return dash_table.DataTable(
+        id="backup-history-table",
+        data=[{
+            "started_at": entry.get('started_at', ''),
+            "database": entry.get('database', ''),
+            "size": f"{entry.get('bytes', 0) / 1024:.0f} KB",
+            "compressed": "unchanged" if entry.get('skipped') else f"{entry.get('compressed_bytes', 0) / 1024:.0f} KB",
+            "duration": f"{entry.get('duration_seconds', 0)}s",
+            "throughput": f"{entry.get('throughput_mb_s') or 0} MB/s"
+        } for entry in history],
+        columns=[
+            {"name": "Started", "id": "started_at"},
+            {"name": "Database", "id": "database"},
+            {"name": "Size", "id": "size"},
+            {"name": "Compressed", "id": "compressed"},
+            {"name": "Duration", "id": "duration"},
+            {"name": "Throughput", "id": "throughput"}
+        ],
+        style_cell={'textAlign': 'left', 'padding': '8px'},
+        style_header={'backgroundColor': USC_COLORS['primary_green'], 'color': 'white', 'fontWeight': 'bold'},
+        style_table={'marginTop': '1rem'}
+    )
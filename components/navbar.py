@@ -1,7 +1,11 @@
 import dash_bootstrap_components as dbc
 from dash import html, dcc
+import os
 import requests
 
+# Auth server location; '' when the auth routes share the Dash server (unified_app.py)
+AUTH_SERVER_URL = os.getenv('AUTH_SERVER_URL', 'http://localhost:5000')
+
 # USC Brand Colors
 USC_COLORS = {
     'primary_green': '#2E8B57',
@@ -32,7 +36,7 @@ def create_navbar(user=None):
             dbc.DropdownMenuItem([
                 html.I(className="fas fa-sign-out-alt me-2"),
                 "Logout"
-            ], href="http://localhost:5000/auth/logout", external_link=True)  # Link to Flask logout
+            ], href=f"{AUTH_SERVER_URL}/auth/logout", external_link=True)  # Link to Flask logout
         ],
             nav=True,
             in_navbar=True,
@@ -62,7 +66,7 @@ def create_navbar(user=None):
             dbc.NavItem(dbc.NavLink([
                 html.I(className="fas fa-sign-in-alt me-2"),
                 "Sign In"
-            ], href="http://localhost:5000/login", external_link=True, className="btn btn-outline-light ms-2"))
+            ], href=f"{AUTH_SERVER_URL}/login", external_link=True, className="btn btn-outline-light ms-2"))
         ]
 
     return dbc.Navbar([
@@ -0,0 +1,31 @@
+from dash import html
+
+from data_loader import data_loader
+
+
+def render_text_blocks(blocks, paragraph_style=None, className="mb-3"):
+    """Paragraph/list blocks from DataLoader.load_text_content as html components"""
+    rendered = []
+    for block in blocks:
+        if block['type'] == 'paragraph':
+            rendered.append(html.P(block['text'], className=className, style=paragraph_style))
+        else:
+            items = [html.Li(item) for item in block['items']]
+            rendered.append(html.Ol(items, className=className) if block['ordered']
+                            else html.Ul(items, className=className))
+    return rendered
+
+
+def text_content(key, fallback, max_paragraphs=None, **kwargs):
+    """
+    The rendered blocks of a data/*.txt narrative, or fallback when the file is missing
+    max_paragraphs keeps only the opening paragraphs (for summaries of a longer text)
+    """
+    content = data_loader.load_text_content(key)
+    if not content or not content['blocks']:
+        return fallback
+
+    blocks = content['blocks']
+    if max_paragraphs is not None:
+        blocks = [block for block in blocks if block['type'] == 'paragraph'][:max_paragraphs]
+    return render_text_blocks(blocks, **kwargs)
@@ -26,7 +26,16 @@ BASE_URL = get_base_url()
 DATABASE_CONFIG = {
     'path': 'usc_ir.db',
     'backup_interval_hours': 24,
-    'cleanup_expired_sessions_hours': 1
+    'backup_folder': 'backups',
+    'backup_keep': 7,  # Compressed snapshots kept per database
+    'backup_pages_per_step': 256,  # Pages copied per online backup step...
+    'backup_step_sleep_seconds': 0.01,  # ...with a pause between steps for live writers
+    'cleanup_expired_sessions_hours': 1,
+    'session_sweep_batch_size': 500,  # Rows deleted per transaction by the session sweeper
+    'stats_cache_seconds': 30,  # How long admin dashboard counters are reused
+    'reporting_mode': 'snapshot',  # snapshot | readonly | primary (see utils/read_snapshot.py)
+    'reporting_snapshot_folder': 'snapshots',
+    'reporting_snapshot_seconds': 30  # Maximum age of the copy reporting queries read
 }
 
 # Authentication Configuration
@@ -34,8 +43,15 @@ AUTH_CONFIG = {
     'session_duration_hours': 8,
     'max_login_attempts': 5,
     'lockout_duration_minutes': 30,
+    'login_attempt_window_minutes': 15,  # Failures older than this no longer count
+    'max_login_attempts_per_ip': 25,  # Per client address, across all usernames
+    'lockout_persist_seconds': 30,  # How often counters are written to login_lockouts
     'password_min_length': 8,
-    'require_strong_passwords': True
+    'require_strong_passwords': True,
+    # PBKDF2 runs on a bounded pool so login bursts can't starve dashboard requests
+    'password_hash_workers': 2,
+    'password_hash_queue_size': 8,
+    'password_hash_timeout_seconds': 10
 }
 
 # Email Configuration
@@ -72,7 +88,49 @@ UPLOAD_CONFIG = {
     'max_file_size_mb': 50,
     'allowed_extensions': ['.xlsx', '.xls', '.csv', '.pdf', '.png', '.jpg'],
     'upload_folder': 'uploads',
-    'temp_folder': 'temp'
+    'temp_folder': 'temp',
+    'chunk_size_mb': 4,  # The admin Data Upload form sends files in pieces of this size
+    'workers': 1  # Processes validating and publishing uploaded datasets (see utils/data_upload.py)
+}
+
+# Parquet copies of the Excel datasets, read instead of the workbooks (see utils/columnar_cache.py)
+COLUMNAR_CACHE_CONFIG = {
+    'folder': 'cache/datasets'
+}
+
+# Responsive image variants (python build_assets.py, see utils/image_pipeline.py)
+IMAGE_PIPELINE_CONFIG = {
+    'sources': ['banner.png'],  # Relative to assets/
+    'output_folder': 'img',  # assets/img, served at /assets/img/
+    'widths': [480, 960, 1440, 2048],
+    'formats': ['avif', 'webp'],  # Plus a JPEG (or PNG for transparent images) fallback
+    'quality': {'avif': 55, 'webp': 78, 'jpeg': 80}
+}
+
+# Tables extracted from the financial statement PDFs (python extract_financials.py,
+# see utils/financial_statements.py); stored in the COLUMNAR_CACHE_CONFIG folder
+FINANCIAL_STATEMENTS_CONFIG = {
+    'sources': ['June 30 2024.pdf', 'March 2025.pdf'],  # Relative to data/
+    'workers': None  # Extraction processes; None = one per CPU (capped at the number of PDFs)
+}
+
+# Static export of the public pages (python export_static.py, see utils/static_site.py)
+STATIC_SITE_CONFIG = {
+    'enabled': True,
+    'output_folder': 'static_site',
+    'max_age_seconds': 86400  # Browser/CDN cache lifetime; the pages only change on redeploy
+}
+
+# Response compression and static caching (see utils/compression.py)
+COMPRESSION_CONFIG = {
+    'enabled': True,
+    'min_size_bytes': 1024,  # Smaller bodies gain less than the encoding overhead
+    'gzip_level': 6,
+    'brotli_quality': 4,  # Per-request level for callbacks; cached static files use the maximum
+    'mimetypes': ['text/', 'application/json', 'application/javascript', 'application/xml', 'image/svg+xml'],
+    'max_static_size_bytes': 20 * 1024 * 1024,
+    'static_cache_entries': 64,
+    'immutable_max_age_seconds': 31536000  # Fingerprinted assets and Dash bundles
 }
 
 # Analytics Configuration
@@ -83,13 +141,28 @@ ANALYTICS_CONFIG = {
     'retention_days': 365
 }
 
+# Audit Log Writer Configuration
+AUDIT_CONFIG = {
+    'async_writes': True,  # False writes each audit event in its own transaction
+    'batch_size': 100,  # Flush once this many events are queued...
+    'flush_interval_seconds': 2.0,  # ...or once the oldest queued event is this old
+    'max_queue_size': 10000,  # When full, events are written synchronously instead of dropped
+    'synchronous': 'NORMAL'  # SQLite PRAGMA synchronous for flushes; FULL fsyncs every batch
+}
+
 # Security Configuration
 SECURITY_CONFIG = {
     'enable_csrf_protection': True,
     'secure_cookies': os.environ.get('RENDER') is not None,
     'content_security_policy': True,
     'rate_limiting': True,
-    'max_requests_per_minute': 60
+    'max_requests_per_minute': 60,  # Per session (see utils/rate_limit.py)
+    'max_poll_requests_per_minute': 300,  # Per session: background job polls and upload chunks/status
+    'max_requests_per_minute_per_ip': 600,  # Higher: campus users share a few NAT addresses
+    'rate_limit_backend': 'memory',  # memory (per worker) | sqlite (shared by all workers)
+    'rate_limit_db': 'rate_limits.db',
+    'rate_limit_max_tracked_keys': 50000,
+    'trust_proxy_headers': os.environ.get('RENDER') is not None  # Client IP from X-Forwarded-For
 }
 
 # System Maintenance
@@ -148,7 +221,16 @@ EXPORT_CONFIG = {
     'formats': ['xlsx', 'csv', 'pdf'],
     'max_export_rows': 10000,
     'include_metadata': True,
-    'watermark_exports': True
+    'watermark_exports': True,
+    'watermark_text': 'USC Institutional Research - Internal Use Only',
+    'stream_chunk_rows': 1000  # Rows per chunk written to a streamed export (see utils/streaming_export.py)
+}
+
+# Background callbacks for reports and exports (see utils/background_jobs.py)
+BACKGROUND_JOBS_CONFIG = {
+    'cache_folder': 'cache/background_jobs',  # Shared by every worker process
+    'result_expire_seconds': 600,  # Finished job results are dropped after this
+    'cache_size_limit_bytes': 512 * 1024 * 1024
 }
 
 # Notification Settings
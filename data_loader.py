@@ -7,21 +7,132 @@ for the factbook integration.
 
 import pandas as pd
 import numpy as np
+import functools
+import json
 import os
+import re
+import time
 from pathlib import Path
 import logging
 
+from utils.columnar_cache import file_version, read_columnar
+from utils.financial_statements import load_statements
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Institutional narratives kept as plain text in the data directory
+TEXT_CONTENT_FILES = {
+    'about_us': 'About Us.txt',
+    'preface': 'Preface.txt',
+    'presidents_pen': "The President's Pen.txt",
+    'administrative_council': 'AdministrativeCouncil.txt',
+    'interest_groups': 'AdministrativeCouncil2.txt',
+    'board_of_trustees': 'Board of Trusties.txt',
+    'presidents_cabinet': 'ThePresidentsCabinet.txt',
+}
+
+# Distinct values offered by report filters, indexed whenever a dataset is loaded:
+# dataset -> (source file, loader method, {option: (sheet, column)})
+# sheet None = every sheet (values merged and sorted); column None = the sheet's
+# column names after the first (e.g. the year columns of Monthly Expense)
+FILTER_INDEX_FIELDS = {
+    'student_labour': ('student_labour_report.xlsx', 'load_student_labour_data', {
+        'employment_years': ('employment', 'Academic Year'),
+        'expense_years': ('expense', 'Year'),
+        'monthly_years': ('monthly_expense', None),
+    }),
+    'enrollment': ('enrolment_data.xlsx', 'load_enrollment_data', {
+        'campuses': (None, 'Campus'),
+        'college_levels': (None, 'College Level'),
+    }),
+    'graduation': ('GraduationData.xlsx', 'load_graduation_data', {
+        'schools': (None, 'School'),
+        'departments': (None, 'Department'),
+        'programmes': (None, 'Programme'),
+        'course_levels': (None, 'Course Level'),
+    }),
+}
+
+# "1.<tab>North Caribbean Conference", "-<tab>The Division of the Provost"
+LIST_ITEM = re.compile(r'^\s*(?:(\d+)[.)]|[-•*])\s+(.*)$')
+SENTENCE_END = ('.', '!', '?', ':', ';', '"', '\u201d')
+
+
+def parse_text_content(text):
+    """
+    Split a narrative into an optional title and paragraph/list blocks
+
+    Blank lines end a block. Lines hard-wrapped mid-sentence are joined back
+    into one paragraph; a line that ends a sentence starts a new one.
+    """
+    blocks = []
+    current = None
+    last_line = ''
+
+    for raw in text.splitlines():
+        line = ' '.join(raw.split())
+        if not line:
+            current = None
+            continue
+
+        match = LIST_ITEM.match(raw)
+        if match:
+            ordered = match.group(1) is not None
+            if current is None or current['type'] != 'list' or current['ordered'] != ordered:
+                current = {'type': 'list', 'ordered': ordered, 'items': []}
+                blocks.append(current)
+            current['items'].append(' '.join(match.group(2).split()))
+        elif current is not None and current['type'] == 'paragraph' \
+                and not last_line.endswith(SENTENCE_END) and (len(last_line) >= 60 or line[0].islower()):
+            current['text'] += ' ' + line
+        else:
+            current = {'type': 'paragraph', 'text': line}
+            blocks.append(current)
+        last_line = line
+
+    # A short first line without punctuation is the document's heading
+    title = None
+    if len(blocks) > 1 and blocks[0]['type'] == 'paragraph' and len(blocks[0]['text']) <= 80 \
+            and not blocks[0]['text'].endswith(SENTENCE_END + (',',)):
+        title = blocks.pop(0)['text']
+
+    markdown = [f"## {title}"] if title else []
+    for block in blocks:
+        if block['type'] == 'paragraph':
+            markdown.append(block['text'])
+        else:
+            markdown.append('\n'.join(f"{n}. {item}" if block['ordered'] else f"- {item}"
+                                      for n, item in enumerate(block['items'], 1)))
+
+    return {'title': title, 'blocks': blocks, 'markdown': '\n\n'.join(markdown)}
+
+
+def _indexes_filter_options(dataset):
+    """Loader decorator: refresh the dataset's filter option index from the data it returns"""
+    def decorator(loader):
+        @functools.wraps(loader)
+        def wrapper(self, *args, **kwargs):
+            data = loader(self, *args, **kwargs)
+            self.index_filter_options(dataset, data)
+            return data
+        return wrapper
+    return decorator
+
+
 class DataLoader:
     """Class to handle loading and processing of institutional research data"""
 
-    def __init__(self, data_directory="data"):
+    def __init__(self, data_directory="data", text_check_interval=5, filter_index_path="cache/filter_options.json"):
         """Initialize data loader with data directory path"""
         self.data_directory = Path(data_directory)
+        self.filter_index_path = Path(filter_index_path)
+        self._filter_index = None
         self.data_cache = {}
+        self.text_cache = {}
+        self.text_check_interval = text_check_interval
+        self._text_mtimes = {}  # key -> (checked at, mtime or None)
 
     def load_excel_file(self, filename, sheet_name=None):
         """
@@ -41,6 +152,11 @@ class DataLoader:
                 logger.error(f"File not found: {file_path}")
                 return None
 
+            # Published datasets have a Parquet copy of this exact version (see utils/columnar_cache.py)
+            cached = read_columnar(filename, self._source_version(filename), sheet_name)
+            if cached is not None:
+                return cached
+
             if sheet_name:
                 return pd.read_excel(file_path, sheet_name=sheet_name)
             else:
@@ -51,6 +167,7 @@ class DataLoader:
             logger.error(f"Error loading {filename}: {str(e)}")
             return None
 
+    @_indexes_filter_options('student_labour')
     def load_student_labour_data(self):
         """Load student labour report data from Excel file"""
         try:
@@ -164,6 +281,7 @@ class DataLoader:
             'monthly_expense': pd.DataFrame(monthly_expense_data)
         }
 
+    @_indexes_filter_options('enrollment')
     def load_enrollment_data(self):
         """Load enrollment data from Excel files"""
         try:
@@ -195,6 +313,7 @@ class DataLoader:
             })
         }
 
+    @_indexes_filter_options('graduation')
     def load_graduation_data(self):
         """Load graduation data from Excel files"""
         try:
@@ -218,17 +337,26 @@ class DataLoader:
         }
 
     def load_financial_data(self):
-        """Load financial data from Excel files"""
+        """
+        Load financial data from Excel files
+
+        The tables of the financial statement PDFs are included as 'statements'
+        (one long frame, see utils/financial_statements.py) once
+        extract_financials.py has cached them; the PDFs are never parsed here.
+        """
         try:
             data = self.load_excel_file("financial_data.xlsx")
-            if data is not None:
-                return data
-            else:
-                return self._get_sample_financial_data()
+            if data is None:
+                data = self._get_sample_financial_data()
 
         except Exception as e:
             logger.error(f"Error loading financial data: {str(e)}")
-            return self._get_sample_financial_data()
+            data = self._get_sample_financial_data()
+
+        statements = load_statements()
+        if statements is not None:
+            data['statements'] = statements
+        return data
 
     def _get_sample_financial_data(self):
         """Return sample financial data"""
@@ -240,6 +368,118 @@ class DataLoader:
             })
         }
 
+    def _text_file_mtime(self, key):
+        """mtime of a text content file, checked at most every text_check_interval seconds"""
+        now = time.monotonic()
+        checked = self._text_mtimes.get(key)
+        if checked is not None and now - checked[0] < self.text_check_interval:
+            return checked[1]
+
+        try:
+            mtime = (self.data_directory / TEXT_CONTENT_FILES[key]).stat().st_mtime
+        except OSError:
+            mtime = None
+        self._text_mtimes[key] = (now, mtime)
+        return mtime
+
+    def load_text_content(self, key):
+        """
+        Load one of the text narratives (see TEXT_CONTENT_FILES)
+
+        Args:
+            key (str): Content key, e.g. 'about_us'
+
+        Returns:
+            dict or None: {'title', 'blocks', 'markdown', 'modified'} from
+            parse_text_content, re-parsed only when the file changes
+        """
+        mtime = self._text_file_mtime(key)
+        if mtime is None:
+            logger.error(f"Text content not found: {self.data_directory / TEXT_CONTENT_FILES[key]}")
+            return None
+
+        cached = self.text_cache.get(key)
+        if cached is not None and cached['modified'] == mtime:
+            return cached
+
+        try:
+            text = (self.data_directory / TEXT_CONTENT_FILES[key]).read_text(encoding='utf-8-sig')
+        except (OSError, UnicodeDecodeError) as e:
+            logger.error(f"Error loading text content {key}: {str(e)}")
+            return cached
+
+        content = parse_text_content(text)
+        content['modified'] = mtime
+        self.text_cache[key] = content
+        return content
+
+    def text_content_version(self):
+        """Latest mtime across the text content files, for caches of pages built from them"""
+        mtimes = [self._text_file_mtime(key) for key in TEXT_CONTENT_FILES]
+        return max((mtime for mtime in mtimes if mtime is not None), default=0)
+
+    def _source_version(self, filename):
+        """Version of a data file: its content hash, or None when it is missing"""
+        return file_version(self.data_directory / filename)
+
+    def _load_filter_index(self):
+        if self._filter_index is None:
+            try:
+                with open(self.filter_index_path) as f:
+                    self._filter_index = json.load(f)
+            except (OSError, ValueError):
+                self._filter_index = {}
+        return self._filter_index
+
+    def index_filter_options(self, dataset, data):
+        """Record the distinct filter values of a freshly loaded dataset (see FILTER_INDEX_FIELDS)"""
+        if not isinstance(data, dict):
+            return
+
+        filename, _, fields = FILTER_INDEX_FIELDS[dataset]
+        options = {}
+        for option, (sheet, column) in fields.items():
+            frames = list(data.values()) if sheet is None else [data.get(sheet)]
+            values = []
+            for df in frames:
+                if df is None:
+                    continue
+                if column is None:
+                    values.extend(str(col) for col in df.columns[1:])
+                elif column in df.columns:
+                    values.extend(df[column].dropna().astype(str).str.strip())
+            values = list(dict.fromkeys(value for value in values if value))
+            options[option] = sorted(values) if sheet is None else values
+
+        entry = {'version': self._source_version(filename), 'options': options}
+        index = self._load_filter_index()
+        if index.get(dataset) == entry:
+            return
+
+        index[dataset] = entry
+        try:
+            self.filter_index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.filter_index_path.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(index, f, indent=2)
+            os.replace(tmp_path, self.filter_index_path)
+        except OSError as e:
+            logger.warning(f"Could not save filter option index: {str(e)}")
+
+    def get_filter_options(self, dataset):
+        """
+        Distinct values for a dataset's report filters, e.g. {'employment_years': [...]}
+
+        Read from the index without loading the data; the dataset is only
+        loaded (and re-indexed) when its source file has changed since.
+        """
+        filename, loader, _ = FILTER_INDEX_FIELDS[dataset]
+        entry = self._load_filter_index().get(dataset)
+        if entry is None or entry['version'] != self._source_version(filename):
+            getattr(self, loader)()
+            entry = self._load_filter_index()[dataset]
+        return entry['options']
+
     def get_all_available_datasets(self):
         """Get list of all available datasets"""
         datasets = []
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+USC IR Portal - Static Page Export
+Pre-renders the public pages to HTML so Flask can serve them without Dash
+Run once per deploy, after the code is in place (see utils/static_site.py)
+
+USAGE:
+    python export_static.py               # Export the pages of every app
+    python export_static.py simple        # Export one app (main or simple)
+"""
+
+import os
+import sys
+
+from utils.static_site import export_pages
+
+
+def export_main():
+    import main_app
+    pages = {path: main_app.create_static_page(path) for path in main_app.STATIC_PAGES}
+    return export_pages(main_app.app, pages, main_app.STATIC_SITE_FOLDER)
+
+
+def export_simple():
+    import simple_app
+    pages = {'/': simple_app.public_layouts.get('home')}
+    return export_pages(simple_app.app, pages, simple_app.STATIC_SITE_FOLDER)
+
+
+EXPORTERS = {
+    'main': export_main,
+    'simple': export_simple,
+}
+
+
+def main():
+    names = [arg for arg in sys.argv[1:] if not arg.startswith('--')] or list(EXPORTERS)
+
+    for name in names:
+        if name not in EXPORTERS:
+            print(f"❌ Unknown app: {name} (choose from {', '.join(EXPORTERS)})")
+            sys.exit(1)
+
+        try:
+            written = EXPORTERS[name]()
+        except Exception as e:
+            print(f"❌ Static export failed for {name}: {e}")
+            sys.exit(1)
+
+        for path in written:
+            print(f"✅ {path} ({os.path.getsize(path) / 1024:.0f} KB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+USC IR Portal - Financial Statement Extraction
+Parses the tables out of the financial statement PDFs in data/ and caches them
+as Parquet (see utils/financial_statements.py). PDFs whose contents have not
+changed since the last run are skipped.
+Run once per deploy, or after replacing a statement PDF
+
+USAGE:
+    python extract_financials.py            # Extract new or changed PDFs
+    python extract_financials.py --force    # Re-extract every PDF
+"""
+
+import sys
+
+from utils.financial_statements import extract_all
+
+
+def main():
+    try:
+        manifest = extract_all(force='--force' in sys.argv)
+    except ImportError as e:
+        print(f"❌ Missing extraction dependency ({e.name}): pip install pdfplumber pyarrow")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Financial statement extraction failed: {e}")
+        sys.exit(1)
+
+    if not manifest:
+        print("⚠️  No financial statement PDFs found")
+
+    for name, entry in manifest.items():
+        status = 'unchanged' if entry['cached'] else 'extracted'
+        print(f"✅ {name}: {entry['rows']} values, {status}")
+        for statement in entry['statements']:
+            print(f"   {statement}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,7 @@
 # google_auth.py
 import os
 import json
-from google.auth.transport import requests
-from google.oauth2 import id_token
+from google_token_verifier import verify_google_id_token
 import sqlite3
 from datetime import datetime, timedelta
 import jwt
@@ -16,8 +15,7 @@ def verify_google_token(token):
     """Verify Google ID token and extract user info"""
     try:
         # Verify the token
-        idinfo = id_token.verify_oauth2_token(
-            token, requests.Request(), GOOGLE_CLIENT_ID)
+        idinfo = verify_google_id_token(token, GOOGLE_CLIENT_ID)
 
         # Verify the issuer
         if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
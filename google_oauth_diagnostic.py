@@ -72,6 +72,107 @@ def test_token_verification():
         print("❌ Cannot test - missing dependencies")
 
 
+def test_cached_verifier_with_stub():
+    """Verify a locally signed token through the shared verifier against a stub cert endpoint"""
+    print("\n" + "-" * 40)
+    print("CACHED CERTIFICATE VERIFIER TEST (LOCAL STUB)")
+    print("-" * 40)
+
+    try:
+        import json
+        import threading
+        import time
+        from datetime import datetime, timedelta, timezone
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+
+        from cryptography import x509
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        from cryptography.x509.oid import NameOID
+        from google.auth import crypt, jwt
+
+        from google_token_verifier import GoogleTokenVerifier
+    except ImportError as e:
+        print(f"❌ Cannot test - missing dependencies: {e}")
+        return False
+
+    client_id = "stub-client.apps.googleusercontent.com"
+    key_id = "stub-key-1"
+
+    # Throwaway signing key and self-signed certificate, like the ones Google publishes
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "stub.googleapis.com")])
+    now = datetime.now(timezone.utc)
+    certificate = (x509.CertificateBuilder()
+                   .subject_name(subject).issuer_name(subject)
+                   .public_key(private_key.public_key())
+                   .serial_number(x509.random_serial_number())
+                   .not_valid_before(now - timedelta(days=1))
+                   .not_valid_after(now + timedelta(days=1))
+                   .sign(private_key, hashes.SHA256()))
+
+    certs_body = json.dumps({
+        key_id: certificate.public_bytes(serialization.Encoding.PEM).decode()
+    }).encode()
+    fetch_count = {'value': 0}
+
+    class StubCertsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            fetch_count['value'] += 1
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Cache-Control', 'public, max-age=300')
+            self.end_headers()
+            self.wfile.write(certs_body)
+
+        def log_message(self, *args):
+            pass
+
+    stub_server = HTTPServer(('127.0.0.1', 0), StubCertsHandler)
+    threading.Thread(target=stub_server.serve_forever, daemon=True).start()
+
+    try:
+        verifier = GoogleTokenVerifier(
+            certs_url=f"http://127.0.0.1:{stub_server.server_port}/oauth2/v1/certs")
+
+        key_pem = private_key.private_bytes(serialization.Encoding.PEM,
+                                            serialization.PrivateFormat.PKCS8,
+                                            serialization.NoEncryption())
+        signer = crypt.RSASigner.from_string(key_pem, key_id=key_id)
+        issued_at = int(time.time())
+        token = jwt.encode(signer, {
+            'iss': 'https://accounts.google.com',
+            'aud': client_id,
+            'sub': '1234567890',
+            'email': 'tester@usc.edu.tt',
+            'name': 'Stub Tester',
+            'iat': issued_at,
+            'exp': issued_at + 600
+        }).decode()
+
+        for _ in range(3):
+            idinfo = verifier.verify(token, client_id)
+        print(f"✅ Token verified locally for {idinfo['email']}")
+
+        if fetch_count['value'] == 1:
+            print("✅ Certificates fetched once and served from cache afterwards")
+        else:
+            print(f"❌ Expected 1 certificate fetch, saw {fetch_count['value']}")
+            return False
+
+        try:
+            verifier.verify(token, "some-other-client")
+            print("❌ Unexpected: token accepted for the wrong audience")
+            return False
+        except ValueError as e:
+            print(f"✅ Wrong audience correctly rejected: {e}")
+
+        return True
+
+    finally:
+        stub_server.shutdown()
+
+
 def provide_installation_instructions():
     """Provide installation instructions if dependencies are missing"""
     print("\n" + "-" * 40)
@@ -125,6 +226,7 @@ def main():
 
     if deps_ok:
         test_token_verification()
+        test_cached_verifier_with_stub()
 
     provide_installation_instructions()
     check_common_issues()
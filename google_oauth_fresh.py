@@ -11,13 +11,8 @@ import jwt
 # First, install required packages:
 # pip install google-auth google-auth-oauthlib google-auth-httplib2
 
-try:
-    from google.auth.transport import requests
-    from google.oauth2 import id_token
-    GOOGLE_AUTH_AVAILABLE = True
-except ImportError:
-    print("⚠️ Google Auth libraries not installed. Run: pip install google-auth google-auth-oauthlib")
-    GOOGLE_AUTH_AVAILABLE = False
+from google_token_verifier import verify_google_id_token, GOOGLE_AUTH_AVAILABLE
+from utils.migrations import migrate_database
 
 # Configuration
 GOOGLE_CLIENT_ID = "890006312213-3k7f200g3a94je1j9trfjru716v3kidc.apps.googleusercontent.com"
@@ -40,11 +35,7 @@ class GoogleOAuth:
             
         try:
             # Verify the token with Google
-            idinfo = id_token.verify_oauth2_token(
-                credential_token, 
-                requests.Request(), 
-                self.client_id
-            )
+            idinfo = verify_google_id_token(credential_token, self.client_id)
             
             # Verify the issuer
             if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
@@ -246,37 +237,10 @@ def handle_google_oauth_callback(credential_token):
         }
 
 
-# Database initialization (add to your existing init_database function)
+# Database initialization
 def init_google_oauth_tables():
-    """Initialize tables needed for Google OAuth"""
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
-    
-    # Add columns to users table if they don't exist
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN google_auth INTEGER DEFAULT 0')
-    except sqlite3.OperationalError:
-        pass  # Column already exists
-    
-    try:
-        cursor.execute('ALTER TABLE users ADD COLUMN profile_picture TEXT')
-    except sqlite3.OperationalError:
-        pass  # Column already exists
-    
-    # Ensure sessions table exists
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS sessions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            token TEXT NOT NULL,
-            expires_at DATETIME NOT NULL,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+    """Ensure the Google OAuth columns and sessions table exist (see migrate_db.py)"""
+    migrate_database(DATABASE)
 
 
 # Test function
@@ -0,0 +1,110 @@
+# google_token_verifier.py
+"""
+Shared Google ID token verifier
+
+Google's public signing certificates are fetched over one reused HTTP session and
+cached for as long as the endpoint's Cache-Control max-age allows. Signatures are
+then checked locally, so a sign-in no longer costs a round trip to Google.
+"""
+
+import re
+import threading
+import time
+
+import requests as http_requests
+
+try:
+    from google.auth import jwt as google_jwt
+
+    GOOGLE_AUTH_AVAILABLE = True
+except ImportError:
+    print("⚠️ Google Auth libraries not installed. Run: pip install google-auth")
+    GOOGLE_AUTH_AVAILABLE = False
+
+# Same certificate endpoint google.oauth2.id_token uses (key id -> PEM certificate)
+GOOGLE_CERTS_URL = 'https://www.googleapis.com/oauth2/v1/certs'
+GOOGLE_ISSUERS = ['accounts.google.com', 'https://accounts.google.com']
+
+# Used when the response carries no usable max-age
+DEFAULT_CERTS_MAX_AGE = 300
+
+
+def _parse_max_age(response) -> int:
+    """Remaining freshness lifetime from Cache-Control max-age minus Age"""
+    cache_control = response.headers.get('Cache-Control', '')
+    if 'no-cache' in cache_control or 'no-store' in cache_control:
+        return 0
+
+    match = re.search(r'max-age=(\d+)', cache_control)
+    if not match:
+        return DEFAULT_CERTS_MAX_AGE
+
+    try:
+        age = int(response.headers.get('Age', 0))
+    except ValueError:
+        age = 0
+
+    return max(int(match.group(1)) - age, 0)
+
+
+class GoogleTokenVerifier:
+    """Verifies Google ID tokens against a cached copy of Google's certificates"""
+
+    def __init__(self, certs_url: str = GOOGLE_CERTS_URL, session=None,
+                 clock_skew_seconds: int = 10):
+        self.certs_url = certs_url
+        self.clock_skew_seconds = clock_skew_seconds
+        self._session = session or http_requests.Session()
+        self._certs = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_certs(self, force_refresh: bool = False) -> dict:
+        """Return cached certificates, refetching only once they have expired"""
+        if not force_refresh and self._certs is not None and time.monotonic() < self._expires_at:
+            return self._certs
+
+        with self._lock:
+            # Another thread may have refreshed while we waited for the lock
+            if not force_refresh and self._certs is not None and time.monotonic() < self._expires_at:
+                return self._certs
+
+            response = self._session.get(self.certs_url, timeout=5)
+            response.raise_for_status()
+
+            self._certs = response.json()
+            self._expires_at = time.monotonic() + _parse_max_age(response)
+
+            return self._certs
+
+    def verify(self, token: str, audience: str) -> dict:
+        """
+        Verify an ID token's signature, audience, expiry and issuer
+        Returns the token claims; raises ValueError when the token is invalid
+        """
+        if not GOOGLE_AUTH_AVAILABLE:
+            raise ValueError('Google Auth libraries not available')
+
+        try:
+            idinfo = google_jwt.decode(token, certs=self.get_certs(), audience=audience,
+                                       clock_skew_in_seconds=self.clock_skew_seconds)
+        except ValueError as e:
+            # Google rotated its keys before our cached copy expired - refetch once
+            if 'Certificate for key id' not in str(e):
+                raise
+            idinfo = google_jwt.decode(token, certs=self.get_certs(force_refresh=True), audience=audience,
+                                       clock_skew_in_seconds=self.clock_skew_seconds)
+
+        if idinfo.get('iss') not in GOOGLE_ISSUERS:
+            raise ValueError('Wrong issuer.')
+
+        return idinfo
+
+
+# Global instance shared by all sign-in handlers
+google_token_verifier = GoogleTokenVerifier()
+
+
+def verify_google_id_token(token: str, client_id: str) -> dict:
+    """Drop-in replacement for id_token.verify_oauth2_token using the shared cache"""
+    return google_token_verifier.verify(token, client_id)
@@ -0,0 +1,36 @@
+"""
+Gunicorn settings for the unified USC IR portal
+
+Usage: gunicorn -c gunicorn.conf.py unified_app:server
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8050)}"
+
+# One worker pool serves both the Dash callbacks and the auth routes
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 4)))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = 120
+
+# Import the app once in the master so workers share its memory pages
+preload_app = True
+
+accesslog = '-'
+errorlog = '-'
+
+
+def on_starting(server):
+    # Runs once in the master before any worker forks; a no-op when the
+    # deploy step (python migrate_db.py) has already applied every migration
+    from utils.migrations import migrate_all
+    migrate_all()
+
+
+def post_fork(server, worker):
+    # Background threads do not survive fork, so each worker starts its own session
+    # sweeper; overlapping sweeps are harmless because deletes are batched and idempotent
+    from utils.maintenance import maintenance_scheduler
+    maintenance_scheduler.start()
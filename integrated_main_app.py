@@ -13,15 +13,9 @@ from dotenv import load_dotenv
 # Load environment
 load_dotenv()
 
-# Google Auth imports
-try:
-    from google.auth.transport import requests as google_requests
-    from google.oauth2 import id_token
-
-    GOOGLE_AUTH_AVAILABLE = True
-except ImportError:
-    print("⚠️ Google Auth not available")
-    GOOGLE_AUTH_AVAILABLE = False
+# Google Auth (certificates cached and signatures verified locally)
+from google_token_verifier import verify_google_id_token, GOOGLE_AUTH_AVAILABLE
+from utils.migrations import migrate_database
 
 # Configuration
 DATABASE = 'usc_portal.db'
@@ -40,36 +34,8 @@ app.title = "USC Institutional Research"
 # ==================== DATABASE SETUP ====================
 
 def init_database():
-    """Initialize database"""
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
-
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT UNIQUE NOT NULL,
-            full_name TEXT,
-            role TEXT DEFAULT 'user',
-            is_active INTEGER DEFAULT 1,
-            google_id TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            last_login TIMESTAMP
-        )
-    ''')
-
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS user_sessions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            session_token TEXT UNIQUE NOT NULL,
-            user_id INTEGER NOT NULL,
-            user_email TEXT NOT NULL,
-            expires_at TIMESTAMP NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-
-    conn.commit()
-    conn.close()
+    """Bring the database up to the current schema (see migrate_db.py)"""
+    migrate_database(DATABASE)
 
 
 # ==================== AUTHENTICATION FUNCTIONS ====================
@@ -200,8 +166,7 @@ def google_auth():
         credential = request.json.get('credential')
 
         # Verify the token
-        idinfo = id_token.verify_oauth2_token(
-            credential, google_requests.Request(), GOOGLE_CLIENT_ID)
+        idinfo = verify_google_id_token(credential, GOOGLE_CLIENT_ID)
 
         email = idinfo.get('email')
         name = idinfo.get('name', email)
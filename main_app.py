@@ -12,6 +12,15 @@ from datetime import datetime, timedelta
 import traceback
 import os
 from dotenv import load_dotenv
+from utils.migrations import migrate_database
+from config import STATIC_SITE_CONFIG
+from data_loader import data_loader
+from utils.compression import install_compression
+from utils.layout_cache import static_layouts
+from utils.static_site import install_static_pages
+from utils.streaming_export import install_export_routes
+from utils.data_upload import install_upload_routes
+from utils.rate_limit import install_rate_limiter
 
 # Load environment variables
 load_dotenv()
@@ -73,45 +82,13 @@ USC_COLORS = {
 # Database setup
 DATABASE = 'usc_portal.db'
 
+# Auth server location; '' means the auth routes run on this server (unified_app.py)
+AUTH_SERVER_URL = os.getenv('AUTH_SERVER_URL', 'http://localhost:5000')
+
 
 def init_database():
-    """Initialize the database with required tables"""
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
-
-    # Users table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT UNIQUE NOT NULL,
-            username TEXT UNIQUE NOT NULL,
-            password_hash TEXT,
-            full_name TEXT,
-            role TEXT DEFAULT 'user',
-            is_active INTEGER DEFAULT 1,
-            is_approved INTEGER DEFAULT 0,
-            google_auth INTEGER DEFAULT 0,
-            google_id TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            last_login TIMESTAMP
-        )
-    ''')
-
-    # User sessions table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS user_sessions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            session_token TEXT UNIQUE NOT NULL,
-            user_id INTEGER NOT NULL,
-            user_email TEXT NOT NULL,
-            expires_at TIMESTAMP NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
-
-    conn.commit()
-    conn.close()
+    """Bring the database up to the current schema (see migrate_db.py)"""
+    migrate_database(DATABASE)
 
 
 # Initialize Dash app
@@ -124,6 +101,23 @@ app = dash.Dash(__name__,
 
 server = app.server
 
+# Throttle abusive clients before they reach the callback workers
+install_rate_limiter(server)
+install_compression(server)
+
+# Pre-rendered public pages (python export_static.py). Only when the auth routes
+# share this server: otherwise signed-in state isn't visible here
+STATIC_SITE_FOLDER = os.path.join(STATIC_SITE_CONFIG['output_folder'], 'main')
+if not AUTH_SERVER_URL:
+    install_static_pages(server, STATIC_SITE_FOLDER, content_version=data_loader.text_content_version)
+
+# Streamed CSV/XLSX downloads at /export/<source>.<fmt> and the chunked admin
+# dataset uploads at /upload, for the same reason only when the auth routes share this server
+if not AUTH_SERVER_URL:
+    from auth_routes import get_session_payload
+    install_export_routes(server, get_session_payload)
+    install_upload_routes(server, get_session_payload)
+
 # Custom CSS for better styling
 app.index_string = '''
 <!DOCTYPE html>
@@ -228,7 +222,7 @@ def create_navbar_builtin(user=None):
             dbc.DropdownMenuItem([
                 html.I(className="fas fa-sign-out-alt me-2"),
                 "Logout"
-            ], href="http://localhost:5000/auth/logout", external_link=True)
+            ], href=f"{AUTH_SERVER_URL}/auth/logout", external_link=True)
         ],
             nav=True,
             in_navbar=True,
@@ -261,7 +255,7 @@ def create_navbar_builtin(user=None):
             dbc.NavItem(dbc.NavLink([
                 html.I(className="fas fa-sign-in-alt me-2"),
                 "Sign In"
-            ], href="http://localhost:5000/login", external_link=True, className="btn btn-outline-light ms-3"))
+            ], href=f"{AUTH_SERVER_URL}/login", external_link=True, className="btn btn-outline-light ms-3"))
         ]
 
     return dbc.Navbar([
@@ -495,6 +489,35 @@ if create_dashboard is None:
 if create_about_usc_layout is None:
     create_about_usc_layout = create_about_usc_layout_builtin
 
+# Public pages are identical for every visitor: build each once (utils/layout_cache.py)
+# About/governance text comes from data/*.txt and is rebuilt when those files change
+static_layouts.register('home', create_home_page)
+static_layouts.register('about-usc', create_about_usc_layout, version=data_loader.text_content_version)
+static_layouts.register('vision-mission-motto', create_vision_mission_motto_layout
+                        or (lambda: html.H1("Vision & Mission - Coming Soon")))
+static_layouts.register('governance', create_governance_layout
+                        or (lambda: html.H1("Governance - Coming Soon")),
+                        version=data_loader.text_content_version)
+static_layouts.register('request', create_request_form_builtin)
+
+# URL path -> cached layout name for the pages export_static.py pre-renders
+STATIC_PAGES = {
+    '/': 'home',
+    '/about-usc': 'about-usc',
+    '/vision-mission-motto': 'vision-mission-motto',
+    '/governance': 'governance',
+    '/request': 'request',
+}
+
+
+def create_static_page(pathname):
+    """A public page as an anonymous visitor sees it, with the app's navbar/content wrappers"""
+    navbar = create_navbar(None) if create_navbar else create_navbar_builtin(None)
+    return html.Div([
+        html.Div(navbar, id='navbar-container'),
+        html.Div(static_layouts.get(STATIC_PAGES[pathname]), id='page-content')
+    ])
+
 # ==================== APP LAYOUT ====================
 
 app.layout = html.Div([
@@ -507,6 +530,28 @@ app.layout = html.Div([
 
 # ==================== CALLBACKS ====================
 
+# Admin dashboard tabs, exports and reports register themselves on import
+import callbacks
+
+def fetch_flask_session_data():
+    """Get the auth session summary, in-process when unified or via the auth server"""
+    if not AUTH_SERVER_URL:
+        from auth_routes import get_session_payload
+        return get_session_payload()
+
+    import urllib.request
+    import json
+
+    req = urllib.request.Request(f'{AUTH_SERVER_URL}/auth/session-data')
+
+    with urllib.request.urlopen(req, timeout=3) as response:
+        if response.status == 200:
+            return json.loads(response.read().decode())
+
+        print(f"❌ FLASK: Session endpoint error: {response.status}")
+        return None
+
+
 # REPLACE your callbacks in main_app.py with this SINGLE COMBINED callback:
 
 # REMOVE both old callbacks and replace with this ONE callback:
@@ -527,41 +572,33 @@ def display_page_with_session_sync(pathname, session_data):
         synced_session_data = {}
 
         try:
-            import urllib.request
-            import urllib.error
-            import json
-
-            req = urllib.request.Request('http://localhost:5000/auth/session-data')
-
-            with urllib.request.urlopen(req, timeout=3) as response:
-                if response.status == 200:
-                    flask_session_data = json.loads(response.read().decode())
-
-                    print(f"📡 FLASK: {flask_session_data}")
-
-                    # Strict validation - must have ALL required fields
-                    if (flask_session_data.get('authenticated') and
-                            flask_session_data.get('token') and
-                            flask_session_data.get('user_id') and
-                            flask_session_data.get('email')):
-
-                        synced_session_data = {
-                            'token': flask_session_data.get('token'),
-                            'user_id': flask_session_data.get('user_id'),
-                            'email': flask_session_data.get('email'),
-                            'full_name': flask_session_data.get('full_name', flask_session_data.get('email')),
-                            'role': flask_session_data.get('role', 'user'),
-                            'authenticated': True,
-                            'synced_at': datetime.now().isoformat()
-                        }
-
-                        print(f"✅ FLASK: Valid session for {synced_session_data['email']}")
-                    else:
-                        print("❌ FLASK: Invalid or incomplete session")
-                        synced_session_data = {'authenticated': False}
+            flask_session_data = fetch_flask_session_data()
+
+            if flask_session_data is not None:
+                print(f"📡 FLASK: {flask_session_data}")
+
+                # Strict validation - must have ALL required fields
+                if (flask_session_data.get('authenticated') and
+                        flask_session_data.get('token') and
+                        flask_session_data.get('user_id') and
+                        flask_session_data.get('email')):
+
+                    synced_session_data = {
+                        'token': flask_session_data.get('token'),
+                        'user_id': flask_session_data.get('user_id'),
+                        'email': flask_session_data.get('email'),
+                        'full_name': flask_session_data.get('full_name', flask_session_data.get('email')),
+                        'role': flask_session_data.get('role', 'user'),
+                        'authenticated': True,
+                        'synced_at': datetime.now().isoformat()
+                    }
+
+                    print(f"✅ FLASK: Valid session for {synced_session_data['email']}")
                 else:
-                    print(f"❌ FLASK: Session endpoint error: {response.status}")
+                    print("❌ FLASK: Invalid or incomplete session")
                     synced_session_data = {'authenticated': False}
+            else:
+                synced_session_data = {'authenticated': False}
 
         except Exception as e:
             print(f"❌ FLASK: Session sync failed: {e}")
@@ -599,29 +636,10 @@ def display_page_with_session_sync(pathname, session_data):
 
         # STEP 5: Route handling
         if pathname == '/' or pathname is None:
-            if create_home_page:
-                content = create_home_page()
-            else:
-                content = create_home_page_builtin()
+            content = static_layouts.get('home')
 
         elif pathname in ['/about-usc', '/vision-mission-motto', '/governance', '/request']:
-            if pathname == '/about-usc':
-                if create_about_usc_layout:
-                    content = create_about_usc_layout()
-                else:
-                    content = create_about_usc_layout_builtin()
-            elif pathname == '/vision-mission-motto':
-                if create_vision_mission_motto_layout:
-                    content = create_vision_mission_motto_layout()
-                else:
-                    content = html.H1("Vision & Mission - Coming Soon")
-            elif pathname == '/governance':
-                if create_governance_layout:
-                    content = create_governance_layout()
-                else:
-                    content = html.H1("Governance - Coming Soon")
-            elif pathname == '/request':
-                content = create_request_form_builtin()
+            content = static_layouts.get(pathname.lstrip('/'))
 
         elif pathname == '/login':
             if is_authenticated:
@@ -634,7 +652,7 @@ def display_page_with_session_sync(pathname, session_data):
                 ])
             else:
                 content = html.Div([
-                    html.Script('window.location.href = "http://localhost:5000/login";')
+                    html.Script(f'window.location.href = "{AUTH_SERVER_URL}/login";')
                 ])
 
         elif pathname in ['/dashboard', '/factbook', '/data-management', '/admin']:
@@ -664,9 +682,9 @@ def display_page_with_session_sync(pathname, session_data):
                     dbc.Alert([
                         html.I(className="fas fa-lock me-2"),
                         "Please sign in to access this page. ",
-                        html.A("Sign In", href="http://localhost:5000/login", className="alert-link")
+                        html.A("Sign In", href=f"{AUTH_SERVER_URL}/login", className="alert-link")
                     ], color="warning"),
-                    html.Script('setTimeout(() => window.location.href = "http://localhost:5000/login", 3000);')
+                    html.Script(f'setTimeout(() => window.location.href = "{AUTH_SERVER_URL}/login", 3000);')
                 ])
 
         else:
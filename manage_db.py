@@ -5,23 +5,27 @@ Use this script to manage users, reset passwords, and view logs
 """
 
 import sqlite3
-import hashlib
-import secrets
 from datetime import datetime
 import sys
+import os
+import csv
+import secrets
 import getpass
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from auth.credential_verifier import hash_password as _pbkdf2_hash_password
+from utils.audit_log import iter_audit_log, query_audit_log
+from utils.backup import backup_all, format_backup_summary
+from utils.maintenance import ensure_session_indexes, sweep_expired_sessions
 
 DATABASE = 'usc_ir_new.db'
 
 
 def hash_password(password):
-    """Hash password with salt"""
-    salt = secrets.token_hex(16)
-    password_hash = hashlib.pbkdf2_hmac('sha256',
-                                        password.encode('utf-8'),
-                                        salt.encode('utf-8'),
-                                        100000)
-    return f"{salt}:{password_hash.hex()}"
+    """Hash password with salt (shared PBKDF2 implementation)"""
+    return _pbkdf2_hash_password(password)
 
 
 def create_admin(email, username, password, full_name):
@@ -76,6 +80,168 @@ def create_user(email, username, password, full_name, department, position):
     print(f"✅ User '{username}' created successfully!")
 
 
+# Spreadsheet column -> users column for bulk imports (HR exports use the right-hand names)
+IMPORT_COLUMN_ALIASES = {
+    'email': 'email', 'Email': 'email', 'EmailAddress': 'email',
+    'username': 'username', 'Username': 'username',
+    'full_name': 'full_name', 'FullName': 'full_name', 'Name': 'full_name',
+    'first_name': 'first_name', 'FirstName': 'first_name',
+    'last_name': 'last_name', 'LastName': 'last_name',
+    'department': 'department', 'Department': 'department',
+    'position': 'position', 'Position': 'position',
+    'role': 'role', 'Role': 'role',
+    'password': 'password', 'Password': 'password'
+}
+
+
+def read_import_file(path, sheet=None):
+    """Read a CSV/XLSX of users into a DataFrame with normalized column names"""
+    if path.lower().endswith(('.xlsx', '.xls')):
+        df = pd.read_excel(path, sheet_name=sheet or 0, dtype=str)
+    else:
+        df = pd.read_csv(path, dtype=str)
+
+    df = df.rename(columns={column: IMPORT_COLUMN_ALIASES[column]
+                            for column in df.columns if column in IMPORT_COLUMN_ALIASES})
+    return df.fillna('')
+
+
+def prepare_import_rows(df, email_domain=None):
+    """
+    Build (email, username, full_name, department, position, role, password) rows
+    Without an email column, addresses are built as <first initial><last name>@email_domain
+    """
+    columns = df.to_dict('list')
+    count = len(df)
+
+    def column(name):
+        return [str(value).strip() for value in columns.get(name, [''] * count)]
+
+    first_names, last_names = column('first_name'), column('last_name')
+    full_names = [name or f"{first} {last}".strip()
+                  for name, first, last in zip(column('full_name'), first_names, last_names)]
+
+    emails = column('email')
+    if not any(emails):
+        if not email_domain:
+            raise ValueError("File has no email column; pass --email-domain to build addresses")
+        emails = [f"{first[:1]}{last}".lower().replace(' ', '').replace("'", '') + f"@{email_domain}"
+                  if first and last else ''
+                  for first, last in zip(first_names, last_names)]
+
+    emails = [email.lower() for email in emails]
+    usernames = [username or email.split('@')[0] for username, email in zip(column('username'), emails)]
+    roles = [role.lower() or 'user' for role in column('role')]
+
+    rows = []
+    for email, username, full_name, department, position, role, password in zip(
+            emails, usernames, full_names, column('department'), column('position'), roles, column('password')):
+        if email and full_name:
+            rows.append((email, username, full_name, department, position, role, password))
+
+    return rows
+
+
+def import_users(path, sheet=None, email_domain=None, credentials_out='provisioned_credentials.csv',
+                 dry_run=False, workers=None):
+    """Bulk-create users from a CSV/XLSX file in a single transaction"""
+    rows = prepare_import_rows(read_import_file(path, sheet), email_domain)
+
+    # Drop duplicates inside the file (first row wins)
+    seen_emails, seen_usernames, unique_rows = set(), set(), []
+    for row in rows:
+        if row[0] not in seen_emails and row[1] not in seen_usernames:
+            seen_emails.add(row[0])
+            seen_usernames.add(row[1])
+            unique_rows.append(row)
+
+    conn = sqlite3.connect(DATABASE)
+    cursor = conn.cursor()
+
+    # One set-based query against existing accounts: an indexed lookup per column (an OR
+    # across both, or LOWER(email), would scan users for every imported row). Stored emails
+    # aren't all lowercase, so they are matched through a case-insensitive index
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_email_nocase ON users (email COLLATE NOCASE)')
+    cursor.execute('CREATE TEMP TABLE import_users (email TEXT, username TEXT)')
+    cursor.executemany('INSERT INTO import_users VALUES (?, ?)', [(row[0], row[1]) for row in unique_rows])
+    cursor.execute('''
+        SELECT i.email FROM import_users i JOIN users u ON u.email = i.email COLLATE NOCASE
+        UNION
+        SELECT i.email FROM import_users i JOIN users u ON u.username = i.username
+    ''')
+    existing = {email for email, in cursor.fetchall()}
+    new_rows = [row for row in unique_rows if row[0] not in existing]
+
+    print(f"📄 {len(rows)} rows read, {len(rows) - len(unique_rows)} duplicates in file, "
+          f"{len(existing)} already registered, {len(new_rows)} to create")
+
+    if dry_run or not new_rows:
+        conn.close()
+        return len(new_rows)
+
+    # Rows without a password get a temporary one, written to the credentials file
+    passwords = [row[6] or secrets.token_urlsafe(9) for row in new_rows]
+
+    started = datetime.now()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        password_hashes = list(executor.map(hash_password, passwords, chunksize=16))
+    print(f"🔐 Hashed {len(passwords)} passwords in {(datetime.now() - started).total_seconds():.1f}s")
+
+    try:
+        cursor.executemany('''
+            INSERT INTO users (email, username, password_hash, full_name, 
+                              department, position, role, is_active)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 1)
+        ''', [(email, username, password_hash, full_name, department, position, role)
+              for (email, username, full_name, department, position, role, _), password_hash
+              in zip(new_rows, password_hashes)])
+        conn.commit()
+    except sqlite3.Error as e:
+        conn.rollback()
+        conn.close()
+        print(f"❌ Import failed, no users were created: {e}")
+        return 0
+
+    conn.close()
+
+    generated = [(row[0], row[1], password) for row, password in zip(new_rows, passwords) if not row[6]]
+    if generated:
+        # Readable by the owner only, whatever the umask (and if an older copy was left behind)
+        fd = os.open(credentials_out, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.fchmod(fd, 0o600)
+        with os.fdopen(fd, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['email', 'username', 'temporary_password'])
+            writer.writerows(generated)
+        print(f"🔑 Temporary passwords written to {credentials_out} - distribute securely, then delete it")
+
+    print(f"✅ Created {len(new_rows)} users")
+    return len(new_rows)
+
+
+def parse_import_options(args):
+    """Parse import-users options: <file> [--sheet S] [--email-domain D] [--credentials-out F] [--dry-run]"""
+    if not args:
+        raise ValueError("import-users needs a CSV or XLSX file")
+
+    options = {'path': args[0]}
+    option_names = {'--sheet': 'sheet', '--email-domain': 'email_domain', '--credentials-out': 'credentials_out'}
+
+    i = 1
+    while i < len(args):
+        arg = args[i]
+        if arg == '--dry-run':
+            options['dry_run'] = True
+        elif arg in option_names and i + 1 < len(args):
+            options[option_names[arg]] = args[i + 1]
+            i += 1
+        else:
+            raise ValueError(f"Unknown import-users option: {arg}")
+        i += 1
+
+    return options
+
+
 def list_users():
     """List all users"""
     conn = sqlite3.connect(DATABASE)
@@ -177,50 +343,73 @@ def promote_to_admin(username):
 
 def clear_expired_sessions():
     """Clear all expired sessions"""
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
+    ensure_session_indexes(DATABASE, 'sessions', ('token',), 'expires_at')
+    deleted = sweep_expired_sessions(DATABASE, 'sessions', 'expires_at')
+    print(f"✅ Cleared {deleted} expired sessions")
 
-    cursor.execute('DELETE FROM sessions WHERE expires_at < ?', (datetime.now(),))
-    deleted = cursor.rowcount
 
-    conn.commit()
-    conn.close()
-    print(f"✅ Cleared {deleted} expired sessions")
+def _print_log_row(log):
+    timestamp = log['timestamp'] or "Unknown"
+    user = log['username'] or "System"
+    action = log['action'] or "Unknown"
+    details = log['details'] or ""
+    details = (details[:47] + "...") if len(details) > 50 else details
 
+    print(f"{timestamp:<20} {user:<15} {action:<15} {details:<50}", flush=True)
 
-def view_access_logs(limit=50):
-    """View recent access logs"""
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
 
-    cursor.execute('''
-        SELECT a.timestamp, u.username, a.action, a.details
-        FROM access_logs a
-        LEFT JOIN users u ON a.user_id = u.id
-        ORDER BY a.timestamp DESC
-        LIMIT ?
-    ''', (limit,))
-
-    logs = cursor.fetchall()
-    conn.close()
+def view_access_logs(limit=50, stream=False, **filters):
+    """
+    View access logs, newest first
+    stream=True prints every matching entry as pages are read instead of stopping at limit
+    filters: username, action, start, end (see utils.audit_log.query_audit_log)
+    """
+    title = "ACCESS LOGS (streaming)" if stream else f"RECENT ACCESS LOGS (Last {limit})"
 
     print(f"\n{'=' * 100}")
-    print(f"RECENT ACCESS LOGS (Last {limit})")
+    print(title)
     print(f"{'=' * 100}")
     print(f"{'Timestamp':<20} {'User':<15} {'Action':<15} {'Details':<50}")
     print(f"{'-' * 100}")
 
-    for log in logs:
-        timestamp = log[0] if log[0] else "Unknown"
-        user = log[1] if log[1] else "System"
-        action = log[2] if log[2] else "Unknown"
-        details = (log[3][:47] + "...") if log[3] and len(log[3]) > 50 else (log[3] or "")
+    if stream:
+        count = 0
+        for log in iter_audit_log(DATABASE, table='access_logs', **filters):
+            _print_log_row(log)
+            count += 1
+        print(f"{'=' * 100}")
+        print(f"Total entries: {count}")
+        return
 
-        print(f"{timestamp:<20} {user:<15} {action:<15} {details:<50}")
+    logs, _ = query_audit_log(DATABASE, limit=limit, table='access_logs', **filters)
+    for log in logs:
+        _print_log_row(log)
 
     print(f"{'=' * 100}")
 
 
+def parse_log_options(args):
+    """Parse logs command options: [limit] [--stream] [--user U] [--action A] [--since DATE] [--until DATE]"""
+    options = {'limit': 50, 'stream': False}
+    option_names = {'--user': 'username', '--action': 'action', '--since': 'start', '--until': 'end'}
+
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == '--stream':
+            options['stream'] = True
+        elif arg in option_names and i + 1 < len(args):
+            options[option_names[arg]] = args[i + 1]
+            i += 1
+        elif arg.isdigit():
+            options['limit'] = int(arg)
+        else:
+            raise ValueError(f"Unknown logs option: {arg}")
+        i += 1
+
+    return options
+
+
 def interactive_mode():
     """Interactive command-line interface"""
     print("\n" + "=" * 60)
@@ -306,11 +495,21 @@ if __name__ == "__main__":
             reset_password(sys.argv[2], sys.argv[3])
         elif command == "promote" and len(sys.argv) == 3:
             promote_to_admin(sys.argv[2])
+        elif command == "import-users":
+            try:
+                import_users(**parse_import_options(sys.argv[2:]))
+            except (ValueError, OSError) as e:
+                print(f"❌ {e}")
+        elif command == "backup":
+            for entry in backup_all(sys.argv[2:] or None):
+                print(f"💾 {format_backup_summary(entry)}")
         elif command == "clear-sessions":
             clear_expired_sessions()
         elif command == "logs":
-            limit = int(sys.argv[2]) if len(sys.argv) > 2 else 50
-            view_access_logs(limit)
+            try:
+                view_access_logs(**parse_log_options(sys.argv[2:]))
+            except ValueError as e:
+                print(f"❌ {e}")
         elif command == "help":
             print("""
 USC IR Database Management Tool
@@ -327,8 +526,12 @@ COMMANDS:
     activate <username>                                   # Activate user
     reset-password <username> <new_password>              # Reset password
     promote <username>                                    # Promote user to admin
+    import-users <file.csv|xlsx> [--sheet S] [--email-domain D] [--credentials-out F] [--dry-run]
+                                                          # Bulk-create users from a staff list
+    backup [database ...]                                 # Compressed online backup (default: all)
     clear-sessions                                        # Clear expired sessions
     logs [limit]                                          # View access logs
+    logs --stream [--user U] [--action A] [--since DATE] [--until DATE]  # Stream matching logs
     help                                                  # Show this help
 
 EXAMPLES:
@@ -336,7 +539,9 @@ EXAMPLES:
     python manage_db.py create-user john@usc.edu.tt john pass123 "John Doe" "Finance" "Analyst"
     python manage_db.py reset-password admin newpass123
     python manage_db.py list
+    python manage_db.py import-users data/HrData.xlsx --sheet 2023-2024 --email-domain usc.edu.tt --dry-run
     python manage_db.py logs 20
+    python manage_db.py logs --stream --user admin --since 2025-01-01
             """)
         else:
             print("❌ Invalid command! Use 'python manage_db.py help' for usage.")
\ No newline at end of file
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+USC IR Portal - Schema Migration Tool
+Run once per deploy to bring every database up to the current schema
+
+USAGE:
+    python migrate_db.py                  # Migrate all portal databases
+    python migrate_db.py usc_ir.db        # Migrate specific databases
+    python migrate_db.py --status         # Show each database's schema version
+"""
+
+import sys
+
+from utils.migrations import DATABASE_SCHEMAS, LATEST_VERSION, get_schema_version, migrate_database
+
+
+def show_status(databases):
+    print(f"Latest schema version: {LATEST_VERSION}")
+    for db_path in databases:
+        version = get_schema_version(db_path)
+        state = "✅ up to date" if version >= LATEST_VERSION else "⚠️  pending migrations"
+        print(f"   {db_path:<20} version {version:<4} {state}")
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    databases = args or list(DATABASE_SCHEMAS)
+
+    if '--status' in sys.argv:
+        show_status(databases)
+        return
+
+    total = 0
+    for db_path in databases:
+        try:
+            total += migrate_database(db_path, verbose=True)
+        except Exception as e:
+            print(f"❌ Migration failed for {db_path}: {e}")
+            sys.exit(1)
+
+    print(f"✅ Schema up to date ({total} migrations applied)")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,9 @@ import dash
 from dash import html, dcc
 import dash_bootstrap_components as dbc
 
+from components.text_content import render_text_blocks
+from data_loader import data_loader
+
 # USC Brand Colors
 USC_COLORS = {
     "primary_green": "#1B5E20",
@@ -13,8 +16,34 @@ USC_COLORS = {
 }
 
 
+def _about_us_sections():
+    """
+    Split data/About Us.txt into (heritage blocks, CARU member names)
+    The numbered list and the paragraph introducing it belong to the governance card
+    """
+    content = data_loader.load_text_content('about_us')
+    if not content:
+        return None, None
+
+    blocks = content['blocks']
+    heritage, members = [], []
+    for i, block in enumerate(blocks):
+        if block['type'] == 'list':
+            members.extend(block['items'])
+        elif not (i + 1 < len(blocks) and blocks[i + 1]['type'] == 'list'):
+            heritage.append(block)
+    return heritage or None, members or None
+
+
+def _member_columns(members):
+    half = (len(members) + 1) // 2
+    return [dbc.Col([html.Ul([html.Li(name) for name in column], style={"fontSize": "1rem"})], md=6)
+            for column in (members[:half], members[half:])]
+
+
 def create_about_usc_layout():
     """Create the About USC page layout"""
+    heritage, caru_members = _about_us_sections()
 
     return html.Div([
         # Hero Section
@@ -50,7 +79,8 @@ def create_about_usc_layout():
                                 "Our Heritage"
                             ], className="text-white mb-0")
                         ], style={"backgroundColor": USC_COLORS["primary_green"]}),
-                        dbc.CardBody([
+                        dbc.CardBody(render_text_blocks(heritage, paragraph_style={"fontSize": "1.1rem"})
+                                     if heritage else [
                             html.P([
                                 "Founded in 1927, the University of the Southern Caribbean is a private, ",
                                 "co-educational, tertiary-level university with its main campus located in ",
@@ -185,7 +215,7 @@ def create_about_usc_layout():
                             html.H5("CARU Member Organizations:", className="mb-3",
                                     style={"color": USC_COLORS["primary_green"]}),
 
-                            dbc.Row([
+                            dbc.Row(_member_columns(caru_members) if caru_members else [
                                 dbc.Col([
                                     html.Ul([
                                         html.Li("North Caribbean Conference"),
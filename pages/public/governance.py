@@ -2,6 +2,8 @@ import dash
 from dash import html, dcc
 import dash_bootstrap_components as dbc
 
+from components.text_content import text_content
+
 # USC Brand Colors
 USC_COLORS = {
     "primary_green": "#1B5E20",
@@ -124,11 +126,13 @@ def create_governance_layout():
                             ], className="text-white mb-0")
                         ], style={"backgroundColor": USC_COLORS["primary_green"]}),
                         dbc.CardBody([
-                            html.P([
+                            # The file goes on to introduce the trustee list, which this page doesn't show
+                            *text_content('board_of_trustees', [html.P([
                                 "The Board of Trustees is the supreme decision-making entity for the university. ",
                                 "The board is quinquennially elected and comprises thirty-four persons including ",
                                 "key leadership from the Caribbean Union Conference of the Seventh-day Adventist Church."
-                            ], className="mb-4", style={"fontSize": "1.1rem"}),
+                            ], className="mb-4", style={"fontSize": "1.1rem"})],
+                                max_paragraphs=1, className="mb-4", paragraph_style={"fontSize": "1.1rem"}),
 
                             dbc.Row([
                                 dbc.Col([
@@ -180,11 +184,12 @@ def create_governance_layout():
                             ], className="text-white mb-0")
                         ], style={"backgroundColor": USC_COLORS["secondary_green"]}),
                         dbc.CardBody([
-                            html.P([
+                            *text_content('presidents_cabinet', [html.P([
                                 "The university's day-to-day operations are the responsibility of the President, ",
                                 "the university's Chief Executive Officer. The President's Cabinet has executive ",
                                 "oversight over the operational activities of the university."
-                            ], className="mb-4", style={"fontSize": "1.1rem"}),
+                            ], className="mb-4", style={"fontSize": "1.1rem"})],
+                                className="mb-4", paragraph_style={"fontSize": "1.1rem"}),
 
                             dbc.Row([
                                 dbc.Col([
@@ -220,11 +225,13 @@ def create_governance_layout():
                             ], className="text-white mb-0")
                         ], style={"backgroundColor": USC_COLORS["primary_green"]}),
                         dbc.CardBody([
-                            html.P([
+                            # The file's closing line introduces a member list the page doesn't show
+                            *text_content('administrative_council', [html.P([
                                 "The central internal governance structure includes an Administrative Council ",
                                 "chaired by the President. Its membership includes a broad cross-section of ",
                                 "internal university leaders and interest groups."
-                            ], className="mb-4", style={"fontSize": "1.1rem"}),
+                            ], className="mb-4", style={"fontSize": "1.1rem"})],
+                                max_paragraphs=2, className="mb-4", paragraph_style={"fontSize": "1.1rem"}),
 
                             dbc.Row([
                                 dbc.Col([
@@ -63,23 +63,11 @@ def load_data_dynamically():
         return get_sample_data()
 
 def get_fresh_filter_options():
-    """Get fresh filter options from current data"""
-    employment_df, expense_df, monthly_expense_df = load_data_dynamically()
+    """Get filter options from the data loader's distinct-values index (no workbook load)"""
+    from data_loader import data_loader
 
-    available_employment_years = []
-    available_expense_years = []
-    available_monthly_years = []
-
-    if employment_df is not None and not employment_df.empty:
-        available_employment_years = employment_df['Academic Year'].unique().tolist()
-
-    if expense_df is not None and not expense_df.empty:
-        available_expense_years = expense_df['Year'].unique().tolist()
-
-    if monthly_expense_df is not None and not monthly_expense_df.empty:
-        available_monthly_years = [col for col in monthly_expense_df.columns if col != 'Month']
-
-    return available_employment_years, available_expense_years, available_monthly_years
+    options = data_loader.get_filter_options('student_labour')
+    return options['employment_years'], options['expense_years'], options['monthly_years']
 
 def get_sample_data():
     """Provide sample data based on the Excel file structure we examined"""
@@ -507,35 +495,12 @@ def create_monthly_expense_chart(chart_type='bar', selected_years=None):
     print("✅ Monthly expense chart created successfully")
     return fig
 
-def get_fresh_filter_options():
-    """Get fresh filter options from current data"""
-    employment_df, expense_df, monthly_expense_df = load_data_dynamically()
-
-    available_employment_years = []
-    available_expense_years = []
-    available_monthly_years = []
-
-    if employment_df is not None and not employment_df.empty:
-        available_employment_years = employment_df['Academic Year'].unique().tolist()
-
-    if expense_df is not None and not expense_df.empty:
-        available_expense_years = expense_df['Year'].unique().tolist()
-
-    if monthly_expense_df is not None and not monthly_expense_df.empty:
-        available_monthly_years = [col for col in monthly_expense_df.columns if col != 'Month']
-
-    return available_employment_years, available_expense_years, available_monthly_years
-
-# Get fresh filter options each time
-available_employment_years, available_expense_years, available_monthly_years = get_fresh_filter_options()
-
-print(f"📊 Available employment years: {available_employment_years}")
-print(f"📊 Available expense years: {available_expense_years}")
-print(f"📊 Available monthly years: {available_monthly_years}")
-
 # Create layout with inline filters
 def create_layout():
     """Create and return the layout for the student labour report"""
+    # Read per build so new years show up without a restart
+    available_employment_years, available_expense_years, available_monthly_years = get_fresh_filter_options()
+
     try:
         return dbc.Container([
             # Header
@@ -1,5 +1,5 @@
 import dash
-from dash import dcc, html, Input, Output, State, callback, dash_table, ctx
+from dash import dcc, html, Input, Output, State, callback, dash_table, ctx, Patch
 import dash_bootstrap_components as dbc
 from datetime import datetime, timedelta
 import pandas as pd
@@ -11,6 +11,14 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
 import re
+from utils.maintenance import maintenance_scheduler
+from utils.migrations import migrate_database
+from config import STATIC_SITE_CONFIG
+from utils.compression import install_compression
+from utils.layout_cache import StaticLayoutCache
+from utils.static_site import install_static_pages
+from utils.rate_limit import install_rate_limiter
+from utils.table_query import fetch_table_page
 
 # Initialize the Dash app with Bootstrap theme
 app = dash.Dash(__name__,
@@ -22,6 +30,17 @@ app = dash.Dash(__name__,
 # Expose server for deployment
 server = app.server
 
+# Throttle abusive clients before they reach the callback workers
+install_rate_limiter(server)
+install_compression(server)
+
+# Public pages are identical for every visitor, so each is built once per process
+public_layouts = StaticLayoutCache()
+
+# The landing page pre-rendered by export_static.py; ?request, ?admin and ?dashboard stay on Dash
+STATIC_SITE_FOLDER = os.path.join(STATIC_SITE_CONFIG['output_folder'], 'simple')
+install_static_pages(server, STATIC_SITE_FOLDER)
+
 # USC Brand Colors (from brand guidelines)
 USC_COLORS = {
     'primary_green': '#1B5E20',  # USC Green
@@ -36,61 +55,8 @@ USC_COLORS = {
 
 # Database setup
 def init_database():
-    """Initialize the access requests database"""
-    conn = sqlite3.connect('usc_access.db')
-    cursor = conn.cursor()
-
-    # Access requests table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS access_requests (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            name TEXT NOT NULL,
-            email TEXT NOT NULL,
-            department TEXT NOT NULL,
-            position TEXT NOT NULL,
-            is_usc_employee BOOLEAN NOT NULL,
-            access_type TEXT NOT NULL,
-            justification TEXT,
-            requested_duration INTEGER DEFAULT 30,
-            status TEXT DEFAULT 'pending',
-            approved_by TEXT,
-            approved_date DATETIME,
-            approved_duration INTEGER,
-            access_token TEXT,
-            token_expires DATETIME,
-            notes TEXT
-        )
-    ''')
-
-    # Active sessions table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS active_sessions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT NOT NULL,
-            access_token TEXT NOT NULL,
-            access_type TEXT NOT NULL,
-            created_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-            expires_date DATETIME NOT NULL,
-            last_used DATETIME,
-            ip_address TEXT,
-            notes TEXT
-        )
-    ''')
-
-    # Admin sessions table (for tracking admin logins)
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS admin_sessions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            session_id TEXT UNIQUE NOT NULL,
-            created_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-            expires_date DATETIME NOT NULL,
-            ip_address TEXT
-        )
-    ''')
-
-    conn.commit()
-    conn.close()
+    """Bring the access requests database up to the current schema (see migrate_db.py)"""
+    migrate_database('usc_access.db')
 
 
 # Initialize database
@@ -193,6 +159,138 @@ def get_requests_data(status_filter=None):
         return pd.DataFrame()
 
 
+# Admin dashboard windowing: pending cards are loaded a window at a time as the
+# list scrolls, and the all-requests table is paged in SQL
+PENDING_WINDOW_SIZE = 20
+ALL_REQUESTS_PAGE_SIZE = 25
+
+ALL_REQUESTS_TABLE_QUERY = {
+    'from': 'access_requests',
+    'columns': {
+        'id': 'id',
+        'timestamp': 'timestamp',
+        'name': 'name',
+        'email': 'email',
+        'department': 'department',
+        'position': 'position',
+        'is_usc_employee': 'is_usc_employee',
+        'access_type': 'access_type',
+        'status': 'status',
+        'approved_by': 'approved_by',
+        'approved_date': 'approved_date',
+        'approved_duration': 'approved_duration'
+    },
+    'default_order': 'timestamp DESC, id DESC'
+}
+
+
+def count_requests(status_filter=None):
+    """Count requests, optionally with one status"""
+    try:
+        conn = sqlite3.connect('usc_access.db')
+        if status_filter:
+            count = conn.execute('SELECT COUNT(*) FROM access_requests WHERE status = ?',
+                                 (status_filter,)).fetchone()[0]
+        else:
+            count = conn.execute('SELECT COUNT(*) FROM access_requests').fetchone()[0]
+        conn.close()
+        return count
+    except Exception as e:
+        print(f"Database error: {e}")
+        return 0
+
+
+def get_pending_requests_window(after=None, limit=PENDING_WINDOW_SIZE):
+    """
+    Get the next window of pending requests, newest first
+    after: (timestamp, id) of the last request already shown, or None for the first window
+    Returns (df, next_cursor); next_cursor is None when there are no more
+    """
+    try:
+        conn = sqlite3.connect('usc_access.db')
+        params = ['pending']
+        keyset = ''
+        if after:
+            keyset = 'AND (timestamp, id) < (?, ?)'
+            params.extend(after)
+
+        df = pd.read_sql_query(f'''
+            SELECT id, timestamp, name, email, department, position, 
+                   is_usc_employee, access_type, justification, requested_duration
+            FROM access_requests 
+            WHERE status = ? {keyset}
+            ORDER BY timestamp DESC, id DESC
+            LIMIT ?
+        ''', conn, params=params + [limit + 1])
+        conn.close()
+    except Exception as e:
+        print(f"Database error: {e}")
+        return pd.DataFrame(), None
+
+    if len(df) <= limit:
+        return df, None
+
+    df = df.iloc[:limit]
+    return df, [df['timestamp'].iloc[-1], int(df['id'].iloc[-1])]
+
+
+def create_pending_request_cards(df):
+    """Create a card per pending request, built from column arrays"""
+    columns = df.to_dict('list')
+
+    cards = []
+    for (request_id, name, email, department, position, is_usc_employee, access_type,
+         justification, requested_duration, timestamp) in zip(
+            columns['id'], columns['name'], columns['email'], columns['department'],
+            columns['position'], columns['is_usc_employee'], columns['access_type'],
+            columns['justification'], columns['requested_duration'], columns['timestamp']):
+        employee_badge = dbc.Badge("USC Employee" if is_usc_employee else "External",
+                                   color="success" if is_usc_employee else "warning")
+
+        card = dbc.Card([
+            dbc.CardHeader([
+                html.Div([
+                    html.H5(f"{name} - {email}", className="mb-0"),
+                    employee_badge
+                ], className="d-flex justify-content-between align-items-center")
+            ]),
+            dbc.CardBody([
+                html.P([
+                    html.Strong("Department: "), department, html.Br(),
+                    html.Strong("Position: "), position, html.Br(),
+                    html.Strong("Access Type: "), access_type, html.Br(),
+                    html.Strong("Requested Duration: "), f"{requested_duration} days", html.Br(),
+                    html.Strong("Submitted: "), timestamp
+                ]),
+                html.P([
+                    html.Strong("Justification: "), html.Br(),
+                    html.Small(justification, className="text-muted")
+                ]),
+                dbc.Row([
+                    dbc.Col([
+                        dbc.Label("Approve for (days):"),
+                        dbc.Input(id=f"duration-{request_id}", type="number",
+                                  value=requested_duration, min=1, max=365)
+                    ], md=4),
+                    dbc.Col([
+                        dbc.Button([
+                            html.I(className="fas fa-check me-2"),
+                            "Approve"
+                        ], id=f"approve-{request_id}", color="success", className="me-2",
+                            style={"borderRadius": "0"}),
+                        dbc.Button([
+                            html.I(className="fas fa-times me-2"),
+                            "Deny"
+                        ], id=f"deny-{request_id}", color="danger", style={"borderRadius": "0"})
+                    ], md=8, className="d-flex align-items-end")
+                ])
+            ])
+        ], className="mb-3")
+        cards.append(card)
+
+    return cards
+
+
 # Get base URL for deployment
 def get_base_url():
     """Get the base URL for links (local vs deployed)"""
@@ -1122,6 +1220,34 @@ def create_admin_dashboard():
     ], className="py-5")
 
 
+def create_home_layout():
+    """Full public landing page"""
+    return html.Div([
+        create_navbar(),
+        html.Div([
+            create_hero_section(),
+            create_quick_stats(),
+            create_feature_cards(),
+            create_mission_section(),
+            create_contact_section(),
+        ], className="page-content"),
+        create_footer()
+    ])
+
+
+def create_request_layout():
+    """Public access request page"""
+    return html.Div([
+        create_navbar(),
+        create_access_request_form(),
+        create_footer()
+    ])
+
+
+public_layouts.register('home', create_home_layout)
+public_layouts.register('request', create_request_layout)
+
+
 # Main app layout with URL routing and session management
 app.layout = html.Div([
     dcc.Location(id="url", refresh=False),
@@ -1138,11 +1264,7 @@ app.layout = html.Div([
 )
 def display_page_content(search, session_data):
     if search == "?request":
-        return html.Div([
-            create_navbar(),
-            create_access_request_form(),
-            create_footer()
-        ])
+        return public_layouts.get('request')
     elif search == "?admin":
         return html.Div([
             create_navbar(),
@@ -1168,17 +1290,7 @@ def display_page_content(search, session_data):
             ], style={"backgroundColor": "#f8f9fa", "minHeight": "100vh"})
     else:
         # Default home page
-        return html.Div([
-            create_navbar(),
-            html.Div([
-                create_hero_section(),
-                create_quick_stats(),
-                create_feature_cards(),
-                create_mission_section(),
-                create_contact_section(),
-            ], className="page-content"),
-            create_footer()
-        ])
+        return public_layouts.get('home')
 
 
 # Access request form submission callback
@@ -1338,73 +1450,47 @@ def update_admin_dashboard(active_tab, session_data):
         return dbc.Alert("Session expired. Please login again.", color="danger")
 
     if active_tab == "pending-tab":
-        df = get_requests_data("pending")
+        df, next_cursor = get_pending_requests_window()
         if df.empty:
             return dbc.Alert([
                 html.I(className="fas fa-info-circle me-2"),
                 "No pending requests."
             ], color="info")
 
-        # Create cards for each pending request
-        cards = []
-        for _, row in df.iterrows():
-            employee_badge = dbc.Badge("USC Employee" if row['is_usc_employee'] else "External",
-                                       color="success" if row['is_usc_employee'] else "warning")
-
-            card = dbc.Card([
-                dbc.CardHeader([
-                    html.Div([
-                        html.H5(f"{row['name']} - {row['email']}", className="mb-0"),
-                        employee_badge
-                    ], className="d-flex justify-content-between align-items-center")
-                ]),
-                dbc.CardBody([
-                    html.P([
-                        html.Strong("Department: "), row['department'], html.Br(),
-                        html.Strong("Position: "), row['position'], html.Br(),
-                        html.Strong("Access Type: "), row['access_type'], html.Br(),
-                        html.Strong("Requested Duration: "), f"{row['requested_duration']} days", html.Br(),
-                        html.Strong("Submitted: "), row['timestamp']
-                    ]),
-                    html.P([
-                        html.Strong("Justification: "), html.Br(),
-                        html.Small(row['justification'], className="text-muted")
-                    ]),
-                    dbc.Row([
-                        dbc.Col([
-                            dbc.Label("Approve for (days):"),
-                            dbc.Input(id=f"duration-{row['id']}", type="number",
-                                      value=row['requested_duration'], min=1, max=365)
-                        ], md=4),
-                        dbc.Col([
-                            dbc.Button([
-                                html.I(className="fas fa-check me-2"),
-                                "Approve"
-                            ], id=f"approve-{row['id']}", color="success", className="me-2",
-                                style={"borderRadius": "0"}),
-                            dbc.Button([
-                                html.I(className="fas fa-times me-2"),
-                                "Deny"
-                            ], id=f"deny-{row['id']}", color="danger", style={"borderRadius": "0"})
-                        ], md=8, className="d-flex align-items-end")
-                    ])
-                ])
-            ], className="mb-3")
-            cards.append(card)
-
+        # Only the first window is rendered; scrolling to the bottom loads the next one
+        # (assets/infinite_scroll.js clicks the load-more button when it comes into view)
         return html.Div([
-            html.H4(f"Pending Requests ({len(df)})"),
-            html.Div(cards)
+            html.H4(f"Pending Requests ({count_requests('pending')})"),
+            html.Div([
+                html.Div(create_pending_request_cards(df), id="pending-requests-cards"),
+                dbc.Button("Load more", id="pending-load-more", color="outline-secondary", size="sm",
+                           className="w-100 load-more-on-scroll", disabled=next_cursor is None,
+                           style={"borderRadius": "0"})
+            ], style={"maxHeight": "75vh", "overflowY": "auto"}),
+            dcc.Store(id="pending-cursor", data=next_cursor)
         ])
 
     elif active_tab == "all-tab":
-        df = get_requests_data()
-        if df.empty:
+        total = count_requests()
+        if total == 0:
             return dbc.Alert("No requests found.", color="info")
 
+        columns = ALL_REQUESTS_TABLE_QUERY['columns']
         return html.Div([
-            html.H4(f"All Requests ({len(df)})"),
-            dbc.Table.from_dataframe(df, striped=True, bordered=True, hover=True, responsive=True)
+            html.H4(f"All Requests ({total})"),
+            dash_table.DataTable(
+                id="all-requests-table",
+                data=[],
+                columns=[{"name": column_id.replace('_', ' ').title(), "id": column_id} for column_id in columns],
+                style_cell={'textAlign': 'left', 'padding': '8px'},
+                style_table={'overflowX': 'auto'},
+                page_current=0,
+                page_size=ALL_REQUESTS_PAGE_SIZE,
+                page_action="custom",
+                sort_action="custom",
+                sort_mode="single",
+                filter_action="custom"
+            )
         ])
 
     elif active_tab == "generate-tab":
@@ -1451,6 +1537,51 @@ def update_admin_dashboard(active_tab, session_data):
         ])
 
 
+# Append the next window of pending requests
+@app.callback(
+    [Output("pending-requests-cards", "children"),
+     Output("pending-cursor", "data"),
+     Output("pending-load-more", "disabled")],
+    [Input("pending-load-more", "n_clicks")],
+    [State("pending-cursor", "data"),
+     State("session-store", "data")],
+    prevent_initial_call=True
+)
+def load_more_pending_requests(n_clicks, cursor, session_data):
+    session_id = session_data.get("session_id") if session_data else None
+    if not cursor or not validate_admin_session(session_id):
+        return dash.no_update, None, True
+
+    df, next_cursor = get_pending_requests_window(after=cursor)
+
+    cards = Patch()
+    cards.extend(create_pending_request_cards(df))
+    return cards, next_cursor, next_cursor is None
+
+
+# Page the all-requests table in SQL
+@app.callback(
+    [Output("all-requests-table", "data"),
+     Output("all-requests-table", "page_count")],
+    [Input("all-requests-table", "page_current"),
+     Input("all-requests-table", "page_size"),
+     Input("all-requests-table", "sort_by"),
+     Input("all-requests-table", "filter_query")],
+    [State("session-store", "data")]
+)
+def update_all_requests_table(page_current, page_size, sort_by, filter_query, session_data):
+    session_id = session_data.get("session_id") if session_data else None
+    if not validate_admin_session(session_id):
+        return [], 1
+
+    try:
+        return fetch_table_page('usc_access.db', ALL_REQUESTS_TABLE_QUERY, page_current, page_size,
+                                sort_by, filter_query)
+    except Exception as e:
+        print(f"Database error: {e}")
+        return [], 1
+
+
 # Generate access link callback
 @app.callback(
     Output("generated-link-result", "children"),
@@ -1528,4 +1659,5 @@ if __name__ == "__main__":
     port = int(os.environ.get('PORT', 8050))
     debug = not os.environ.get('RENDER')
 
+    maintenance_scheduler.start()
     app.run(debug=debug, host='0.0.0.0', port=port)
\ No newline at end of file
@@ -2,6 +2,9 @@
 """
 USC Institutional Research - Server Startup Script
 This script helps start both the auth server and main app properly
+
+    python start_servers.py            # auth server (:5000) + main app (:8050)
+    python start_servers.py --unified  # single server with auth routes mounted (:8050)
 """
 
 import subprocess
@@ -55,7 +58,26 @@ def start_main_app():
         return None
 
 
-def check_prerequisites():
+def start_unified_server():
+    """Start the single-process server (Dash app with auth routes mounted)"""
+    print("🧩 Starting Unified Server...")
+    try:
+        unified_process = subprocess.Popen([
+            sys.executable, 'unified_app.py'
+        ], cwd='.', stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+        # Monitor output
+        for line in iter(unified_process.stdout.readline, ''):
+            if line.strip():
+                print(f"[APP] {line.strip()}")
+
+        return unified_process
+    except Exception as e:
+        print(f"❌ Failed to start unified server: {e}")
+        return None
+
+
+def check_prerequisites(unified=False):
     """Check if all required files exist"""
     required_files = [
         'main_app.py',
@@ -65,6 +87,9 @@ def check_prerequisites():
         '.env'
     ]
 
+    if unified:
+        required_files[1] = 'unified_app.py'
+
     missing_files = []
     for file in required_files:
         if not os.path.exists(file):
@@ -85,11 +110,26 @@ def main():
     print("🚀 USC IR Portal Startup")
     print("=" * 50)
 
+    unified = '--unified' in sys.argv
+
     # Check prerequisites
-    if not check_prerequisites():
+    if not check_prerequisites(unified):
         print("\n❌ Please ensure all required files are present")
         return
 
+    if unified:
+        print("\n📋 Starting Unified Server...")
+        print("   App + Auth: http://localhost:8050")
+        print("   Login: http://localhost:8050/login")
+        print()
+
+        try:
+            start_unified_server()
+        except KeyboardInterrupt:
+            print("\n🛑 Shutting down server...")
+            print("✅ Server stopped")
+        return
+
     print("\n📋 Starting Services...")
     print("   Auth Server: http://localhost:5000")
     print("   Main App: http://localhost:8050")
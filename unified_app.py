@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+USC Institutional Research Portal - Unified Server
+Serves the Dash app and the authentication routes from one Flask server,
+so sessions are shared in-process instead of over localhost HTTP.
+
+Development:  python unified_app.py
+Production:   gunicorn -c gunicorn.conf.py unified_app:server
+"""
+
+import os
+from datetime import timedelta
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Auth routes and Dash pages share one origin, so all links between them are relative.
+# These must be set before the app modules are imported.
+os.environ.setdefault('AUTH_SERVER_URL', '')
+os.environ.setdefault('MAIN_APP_URL', '')
+
+from auth_routes import setup_auth_routes
+from main_app import app, server
+from utils.maintenance import maintenance_scheduler
+
+# Same settings the standalone auth server (app.py) uses
+server.secret_key = os.getenv('SECRET_KEY', 'usc-ir-secret-key-2025-change-in-production')
+server.permanent_session_lifetime = timedelta(days=30)
+
+# Mount /login, /auth/* and /debug/auth on the Dash Flask server
+setup_auth_routes(server)
+
+
+if __name__ == '__main__':
+    port = int(os.environ.get('PORT', 8050))
+
+    print("🚀 USC Institutional Research Portal (Unified) Starting...")
+    print(f"📍 Server: http://localhost:{port}")
+    print(f"🔐 Login: http://localhost:{port}/login")
+
+    maintenance_scheduler.start()
+    app.run_server(debug=True, host='0.0.0.0', port=port)
@@ -0,0 +1,87 @@
+"""
+Admin dashboard statistics
+
+All counters come from one aggregated query (a single pass over users, plus
+index range counts for sessions and pending requests) and the result is cached
+for DATABASE_CONFIG['stats_cache_seconds']. While one request refreshes an
+expired snapshot, others keep getting the previous one, so the stats section
+never waits on the database except for the very first load.
+"""
+
+import threading
+import time
+
+from config import DATABASE_CONFIG
+from utils.read_snapshot import reporting_connection
+
+EMPTY_STATS = {
+    "total_users": 0,
+    "admin_users": 0,
+    "active_sessions": 0,
+    "pending_requests": 0,
+    "recent_logins": 0
+}
+
+STATS_QUERY = '''
+    SELECT
+        COALESCE(SUM(is_active = 1), 0),
+        COALESCE(SUM(is_admin = 1 AND is_active = 1), 0),
+        (SELECT COUNT(*) FROM user_sessions WHERE expires_at > datetime('now')),
+        (SELECT COUNT(*) FROM access_requests WHERE status = 'pending'),
+        COALESCE(SUM(last_login > datetime('now', '-1 day')), 0)
+    FROM users
+'''
+
+
+class AdminStatsService:
+    """Caches the admin counters per database with a short TTL"""
+
+    def __init__(self, ttl_seconds: float = None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else DATABASE_CONFIG['stats_cache_seconds']
+        self._snapshots = {}  # db_path -> (computed_at, stats)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def compute(self, db_path: str) -> dict:
+        """Run the aggregated stats query"""
+        conn = reporting_connection(db_path)
+        try:
+            row = conn.execute(STATS_QUERY).fetchone()
+        finally:
+            conn.close()
+
+        return dict(zip(EMPTY_STATS, row))
+
+    def get(self, db_path: str = "usc_ir.db") -> dict:
+        """Return cached stats, recomputing them at most once per TTL"""
+        with self._lock:
+            snapshot = self._snapshots.get(db_path)
+            if snapshot and time.monotonic() - snapshot[0] < self.ttl_seconds:
+                return snapshot[1]
+
+            # Someone else is already refreshing: serve the previous snapshot
+            if snapshot and db_path in self._refreshing:
+                return snapshot[1]
+
+            self._refreshing.add(db_path)
+
+        try:
+            stats = self.compute(db_path)
+            with self._lock:
+                self._snapshots[db_path] = (time.monotonic(), stats)
+            return stats
+        finally:
+            with self._lock:
+                self._refreshing.discard(db_path)
+
+    def invalidate(self, db_path: str = None):
+        """Drop cached stats (all databases when db_path is None)"""
+        with self._lock:
+            if db_path is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(db_path, None)
+
+
+# Global instance shared by the admin dashboard
+admin_stats = AdminStatsService()
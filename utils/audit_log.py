@@ -0,0 +1,95 @@
+"""
+Audit log queries with keyset pagination
+
+Pages are ordered newest first on (timestamp, id) and continue from the last
+row of the previous page instead of using OFFSET, so fetching page 1000 costs
+the same index range scan as page 1. The composite indexes that back the user
+and action filters are created by utils/migrations.py.
+"""
+
+import sqlite3
+
+from utils.read_snapshot import reporting_connection
+
+# Log tables with the same shape: audit_log (usc_ir.db) and access_logs (manage_db's database)
+LOG_TABLES = ('audit_log', 'access_logs')
+
+
+def _build_filters(user_id=None, username=None, action=None, start=None, end=None):
+    conditions = []
+    params = []
+
+    if user_id is not None:
+        conditions.append("a.user_id = ?")
+        params.append(user_id)
+    if username:
+        conditions.append("a.user_id IN (SELECT id FROM users WHERE username = ?)")
+        params.append(username)
+    if action:
+        conditions.append("a.action = ?")
+        params.append(action)
+    if start:
+        conditions.append("a.timestamp >= ?")
+        params.append(str(start))
+    if end:
+        # Date-only bounds include the whole day
+        conditions.append("a.timestamp < datetime(?, '+1 day')" if len(str(end)) == 10 else "a.timestamp <= ?")
+        params.append(str(end))
+
+    return conditions, params
+
+
+def query_audit_log(db_path: str = "usc_ir.db", before=None, limit: int = 50,
+                    table: str = 'audit_log', **filters):
+    """
+    Fetch one page of log entries, newest first
+    before: cursor returned with the previous page, or None for the first page
+    filters: user_id, username, action, start, end (YYYY-MM-DD or full timestamps)
+    Returns (rows, next_cursor); next_cursor is None on the last page
+    """
+    if table not in LOG_TABLES:
+        raise ValueError(f"Unknown log table: {table}")
+
+    conditions, params = _build_filters(**filters)
+    if before is not None:
+        conditions.append("(a.timestamp, a.id) < (?, ?)")
+        params.extend(before)
+
+    where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+    conn = reporting_connection(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        columns = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+        resource = 'a.resource' if 'resource' in columns else 'NULL'
+
+        # Fetch one extra row to know whether another page exists
+        rows = conn.execute(f'''
+            SELECT a.id, a.timestamp, a.user_id, COALESCE(u.username, 'System') AS username,
+                   a.action, {resource} AS resource, a.ip_address, a.details
+            FROM {table} a
+            LEFT JOIN users u ON a.user_id = u.id
+            {where_sql}
+            ORDER BY a.timestamp DESC, a.id DESC
+            LIMIT ?
+        ''', params + [limit + 1]).fetchall()
+    finally:
+        conn.close()
+
+    rows = [dict(row) for row in rows]
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, (rows[-1]['timestamp'], rows[-1]['id'])
+
+
+def iter_audit_log(db_path: str = "usc_ir.db", page_size: int = 500,
+                   table: str = 'audit_log', **filters):
+    """Yield every matching log entry, newest first, reading one page at a time"""
+    cursor = None
+    while True:
+        rows, cursor = query_audit_log(db_path, before=cursor, limit=page_size, table=table, **filters)
+        yield from rows
+        if cursor is None:
+            break
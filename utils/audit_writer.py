@@ -0,0 +1,160 @@
+"""
+Background audit log writer
+
+Audit events are queued in memory and written by a background thread in batched
+executemany transactions, flushed when AUDIT_CONFIG['batch_size'] events are
+waiting or AUDIT_CONFIG['flush_interval_seconds'] have passed. The queue is
+drained on interpreter shutdown.
+"""
+
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from config import AUDIT_CONFIG
+
+_STOP = object()
+
+INSERT_AUDIT_SQL = '''
+    INSERT INTO audit_log (user_id, action, resource, details, ip_address, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+
+class AuditWriter:
+    """Buffers audit events and writes them to one database in batches"""
+
+    def __init__(self, db_path: str = "usc_ir.db", batch_size: int = None,
+                 flush_interval: float = None, max_queue_size: int = None,
+                 synchronous: str = None):
+        self.db_path = db_path
+        self.batch_size = batch_size or AUDIT_CONFIG['batch_size']
+        self.flush_interval = flush_interval or AUDIT_CONFIG['flush_interval_seconds']
+        self.synchronous = (synchronous or AUDIT_CONFIG['synchronous']).upper()
+
+        self._queue = queue.Queue(maxsize=max_queue_size or AUDIT_CONFIG['max_queue_size'])
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def _ensure_started(self):
+        """Start the flush thread lazily, once per process (gunicorn forks after import)"""
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+
+            if self._pid != os.getpid():
+                # Events queued in the parent belong to the parent
+                self._queue = queue.Queue(maxsize=self._queue.maxsize)
+
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def log(self, user_id, action, resource=None, details=None, ip_address=None):
+        """Queue one audit event (timestamped now, in the same format as CURRENT_TIMESTAMP)"""
+        timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        event = (user_id, action, resource, details, ip_address, timestamp)
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # Back-pressure: never drop audit events, write this one inline instead
+            self._write_batch([event])
+
+    def _run(self):
+        """Collect events into batches and write them until told to stop"""
+        stopping = False
+
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                self._queue.task_done()
+                break
+
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    event = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if event is _STOP:
+                    stopping = True
+                    break
+                batch.append(event)
+
+            self._write_batch(batch)
+            for _ in range(len(batch) + (1 if stopping else 0)):
+                self._queue.task_done()
+
+        # Drain anything queued after the stop marker
+        leftovers = []
+        while True:
+            try:
+                leftovers.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        events = [event for event in leftovers if event is not _STOP]
+        if events:
+            self._write_batch(events)
+        for _ in leftovers:
+            self._queue.task_done()
+
+    def _write_batch(self, batch):
+        """Write a batch of events in a single transaction"""
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute(f'PRAGMA synchronous = {self.synchronous}')
+            with conn:
+                conn.executemany(INSERT_AUDIT_SQL, batch)
+            conn.close()
+        except Exception as e:
+            print(f"Error writing {len(batch)} audit events: {e}")
+
+    def flush(self):
+        """Block until every queued event has been written"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def close(self, timeout: float = 10.0):
+        """Stop the flush thread after draining the queue"""
+        if self._thread is None or not self._thread.is_alive() or self._pid != os.getpid():
+            return
+
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_audit_writer(db_path: str = "usc_ir.db") -> AuditWriter:
+    """Get the shared writer for a database, creating it on first use"""
+    writer = _writers.get(db_path)
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.setdefault(db_path, AuditWriter(db_path))
+    return writer
+
+
+def shutdown_audit_writers():
+    """Drain and stop every audit writer (registered to run at exit)"""
+    for writer in list(_writers.values()):
+        writer.close()
+
+
+atexit.register(shutdown_audit_writers)
@@ -0,0 +1,25 @@
+"""
+Background execution for long-running callbacks
+
+Report generation and data exports take seconds, too long to hold a request
+thread. They are registered as Dash background callbacks with the manager
+below: the request only enqueues the job, a separate process runs it, and the
+browser polls for its progress and result. Job state lives in a diskcache
+directory, so no broker is needed and every gunicorn worker sees the same
+jobs. Cancelling (the callback's cancel inputs) terminates the job process.
+"""
+
+import diskcache
+from dash import DiskcacheManager
+
+from config import BACKGROUND_JOBS_CONFIG
+
+
+def create_background_manager(folder: str = None) -> DiskcacheManager:
+    cache = diskcache.Cache(folder or BACKGROUND_JOBS_CONFIG['cache_folder'],
+                            size_limit=BACKGROUND_JOBS_CONFIG['cache_size_limit_bytes'])
+    return DiskcacheManager(cache, expire=BACKGROUND_JOBS_CONFIG['result_expire_seconds'])
+
+
+# Global instance for the background callbacks
+background_manager = create_background_manager()
@@ -0,0 +1,199 @@
+"""
+Online database backups
+
+Snapshots are taken with SQLite's online backup API a few hundred pages at a
+time, sleeping between steps so logins and callbacks keep their write access.
+The backup API reads through the source connection, so committed WAL content is
+included without forcing a checkpoint. Each snapshot is gzip-compressed, skipped
+when its content is identical to the previous backup of that database, and
+rotated so only the newest DATABASE_CONFIG['backup_keep'] are kept.
+
+Backup history (duration, throughput, sizes) is recorded in a manifest next to
+the snapshots for the admin dashboard.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from config import DATABASE_CONFIG
+from utils.migrations import DATABASE_SCHEMAS
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_HISTORY = 50
+
+_manifest_lock = threading.Lock()
+
+
+def _backup_folder() -> str:
+    folder = DATABASE_CONFIG['backup_folder']
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def load_backup_history(folder: str = None) -> list:
+    """Recorded backups, newest first"""
+    path = os.path.join(folder or _backup_folder(), MANIFEST_NAME)
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def _record_backup(folder: str, entry: dict):
+    with _manifest_lock:
+        history = [entry] + load_backup_history(folder)
+        path = os.path.join(folder, MANIFEST_NAME)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(history[:MANIFEST_HISTORY], f, indent=2)
+        os.replace(path + '.tmp', path)
+
+
+def _rotate(folder: str, db_name: str, keep: int):
+    prefix = f"{db_name}-"
+    snapshots = sorted(name for name in os.listdir(folder)
+                       if name.startswith(prefix) and name.endswith('.db.gz'))
+    for name in snapshots[:-keep] if keep > 0 else []:
+        os.remove(os.path.join(folder, name))
+
+
+def backup_database(db_path: str, folder: str = None, pages_per_step: int = None,
+                    step_sleep: float = None, keep: int = None) -> dict:
+    """
+    Take a compressed online snapshot of one database
+    Returns the backup record (also written to the manifest)
+    """
+    folder = folder or _backup_folder()
+    pages_per_step = pages_per_step or DATABASE_CONFIG['backup_pages_per_step']
+    step_sleep = step_sleep if step_sleep is not None else DATABASE_CONFIG['backup_step_sleep_seconds']
+    keep = keep or DATABASE_CONFIG['backup_keep']
+
+    db_name = os.path.splitext(os.path.basename(db_path))[0]
+    # Microseconds keep two backups taken in the same second from sharing a file
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    raw_path = os.path.join(folder, f".{db_name}-{stamp}.db.partial")
+    partial_gz_path = os.path.join(folder, f".{db_name}-{stamp}.db.gz.partial")
+    gz_path = os.path.join(folder, f"{db_name}-{stamp}.db.gz")
+
+    started = time.monotonic()
+    progress = {'pages': 0}
+
+    def on_progress(status, remaining, total):
+        progress['pages'] = total
+
+    source = sqlite3.connect(db_path, timeout=30)
+    target = sqlite3.connect(raw_path)
+    try:
+        journal_mode = source.execute('PRAGMA journal_mode').fetchone()[0]
+        source.backup(target, pages=pages_per_step, progress=on_progress, sleep=step_sleep)
+    finally:
+        target.close()
+        source.close()
+
+    # Compress and hash in one streaming pass
+    digest = hashlib.sha256()
+    with open(raw_path, 'rb') as raw, gzip.open(partial_gz_path, 'wb', compresslevel=6) as compressed:
+        for chunk in iter(lambda: raw.read(1024 * 1024), b''):
+            digest.update(chunk)
+            compressed.write(chunk)
+
+    raw_bytes = os.path.getsize(raw_path)
+    os.remove(raw_path)
+
+    entry = {
+        'database': db_path,
+        'file': os.path.basename(gz_path),
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'journal_mode': journal_mode,
+        'pages': progress['pages'],
+        'bytes': raw_bytes,
+        'compressed_bytes': os.path.getsize(partial_gz_path),
+        'sha256': digest.hexdigest(),
+        'skipped': False
+    }
+
+    # Incremental: don't keep a second copy of an unchanged database. The hash is
+    # compared before the snapshot gets its name, so only our own partial file is dropped
+    previous = next((item for item in load_backup_history(folder)
+                     if item['database'] == db_path and not item.get('skipped')), None)
+    if previous and previous.get('sha256') == entry['sha256'] \
+            and os.path.exists(os.path.join(folder, previous['file'])):
+        os.remove(partial_gz_path)
+        entry.update(file=previous['file'], skipped=True)
+    else:
+        os.replace(partial_gz_path, gz_path)
+
+    duration = time.monotonic() - started
+    entry['duration_seconds'] = round(duration, 3)
+    entry['throughput_mb_s'] = round(raw_bytes / (1024 * 1024) / duration, 2) if duration > 0 else None
+
+    _record_backup(folder, entry)
+    _rotate(folder, db_name, keep)
+    return entry
+
+
+def backup_all(databases=None, folder: str = None) -> list:
+    """Back up every portal database that exists; returns one record per database"""
+    results = []
+    for db_path in databases or DATABASE_SCHEMAS:
+        if not os.path.exists(db_path):
+            continue
+        try:
+            results.append(backup_database(db_path, folder))
+        except Exception as e:
+            print(f"Error backing up {db_path}: {e}")
+            results.append({'database': db_path, 'error': str(e)})
+    return results
+
+
+def backup_due(folder: str = None) -> bool:
+    """True when the newest recorded backup is older than backup_interval_hours"""
+    history = load_backup_history(folder)
+    if not history:
+        return True
+
+    last = datetime.fromisoformat(history[0]['started_at'])
+    return (datetime.now() - last).total_seconds() >= DATABASE_CONFIG['backup_interval_hours'] * 3600
+
+
+def run_scheduled_backup(folder: str = None) -> list:
+    """
+    Back up when due; safe to call from every gunicorn worker because only the
+    worker that takes the lock file runs it
+    """
+    folder = folder or _backup_folder()
+    lock_path = os.path.join(folder, '.backup.lock')
+
+    try:
+        fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        # A stale lock (crashed worker) is cleared after one interval
+        if time.time() - os.path.getmtime(lock_path) > DATABASE_CONFIG['backup_interval_hours'] * 3600:
+            os.remove(lock_path)
+        return []
+
+    try:
+        os.close(fd)
+        if not backup_due(folder):
+            return []
+        return backup_all(folder=folder)
+    finally:
+        os.remove(lock_path)
+
+
+def format_backup_summary(entry: dict) -> str:
+    """One-line description of a backup record"""
+    if entry.get('error'):
+        return f"{entry['database']}: failed ({entry['error']})"
+    if entry.get('skipped'):
+        return f"{entry['database']}: unchanged since {entry['file']} ({entry['duration_seconds']}s)"
+
+    ratio = entry['compressed_bytes'] / entry['bytes'] * 100 if entry['bytes'] else 0
+    return (f"{entry['database']}: {entry['bytes'] / 1024:.0f} KB -> {entry['compressed_bytes'] / 1024:.0f} KB "
+            f"({ratio:.0f}%) in {entry['duration_seconds']}s, {entry['throughput_mb_s']} MB/s")
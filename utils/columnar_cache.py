@@ -0,0 +1,199 @@
+"""
+Columnar (Parquet) copies of the source files in data/
+
+Reading a workbook with pandas is slow, so published datasets (see
+utils/data_upload.py) are also stored as one Parquet file per sheet under
+COLUMNAR_CACHE_CONFIG['folder']. The tables extracted from the financial
+statement PDFs (utils/financial_statements.py) are stored the same way, as a
+one-sheet entry per PDF. A pointer file per source file,
+
+    <folder>/<source>.json = {'version', 'folder', 'sheets': {sheet: file}, 'order': [sheet], ...}
+
+records which version of the source the Parquet files were made from: the
+sha256 of its content (file_version). Readers use them only while that
+version still matches the file, so a replaced or hand-edited file is never
+shadowed by a stale copy, while a file that was only touched (a fresh
+checkout at deploy) keeps its copy.
+
+Arrow needs one type per column, while spreadsheet columns often mix numbers
+and text (phone numbers, notes in amount columns). Such columns are stored as
+text next to a column of their cells' types and restored on read. A sheet is
+only cached when it reads back exactly equal; otherwise the workbook is used.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from config import COLUMNAR_CACHE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+TYPE_COLUMN = '__type__:'
+
+# Cell type name -> parser of its text form
+CELL_TYPES = {
+    'str': str,
+    'int': int,
+    'float': float,
+    'bool': lambda text: text == 'True',
+    'Timestamp': pd.Timestamp,
+    'datetime': datetime.fromisoformat
+}
+
+
+# Absolute path -> ((mtime_ns, size), sha256) of the last hash taken
+_file_hashes = {}
+
+
+def file_version(path) -> str:
+    """
+    sha256 of a file's content, or None when it is missing
+    Hashed again only when the file's mtime or size changes, so callers may ask per request
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    key = os.path.abspath(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _file_hashes.get(key)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    _file_hashes[key] = (signature, digest.hexdigest())
+    return digest.hexdigest()
+
+
+def _folder() -> str:
+    return COLUMNAR_CACHE_CONFIG['folder']
+
+
+def _pointer_path(workbook: str) -> str:
+    return os.path.join(_folder(), f"{workbook}.json")
+
+
+def encode_frame(frame: pd.DataFrame):
+    """Arrow-friendly copy of a sheet (None when it can't be stored)"""
+    if not all(isinstance(column, str) and not column.startswith(TYPE_COLUMN) for column in frame.columns):
+        return None
+
+    encoded = {}
+    for column in frame.columns:
+        series = frame[column]
+        if series.dtype != object:
+            encoded[column] = series
+            continue
+
+        types = series.map(lambda value: None if pd.isna(value) else type(value).__name__)
+        if not set(types.dropna()) <= set(CELL_TYPES):
+            return None
+        if types.nunique() <= 1:
+            encoded[column] = series
+            continue
+
+        encoded[column] = series.map(lambda value: None if pd.isna(value) else
+                                     value.isoformat() if isinstance(value, datetime) else str(value))
+        encoded[TYPE_COLUMN + column] = types
+    return pd.DataFrame(encoded)
+
+
+def decode_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Undo encode_frame"""
+    for type_column in [column for column in frame.columns if column.startswith(TYPE_COLUMN)]:
+        column = type_column[len(TYPE_COLUMN):]
+        frame[column] = pd.Series([np.nan if pd.isna(kind) else CELL_TYPES[kind](text)
+                                   for text, kind in zip(frame[column], frame[type_column])],
+                                  index=frame.index, dtype=object)
+    return frame.drop(columns=[column for column in frame.columns if column.startswith(TYPE_COLUMN)])
+
+
+def write_columnar(workbook: str, sheets: dict, tag: str) -> dict:
+    """
+    Store sheets as Parquet in a new folder named by tag, for publish_columnar
+    Only sheets that round-trip exactly get a file
+    """
+    folder = os.path.join(_folder(), f"{workbook}.{tag}")
+    os.makedirs(folder, exist_ok=True)
+
+    files = {}
+    for n, (name, frame) in enumerate(sheets.items()):
+        encoded = encode_frame(frame)
+        if encoded is None:
+            logger.info(f"{workbook}/{name}: column names or cell types can't be stored as Parquet")
+            continue
+
+        path = os.path.join(folder, f"{n}.parquet")
+        try:
+            encoded.to_parquet(path, index=False)
+            restored = decode_frame(pd.read_parquet(path))
+        except (ImportError, ValueError, TypeError) as e:
+            logger.info(f"{workbook}/{name}: not cached as Parquet ({str(e)})")
+            continue
+
+        if restored.equals(frame) and (restored.dtypes == frame.dtypes).all():
+            files[name] = os.path.basename(path)
+        else:
+            os.remove(path)
+            logger.info(f"{workbook}/{name}: Parquet copy differs from the sheet, not cached")
+    return {'folder': os.path.basename(folder), 'sheets': files, 'order': list(sheets)}
+
+
+def publish_columnar(workbook: str, entry: dict, version: str):
+    """
+    Point the workbook at a folder from write_columnar and drop the folder it replaces
+    Extra keys in entry (e.g. a summary for the build step) are kept in the pointer
+    """
+    previous = load_pointer(workbook)
+    pointer = {'version': version, **entry}
+
+    path = _pointer_path(workbook)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(pointer, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+    if previous and previous['folder'] != entry['folder']:
+        shutil.rmtree(os.path.join(_folder(), previous['folder']), ignore_errors=True)
+
+
+def load_pointer(workbook: str):
+    try:
+        with open(_pointer_path(workbook)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def read_columnar(workbook: str, version: str, sheet_name=None):
+    """
+    The cached sheets of a workbook ({sheet: frame}, or one frame for sheet_name),
+    None when there is no complete copy of this version
+    """
+    pointer = load_pointer(workbook)
+    if not pointer or pointer['version'] != version:
+        return None
+
+    names = [sheet_name] if sheet_name else pointer['order']
+    if not names or any(name not in pointer['sheets'] for name in names):
+        return None
+
+    folder = os.path.join(_folder(), pointer['folder'])
+    try:
+        sheets = {name: decode_frame(pd.read_parquet(os.path.join(folder, pointer['sheets'][name])))
+                  for name in names}
+    except (OSError, ImportError, ValueError) as e:
+        # Replaced between reading the pointer and the files: the workbook is current anyway
+        logger.info(f"Columnar copy of {workbook} unavailable: {str(e)}")
+        return None
+    return sheets[sheet_name] if sheet_name else sheets
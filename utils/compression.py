@@ -0,0 +1,158 @@
+"""
+Response compression and long-lived caching for Dash servers
+
+Callback responses (figure JSON, DataTable pages, whole page layouts) and text
+assets are compressed with Brotli when the client accepts it and the optional
+brotli package is installed, otherwise with gzip. Responses smaller than
+COMPRESSION_CONFIG['min_size_bytes'], already-encoded or streamed responses and
+non-text types (images, fonts) are sent as they are.
+
+Static files are requested over and over with identical bytes, so their
+compressed form is kept in a small LRU cache; callback responses are compressed
+per request at a fast level. Fingerprinted URLs (Dash's versioned component
+bundles, content-hashed assets from utils/image_pipeline.py, and asset URLs
+carrying Dash's ?m=<mtime> stamp) are marked immutable for a year.
+
+Run benchmark_payloads.py to see the before/after sizes of the heaviest payloads.
+"""
+
+import gzip
+import re
+import threading
+import zlib
+from collections import OrderedDict
+
+from flask import request
+
+from config import COMPRESSION_CONFIG
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Dash component bundles: dash_table/bundle.v5_0_0m1697000000.min.js
+DASH_FINGERPRINT = re.compile(r'\.v[\w-]+m[0-9a-f]+(\.\w+)+$')
+# Content-hashed build output: img/banner-960w.3f9c2a1b7e.webp
+CONTENT_HASH = re.compile(r'\.[0-9a-f]{10}\.\w+$')
+
+
+def compress(data: bytes, encoding: str, level: int = None) -> bytes:
+    """Encode a body with 'br' or 'gzip'"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=level if level is not None else COMPRESSION_CONFIG['brotli_quality'])
+    return gzip.compress(data, compresslevel=level if level is not None else COMPRESSION_CONFIG['gzip_level'],
+                         mtime=0)
+
+
+def choose_encoding(accept_encoding: str):
+    """Best encoding the client accepts: br (when available), then gzip, else None"""
+    accepted = set()
+    for part in (accept_encoding or '').lower().split(','):
+        name, _, params = part.partition(';')
+        quality = params.strip()[2:] if params.strip().startswith('q=') else '1'
+        try:
+            if float(quality) <= 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(name.strip())
+
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+def is_compressible(mimetype: str) -> bool:
+    return any(mimetype == allowed or (allowed.endswith('/') and mimetype.startswith(allowed))
+               for allowed in COMPRESSION_CONFIG['mimetypes'])
+
+
+def is_fingerprinted(path: str, query: dict) -> bool:
+    """URLs whose content can never change"""
+    if path.startswith('/_dash-component-suites/'):
+        return bool(DASH_FINGERPRINT.search(path))
+    if path.startswith('/assets/'):
+        return bool(CONTENT_HASH.search(path)) or 'm' in query
+    return False
+
+
+class StaticCompressionCache:
+    """LRU of compressed static bodies keyed by URL, encoding and a checksum of the original"""
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or COMPRESSION_CONFIG['static_cache_entries']
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compress(self, url: str, encoding: str, data: bytes) -> bytes:
+        key = (url, encoding, len(data), zlib.crc32(data))
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is not None:
+                self._entries.move_to_end(key)
+                return compressed
+
+        # Static files are compressed once, so spend more effort on them
+        compressed = compress(data, encoding, 9)
+        with self._lock:
+            self._entries[key] = compressed
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compressed
+
+
+def install_compression(server, cache: StaticCompressionCache = None):
+    """Register the caching-header and compression after_request hook on a Flask server"""
+    if not COMPRESSION_CONFIG['enabled']:
+        return
+
+    cache = cache or StaticCompressionCache()
+    immutable_max_age = COMPRESSION_CONFIG['immutable_max_age_seconds']
+
+    @server.after_request
+    def compress_response(response):
+        if request.method == 'GET' and response.status_code == 200 \
+                and is_fingerprinted(request.path, request.args):
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = immutable_max_age
+            response.cache_control.immutable = True
+
+        response.vary.add('Accept-Encoding')
+
+        if response.status_code != 200 or 'Content-Encoding' in response.headers \
+                or not is_compressible(response.mimetype or ''):
+            return response
+
+        encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+        if encoding is None:
+            return response
+
+        # Generators (streaming exports) must stay streamed; files sent by send_file are fine to read
+        if response.is_streamed and not response.direct_passthrough:
+            return response
+        if response.direct_passthrough:
+            if (response.content_length or 0) > COMPRESSION_CONFIG['max_static_size_bytes']:
+                return response
+            response.direct_passthrough = False
+
+        data = response.get_data()
+        if len(data) < COMPRESSION_CONFIG['min_size_bytes']:
+            return response
+
+        if request.method == 'GET' and response.cache_control.max_age:
+            compressed = cache.get_or_compress(request.full_path, encoding, data)
+        else:
+            compressed = compress(data, encoding)
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+
+        # Same content, different bytes: a weak validator still matches If-None-Match
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
@@ -0,0 +1,360 @@
+"""
+Chunked uploads for the admin Data Upload form
+
+The browser (assets/chunked_upload.js) sends a file in pieces of
+UPLOAD_CONFIG['chunk_size_mb']:
+
+    POST /upload/start              {dataset, filename, size} -> upload id
+    PUT  /upload/<id>/chunk?offset= raw bytes, appended to the temp file
+    POST /upload/<id>/complete      queue validation and publishing
+    GET  /upload/<id>/status        progress, errors and warnings
+
+Chunks are copied to UPLOAD_CONFIG['temp_folder'] block by block, so a file is
+never held in memory. Once complete, a worker process validates it against
+the dataset's schema (UPLOAD_DATASETS), writes the Parquet copy
+(utils/columnar_cache.py) and only then swaps the workbook into data/ with
+os.replace: readers see the old dataset or the new one, never a partial file.
+Publishing a dataset holds a lock file next to its workbook, so two uploads of
+the same dataset (in different server processes) take turns.
+Progress lives in a status.json next to the upload, so any server process can
+answer the status requests.
+"""
+
+import fcntl
+import json
+import os
+import re
+import secrets
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from flask import jsonify, request
+
+from config import UPLOAD_CONFIG
+from data_loader import data_loader
+from utils.columnar_cache import file_version, publish_columnar, write_columnar
+from utils.database import log_user_action
+from utils.financial_statements import INSTITUTION
+from utils.rate_limit import client_ip
+
+# Dataset -> workbook it replaces, pattern its sheet names follow, columns every sheet needs.
+# Statement workbooks have no column names: their first column's header must match
+# header_pattern and that column must hold line_items
+UPLOAD_DATASETS = {
+    'enrollment': {
+        'file': 'enrolment_data.xlsx',
+        'sheet_pattern': r'\d{4}-\d{4}',  # e.g. 2024-2025
+        'columns': ['Student Id', 'Campus', 'College Level', 'Course Level']
+    },
+    'graduation': {
+        'file': 'GraduationData.xlsx',
+        'sheet_pattern': r'\d{4}',  # e.g. 2025
+        'columns': ['Student Id', 'Course Level', 'Programme', 'Department', 'School']
+    },
+    'financial': {
+        'file': 'financial_data.xlsx',
+        'sheet_pattern': r'(January|February|March|April|May|June|July|August|September|October|November|December)'
+                         r'( \d{1,2})? \d{4}',  # e.g. June 30 2024, like the statement PDFs
+        'columns': [],
+        'header_pattern': r'Combined Statement of Financial Position.*',
+        'line_items': [INSTITUTION, 'TOTAL ASSETS', 'Total Liabilities & Net Assets']
+    },
+    'faculty': {
+        'file': 'HigherFaculty.xlsx',
+        'sheet_pattern': None,
+        'columns': ['Name', 'Position']
+    }
+}
+
+# Spreadsheet types among UPLOAD_CONFIG['allowed_extensions']; a CSV replaces the sheet it is named after
+DATASET_EXTENSIONS = ('.xlsx', '.xls', '.csv')
+
+STATUS_FILE = 'status.json'
+BLOCK_SIZE = 64 * 1024
+STALE_UPLOAD_SECONDS = 24 * 60 * 60
+
+_executor = None
+
+
+class UploadError(Exception):
+    """An upload request that can't be accepted; status is the HTTP status to answer with"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def _upload_folder(upload_id: str) -> str:
+    if not re.fullmatch(r'[0-9a-f]{32}', upload_id or ''):
+        raise UploadError('Unknown upload', 404)
+    return os.path.join(UPLOAD_CONFIG['temp_folder'], 'uploads', upload_id)
+
+
+def read_status(upload_id: str) -> dict:
+    try:
+        with open(os.path.join(_upload_folder(upload_id), STATUS_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        raise UploadError('Unknown upload', 404)
+
+
+def _write_status(upload_id: str, **changes) -> dict:
+    path = os.path.join(_upload_folder(upload_id), STATUS_FILE)
+    try:
+        with open(path) as f:
+            status = json.load(f)
+    except (OSError, ValueError):
+        status = {}
+    status.update(changes, updated_at=time.time())
+
+    with open(path + '.tmp', 'w') as f:
+        json.dump(status, f)
+    os.replace(path + '.tmp', path)
+    return status
+
+
+def _sweep_stale_uploads():
+    root = os.path.join(UPLOAD_CONFIG['temp_folder'], 'uploads')
+    if not os.path.isdir(root):
+        return
+    cutoff = time.time() - STALE_UPLOAD_SECONDS
+    for name in os.listdir(root):
+        folder = os.path.join(root, name)
+        if os.path.getmtime(folder) < cutoff:
+            shutil.rmtree(folder, ignore_errors=True)
+
+
+def start_upload(dataset: str, filename: str, size: int, user_id=None, ip_address: str = None) -> dict:
+    """Check an upload's metadata and create its temp folder"""
+    if dataset not in UPLOAD_DATASETS:
+        raise UploadError(f"Unknown dataset: {dataset}")
+
+    extension = os.path.splitext(filename or '')[1].lower()
+    allowed = [ext for ext in DATASET_EXTENSIONS if ext in UPLOAD_CONFIG['allowed_extensions']]
+    if extension not in allowed:
+        raise UploadError(f"Upload a {', '.join(allowed)} file")
+
+    max_bytes = UPLOAD_CONFIG['max_file_size_mb'] * 1024 * 1024
+    if not isinstance(size, int) or not 0 < size <= max_bytes:
+        raise UploadError(f"Files must be between 1 byte and {UPLOAD_CONFIG['max_file_size_mb']} MB")
+
+    _sweep_stale_uploads()
+    upload_id = secrets.token_hex(16)
+    folder = _upload_folder(upload_id)
+    os.makedirs(folder)
+    open(os.path.join(folder, 'upload' + extension), 'wb').close()
+
+    return _write_status(upload_id, id=upload_id, state='receiving', dataset=dataset,
+                         filename=os.path.basename(filename), extension=extension, size=size, received=0,
+                         chunk_size=UPLOAD_CONFIG['chunk_size_mb'] * 1024 * 1024, user_id=user_id,
+                         ip_address=ip_address, message='Receiving file', errors=[], warnings=[])
+
+
+def write_chunk(upload_id: str, offset: int, stream) -> dict:
+    """Append one chunk from a request body stream, block by block"""
+    status = read_status(upload_id)
+    if status['state'] != 'receiving':
+        raise UploadError(f"Upload is {status['state']}", 409)
+
+    path = os.path.join(_upload_folder(upload_id), 'upload' + status['extension'])
+    received = os.path.getsize(path)
+    if offset != received:
+        raise UploadError(f"Expected the chunk at offset {received}", 409)
+
+    limit = min(status['chunk_size'], status['size'] - received)
+    written = 0
+    with open(path, 'ab') as f:
+        for block in iter(lambda: stream.read(BLOCK_SIZE), b''):
+            written += len(block)
+            if written > limit:
+                f.truncate(received)
+                raise UploadError('Chunk is larger than the upload allows', 413)
+            f.write(block)
+
+    return _write_status(upload_id, received=received + written)
+
+
+def finish_upload(upload_id: str) -> dict:
+    """Queue a fully received upload for validation and publishing"""
+    status = read_status(upload_id)
+    if status['state'] != 'receiving':
+        raise UploadError(f"Upload is {status['state']}", 409)
+    if status['received'] != status['size']:
+        raise UploadError(f"Received {status['received']} of {status['size']} bytes", 409)
+
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=UPLOAD_CONFIG['workers'])
+    status = _write_status(upload_id, state='queued', message='Waiting for validation')
+    _executor.submit(process_upload, upload_id)
+    return status
+
+
+def read_upload(path: str, extension: str, filename: str) -> dict:
+    """{sheet: frame} of an uploaded file; a CSV is one sheet named after the file"""
+    if extension == '.csv':
+        return {os.path.splitext(filename)[0]: pd.read_csv(path)}
+    return pd.read_excel(path, sheet_name=None)
+
+
+def validate_sheets(dataset: str, sheets: dict) -> list:
+    """Schema problems that stop an upload from being published"""
+    spec = UPLOAD_DATASETS[dataset]
+    errors = []
+    if not sheets:
+        errors.append('The file has no sheets')
+
+    for name, frame in sheets.items():
+        if spec['sheet_pattern'] and not re.fullmatch(spec['sheet_pattern'], str(name)):
+            errors.append(f"Sheet '{name}' isn't named like the {dataset} sheets (pattern {spec['sheet_pattern']})")
+        if frame.empty:
+            errors.append(f"Sheet '{name}' has no rows")
+        missing = [column for column in spec['columns'] if column not in frame.columns]
+        if missing:
+            errors.append(f"Sheet '{name}' is missing columns: {', '.join(missing)}")
+
+        if not len(frame.columns):
+            continue
+        if spec.get('header_pattern') and not re.fullmatch(spec['header_pattern'], str(frame.columns[0]).strip()):
+            errors.append(f"Sheet '{name}' should start with a '{spec['header_pattern']}' title, "
+                          f"not '{frame.columns[0]}'")
+        if spec.get('line_items'):
+            labels = set(frame.iloc[:, 0].dropna().astype(str).str.strip())
+            missing = [item for item in spec['line_items'] if item not in labels]
+            if missing:
+                errors.append(f"Sheet '{name}' is missing line items: {', '.join(missing)}")
+    return errors
+
+
+def publish_dataset(dataset: str, upload_id: str, path: str, extension: str, sheets: dict) -> dict:
+    """
+    Replace the dataset's workbook with the upload
+    The Parquet copy is written first and the workbook swapped in with os.replace;
+    returns {sheet: rows} of the published workbook
+    """
+    workbook = UPLOAD_DATASETS[dataset]['file']
+    target = data_loader.data_directory / workbook
+    staged = target.with_name(f".{workbook}.{upload_id}.tmp")
+
+    # Held until the pointer is written: another upload of this dataset would otherwise
+    # merge its CSV into a workbook being replaced, or point the cache at the wrong version
+    with open(target.with_name(f".{workbook}.lock"), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        return _publish_staged(workbook, target, staged, upload_id, path, extension, sheets)
+
+
+def _publish_staged(workbook: str, target, staged, upload_id: str, path: str, extension: str,
+                    sheets: dict) -> dict:
+    try:
+        if extension == '.xlsx':
+            shutil.copyfile(path, staged)
+        else:
+            # A CSV replaces one sheet of the current workbook; an .xls is converted
+            if extension == '.csv' and target.exists():
+                sheets = {**pd.read_excel(target, sheet_name=None), **sheets}
+            with pd.ExcelWriter(staged, engine='openpyxl') as writer:
+                for name, frame in sheets.items():
+                    frame.to_excel(writer, sheet_name=name, index=False)
+            # What readers of the workbook will get (CSV and Excel infer types differently)
+            sheets = pd.read_excel(staged, sheet_name=None)
+
+        entry = write_columnar(workbook, sheets, upload_id)
+        # Hashed before the swap: the version must describe this upload's workbook
+        version = file_version(staged)
+        os.replace(staged, target)
+    finally:
+        if staged.exists():
+            staged.unlink()
+
+    publish_columnar(workbook, entry, version)
+    return {name: len(frame) for name, frame in sheets.items()}
+
+
+def process_upload(upload_id: str):
+    """Validate and publish an upload (runs in a worker process)"""
+    status = read_status(upload_id)
+    path = os.path.join(_upload_folder(upload_id), 'upload' + status['extension'])
+
+    try:
+        _write_status(upload_id, state='validating', message='Checking the file against the dataset')
+        try:
+            sheets = read_upload(path, status['extension'], status['filename'])
+        except Exception as e:
+            _write_status(upload_id, state='failed', message='The file could not be read', errors=[str(e)])
+            return
+
+        errors = validate_sheets(status['dataset'], sheets)
+        if errors:
+            _write_status(upload_id, state='failed', message='The file does not match the dataset', errors=errors)
+            return
+
+        warnings = data_loader.validate_data_integrity(sheets)['issues']
+        _write_status(upload_id, state='publishing', message='Publishing', warnings=warnings)
+        rows = publish_dataset(status['dataset'], upload_id, path, status['extension'], sheets)
+
+        _write_status(upload_id, state='done', rows=rows,
+                      message=f"Published {sum(rows.values())} rows in {len(rows)} sheet(s)")
+        log_user_action(status.get('user_id'), 'upload_dataset', status['dataset'],
+                        f"{status['filename']}: {rows}", status.get('ip_address'))
+
+    except Exception as e:
+        _write_status(upload_id, state='failed', message='Publishing failed', errors=[str(e)])
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def install_upload_routes(server, session_payload):
+    """
+    Serve the /upload endpoints on a Flask server (admins only)
+    session_payload() returns the signed-in user's session summary (auth_routes.get_session_payload)
+    """
+
+    def admin():
+        user = session_payload() or {}
+        if not user.get('authenticated') or user.get('role') != 'admin':
+            raise UploadError('Admin access required', 403)
+        return user
+
+    def own_upload(upload_id, user):
+        status = read_status(upload_id)
+        if status.get('user_id') != user.get('user_id'):
+            raise UploadError('Unknown upload', 404)
+        return status
+
+    def handle(action):
+        try:
+            return jsonify(action())
+        except UploadError as e:
+            response = jsonify({'error': str(e)})
+            response.status_code = e.status
+            return response
+
+    @server.route('/upload/start', methods=['POST'])
+    def upload_start():
+        def action():
+            user = admin()
+            body = request.get_json(silent=True) or {}
+            return start_upload(body.get('dataset'), body.get('filename'), body.get('size'),
+                                user.get('user_id'), client_ip())
+        return handle(action)
+
+    @server.route('/upload/<upload_id>/chunk', methods=['PUT'])
+    def upload_chunk(upload_id):
+        def action():
+            own_upload(upload_id, admin())
+            return write_chunk(upload_id, request.args.get('offset', type=int), request.stream)
+        return handle(action)
+
+    @server.route('/upload/<upload_id>/complete', methods=['POST'])
+    def upload_complete(upload_id):
+        def action():
+            own_upload(upload_id, admin())
+            return finish_upload(upload_id)
+        return handle(action)
+
+    @server.route('/upload/<upload_id>/status')
+    def upload_status(upload_id):
+        return handle(lambda: own_upload(upload_id, admin()))
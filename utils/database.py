@@ -1,95 +1,21 @@
 import sqlite3
 from datetime import datetime
-import hashlib
-import secrets
+
+from auth.credential_verifier import hash_password as _pbkdf2_hash_password
+from config import AUDIT_CONFIG
+from utils.admin_stats import EMPTY_STATS, admin_stats
+from utils.audit_writer import get_audit_writer
+from utils.maintenance import sweep_expired_sessions
+from utils.migrations import migrate_database
 
 
 def init_database(db_path: str = "usc_ir.db"):
-    """Initialize the database with all required tables"""
+    """Bring the database up to the current schema and ensure an admin exists"""
+    migrate_database(db_path, schema='usc_ir.db')
+
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
-    # Users table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            full_name TEXT NOT NULL,
-            department TEXT,
-            is_admin BOOLEAN DEFAULT 0,
-            is_active BOOLEAN DEFAULT 1,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            last_login DATETIME
-        )
-    ''')
-
-    # User sessions table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS user_sessions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            session_id TEXT UNIQUE NOT NULL,
-            user_id INTEGER NOT NULL,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            expires_at DATETIME NOT NULL,
-            last_used DATETIME,
-            ip_address TEXT,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
-
-    # Access requests table (for non-users requesting access)
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS access_requests (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            name TEXT NOT NULL,
-            email TEXT NOT NULL,
-            department TEXT NOT NULL,
-            position TEXT NOT NULL,
-            is_usc_employee BOOLEAN NOT NULL,
-            access_type TEXT NOT NULL,
-            justification TEXT,
-            requested_duration INTEGER DEFAULT 30,
-            status TEXT DEFAULT 'pending',
-            approved_by INTEGER,
-            approved_date DATETIME,
-            approved_duration INTEGER,
-            notes TEXT,
-            FOREIGN KEY (approved_by) REFERENCES users (id)
-        )
-    ''')
-
-    # Audit log table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS audit_log (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            user_id INTEGER,
-            action TEXT NOT NULL,
-            resource TEXT,
-            details TEXT,
-            ip_address TEXT,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
-
-    # System settings table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS system_settings (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            setting_key TEXT UNIQUE NOT NULL,
-            setting_value TEXT,
-            description TEXT,
-            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            updated_by INTEGER,
-            FOREIGN KEY (updated_by) REFERENCES users (id)
-        )
-    ''')
-
-    conn.commit()
-
     # Create default admin user if none exists
     create_default_admin(cursor)
 
@@ -122,13 +48,8 @@ def create_default_admin(cursor):
 
 
 def hash_password(password: str) -> str:
-    """Hash password with salt"""
-    salt = secrets.token_hex(16)
-    password_hash = hashlib.pbkdf2_hmac('sha256',
-                                        password.encode('utf-8'),
-                                        salt.encode('utf-8'),
-                                        100000)
-    return f"{salt}:{password_hash.hex()}"
+    """Hash password with salt (same PBKDF2 format as AuthManager)"""
+    return _pbkdf2_hash_password(password)
 
 
 def create_sample_users(db_path: str = "usc_ir.db"):
@@ -225,8 +146,12 @@ def setup_system_settings(db_path: str = "usc_ir.db"):
 def log_user_action(user_id: int, action: str, resource: str = None,
                     details: str = None, ip_address: str = None,
                     db_path: str = "usc_ir.db"):
-    """Log user actions for audit trail"""
+    """Log user actions for audit trail (batched in the background unless async writes are off)"""
     try:
+        if AUDIT_CONFIG['async_writes']:
+            get_audit_writer(db_path).log(user_id, action, resource, details, ip_address)
+            return
+
         conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
 
@@ -242,19 +167,9 @@ def log_user_action(user_id: int, action: str, resource: str = None,
 
 
 def cleanup_expired_sessions(db_path: str = "usc_ir.db"):
-    """Clean up expired sessions"""
+    """Clean up expired sessions (in small batches, see utils.maintenance)"""
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            DELETE FROM user_sessions 
-            WHERE expires_at < datetime('now')
-        ''')
-
-        deleted_count = cursor.rowcount
-        conn.commit()
-        conn.close()
+        deleted_count = sweep_expired_sessions(db_path, 'user_sessions', 'expires_at')
 
         if deleted_count > 0:
             print(f"Cleaned up {deleted_count} expired sessions")
@@ -264,56 +179,10 @@ def cleanup_expired_sessions(db_path: str = "usc_ir.db"):
 
 
 def get_user_stats(db_path: str = "usc_ir.db") -> dict:
-    """Get user statistics for admin dashboard"""
+    """Get user statistics for admin dashboard (one query, cached briefly; see utils.admin_stats)"""
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # Total users
-        cursor.execute('SELECT COUNT(*) FROM users WHERE is_active = 1')
-        total_users = cursor.fetchone()[0]
-
-        # Admin users
-        cursor.execute('SELECT COUNT(*) FROM users WHERE is_admin = 1 AND is_active = 1')
-        admin_users = cursor.fetchone()[0]
-
-        # Active sessions
-        cursor.execute('''
-            SELECT COUNT(*) FROM user_sessions 
-            WHERE expires_at > datetime('now')
-        ''')
-        active_sessions = cursor.fetchone()[0]
-
-        # Pending access requests
-        cursor.execute('''
-            SELECT COUNT(*) FROM access_requests 
-            WHERE status = 'pending'
-        ''')
-        pending_requests = cursor.fetchone()[0]
-
-        # Recent logins (last 24 hours)
-        cursor.execute('''
-            SELECT COUNT(*) FROM users 
-            WHERE last_login > datetime('now', '-1 day')
-        ''')
-        recent_logins = cursor.fetchone()[0]
-
-        conn.close()
-
-        return {
-            "total_users": total_users,
-            "admin_users": admin_users,
-            "active_sessions": active_sessions,
-            "pending_requests": pending_requests,
-            "recent_logins": recent_logins
-        }
+        return admin_stats.get(db_path)
 
     except Exception as e:
         print(f"Error getting user stats: {e}")
-        return {
-            "total_users": 0,
-            "admin_users": 0,
-            "active_sessions": 0,
-            "pending_requests": 0,
-            "recent_logins": 0
-        }
\ No newline at end of file
+        return dict(EMPTY_STATS)
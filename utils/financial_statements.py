@@ -0,0 +1,239 @@
+"""
+Financial statement tables extracted from the PDFs in data/
+
+The statements (data/June 30 2024.pdf, data/March 2025.pdf) are spreadsheet
+exports: one table per page, each statement opening with the university's name,
+its title and its period, then header rows naming the value columns. The build
+step (python extract_financials.py) parses them in a process pool into one long
+typed frame per PDF
+
+    source, statement, period, section, line, line_item, column, value
+
+and stores it through the Parquet cache (utils/columnar_cache.py) as a
+one-sheet entry per PDF, versioned by the PDF's content hash. A PDF is only
+parsed again when its contents change, and the app itself only ever reads the
+Parquet files (see DataLoader.load_financial_data).
+
+pdfplumber is only needed to extract; pyarrow is needed to read the cache.
+"""
+
+import logging
+import math
+import os
+import secrets
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from config import FINANCIAL_STATEMENTS_CONFIG
+from utils.columnar_cache import file_version, load_pointer, publish_columnar, read_columnar, write_columnar
+
+logger = logging.getLogger(__name__)
+
+# Sheet name of a PDF's long frame in its columnar cache entry
+STATEMENTS_SHEET = 'statements'
+
+# Bumped when parsing changes, so the build step extracts unchanged PDFs again
+PARSER_VERSION = 2
+
+# Every statement starts with this line, followed by its title and period
+INSTITUTION = 'UNIVERSITY OF THE SOUTHERN CARIBBEAN'
+
+CATEGORY_COLUMNS = ['source', 'statement', 'period', 'section', 'column']
+
+_frame_cache = {'versions': None, 'frame': None}
+
+
+def parse_amount(cell):
+    """
+    Accounting cell -> float
+    Returns None for text, NaN for an empty cell, 0.0 for a dash
+    """
+    text = (cell or '').replace('$', '').replace(',', '').strip()
+    if not text:
+        return math.nan
+    if text == '-':
+        return 0.0
+
+    negative = text.startswith('(') and text.endswith(')')
+    try:
+        value = float(text.strip('()'))
+    except ValueError:
+        return None
+    return round(-value if negative else value, 2)
+
+
+def column_labels(headers: dict) -> dict:
+    """
+    Header cells of each value column -> the column's label
+    Labels shared by several columns (two 'Total' columns) get the column's position, e.g. 'Total (4)'
+    """
+    labels = {col: ' '.join(parts) for col, parts in headers.items()}
+    counts = Counter(labels.values())
+    return {col: f"{label} ({col})" if counts[label] > 1 else label for col, label in labels.items()}
+
+
+def parse_statement_rows(rows, source: str) -> pd.DataFrame:
+    """
+    Turn the table rows of a statement PDF (all pages, in order) into the long frame
+    Only columns named by a header row carry values; stray cells elsewhere are dropped
+    """
+    records = []
+    statement = period = section = None
+    headers = {}
+    expect = None  # 'title' / 'period' / 'header' / 'data'
+    line = 0
+
+    for row in rows:
+        cells = [(cell or '').strip() for cell in row]
+        if cells == [str(i) for i in range(len(cells))]:
+            continue  # the exported sheet's column index row
+        if not any(cells):
+            continue
+
+        label = cells[0]
+        others = [(col, cell) for col, cell in enumerate(cells) if col and cell]
+
+        if label.upper() == INSTITUTION and not others:
+            expect, headers, section = 'title', {}, None
+            continue
+        if expect == 'title' and not others:
+            statement, expect = label, 'period'
+            continue
+        if expect == 'period' and not others:
+            period, expect = label, 'header'
+            continue
+
+        amounts = {col: parse_amount(cell) for col, cell in others}
+
+        # Header rows mix words with years ("Total" over "2024"); data rows are all amounts
+        if expect == 'header' and (not others or any(value is None for value in amounts.values())):
+            for col, cell in others:
+                headers.setdefault(col, []).append(cell)
+            if label:
+                section = label
+            continue
+        if expect is None:
+            continue  # text before the first statement
+        expect = 'data'
+
+        if all(value is None or math.isnan(value) for value in amounts.values()):
+            if label and not others:
+                section = label
+            continue
+
+        line += 1
+        for col, column in column_labels(headers).items():
+            value = amounts.get(col)
+            if value is None:
+                continue
+            records.append({
+                'source': source,
+                'statement': statement,
+                'period': period,
+                'section': section,
+                'line': line,
+                'line_item': label,
+                'column': column,
+                'value': value
+            })
+
+    frame = pd.DataFrame.from_records(
+        records, columns=['source', 'statement', 'period', 'section', 'line', 'line_item', 'column', 'value'])
+    for name in CATEGORY_COLUMNS:
+        frame[name] = frame[name].astype('category')
+    frame['line'] = frame['line'].astype('int32')
+    frame['line_item'] = frame['line_item'].astype('string')
+    frame['value'] = frame['value'].astype('float64')
+    return frame
+
+
+def extract_pdf(path: str) -> pd.DataFrame:
+    """Parse one statement PDF (slow: run by the build step, never per request)"""
+    import pdfplumber
+
+    rows = []
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            for table in page.extract_tables():
+                rows.extend(table)
+    return parse_statement_rows(rows, os.path.splitext(os.path.basename(path))[0])
+
+
+def _extract_to_cache(path: str, name: str, tag: str) -> dict:
+    # Runs in a worker process; the entry is published by the parent
+    frame = extract_pdf(path)
+    entry = write_columnar(name, {STATEMENTS_SHEET: frame}, tag)
+    if STATEMENTS_SHEET not in entry['sheets']:
+        raise ValueError(f"{name}: the extracted table could not be stored as Parquet")
+    return {**entry, 'parser': PARSER_VERSION, 'rows': len(frame),
+            'statements': sorted(frame['statement'].cat.categories)}
+
+
+def _sources(data_directory: str) -> dict:
+    return {name: os.path.join(data_directory, name) for name in FINANCIAL_STATEMENTS_CONFIG['sources']}
+
+
+def extract_all(data_directory: str = 'data', force: bool = False, workers: int = None) -> dict:
+    """
+    Extract every configured PDF whose contents changed since the last run
+    Returns {pdf name: {'rows', 'statements', 'cached'}}, cached being True when it was skipped
+    """
+    results, pending = {}, {}
+    for name, path in _sources(data_directory).items():
+        version = file_version(path)
+        if version is None:
+            logger.warning(f"Financial statement not found: {path}")
+            continue
+
+        pointer = load_pointer(name)
+        if not force and pointer and pointer['version'] == version and STATEMENTS_SHEET in pointer['sheets'] \
+                and pointer.get('parser') == PARSER_VERSION:
+            results[name] = {'rows': pointer.get('rows'), 'statements': pointer.get('statements', []),
+                             'cached': True}
+        else:
+            pending[name] = (path, version)
+
+    if pending:
+        workers = min(workers or FINANCIAL_STATEMENTS_CONFIG['workers'] or os.cpu_count() or 1, len(pending))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {name: pool.submit(_extract_to_cache, path, name, secrets.token_hex(8))
+                       for name, (path, version) in pending.items()}
+            for name, future in futures.items():
+                entry = future.result()
+                publish_columnar(name, entry, pending[name][1])
+                results[name] = {'rows': entry['rows'], 'statements': entry['statements'], 'cached': False}
+
+    return results
+
+
+def load_statements(data_directory: str = 'data'):
+    """
+    Every extracted PDF as one long frame (told apart by 'source'), read from the Parquet
+    cache and kept in memory until a PDF changes
+    None until extract_financials.py has run
+    """
+    versions = {name: file_version(path) for name, path in _sources(data_directory).items()}
+    if versions == _frame_cache['versions']:
+        return _frame_cache['frame']
+
+    frames = []
+    for name, version in versions.items():
+        if version is None:
+            continue
+        frame = read_columnar(name, version, STATEMENTS_SHEET)
+        if frame is None:
+            logger.warning(f"{name} has not been extracted since it last changed (run extract_financials.py)")
+        else:
+            frames.append(frame)
+
+    frame = None
+    if frames:
+        frame = pd.concat(frames, ignore_index=True)
+        for name in CATEGORY_COLUMNS:
+            # concat falls back to object when the files' categories differ
+            frame[name] = frame[name].astype('category')
+
+    _frame_cache.update(versions=versions, frame=frame)
+    return frame
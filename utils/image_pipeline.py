@@ -0,0 +1,170 @@
+"""
+Responsive image variants for large assets
+
+The build step (python build_assets.py) resizes each source image listed in
+IMAGE_PIPELINE_CONFIG to a set of widths and encodes every width as AVIF, WebP
+and a JPEG/PNG fallback. File names carry a hash of their content
+(banner-960w.3f9c2a1b7e.webp), so they never need revalidating. The manifest
+written next to them lets responsive_picture() emit a <picture> whose srcset
+the browser picks from by viewport width: for the banner a phone downloads a
+16-140 KB AVIF instead of the 3.7 MB PNG.
+
+Pillow is only needed to build; the apps just read the manifest. When no
+manifest exists yet, responsive_picture() renders nothing rather than falling
+back to the full-size original.
+"""
+
+import hashlib
+import io
+import json
+import os
+
+from dash import html
+
+from config import IMAGE_PIPELINE_CONFIG
+
+ASSETS_FOLDER = 'assets'
+ASSETS_URL = '/assets/'
+MANIFEST_NAME = 'manifest.json'
+
+# <source> order matters: the browser takes the first type it supports
+SOURCE_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+
+_manifest_cache = {'mtime': None, 'images': {}}
+
+
+def _output_folder() -> str:
+    return os.path.join(ASSETS_FOLDER, IMAGE_PIPELINE_CONFIG['output_folder'])
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest() -> dict:
+    """{source name: {'width', 'height', 'sha256', 'variants': {format: [{'width', 'file', 'bytes'}]}}}"""
+    path = os.path.join(_output_folder(), MANIFEST_NAME)
+    try:
+        mtime = os.path.getmtime(path)
+        if mtime != _manifest_cache['mtime']:
+            with open(path) as f:
+                _manifest_cache.update(mtime=mtime, images=json.load(f))
+    except (OSError, ValueError):
+        _manifest_cache.update(mtime=None, images={})
+    return _manifest_cache['images']
+
+
+def _encode(image, fmt: str) -> bytes:
+    quality = IMAGE_PIPELINE_CONFIG['quality'].get(fmt)
+    buffer = io.BytesIO()
+    if fmt == 'png':
+        image.save(buffer, 'PNG', optimize=True)
+    elif fmt == 'jpeg':
+        image.save(buffer, 'JPEG', quality=quality, optimize=True, progressive=True)
+    elif fmt == 'webp':
+        image.save(buffer, 'WEBP', quality=quality, method=6)
+    else:
+        image.save(buffer, fmt.upper(), quality=quality)
+    return buffer.getvalue()
+
+
+def build_image_variants(name: str, force: bool = False) -> dict:
+    """
+    Generate the variants of one asset and return its manifest entry
+    Skipped (previous entry returned) when the source has not changed
+    """
+    from PIL import Image
+
+    source_path = os.path.join(ASSETS_FOLDER, name)
+    folder = _output_folder()
+    os.makedirs(folder, exist_ok=True)
+
+    source_hash = _file_hash(source_path)
+    previous = load_manifest().get(name)
+    if previous and previous['sha256'] == source_hash and not force and all(
+            os.path.exists(os.path.join(ASSETS_FOLDER, variant['file']))
+            for variants in previous['variants'].values() for variant in variants):
+        return previous
+
+    image = Image.open(source_path)
+    image.load()
+    opaque = image.mode not in ('RGBA', 'LA', 'P') or image.convert('RGBA').getchannel('A').getextrema()[0] == 255
+    image = image.convert('RGB' if opaque else 'RGBA')
+
+    stem = os.path.splitext(name)[0]
+    widths = sorted({min(width, image.width) for width in IMAGE_PIPELINE_CONFIG['widths']})
+    formats = list(IMAGE_PIPELINE_CONFIG['formats']) + ['jpeg' if opaque else 'png']
+
+    entry = {'width': image.width, 'height': image.height, 'sha256': source_hash, 'variants': {}}
+    for width in widths:
+        height = round(image.height * width / image.width)
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+
+        for fmt in formats:
+            try:
+                data = _encode(resized, fmt)
+            except (KeyError, OSError, ValueError) as e:
+                # e.g. a Pillow build without AVIF; the other formats still cover every browser
+                print(f"⚠️  Skipping {fmt} for {name}: {e}")
+                continue
+
+            extension = 'jpg' if fmt == 'jpeg' else fmt
+            filename = f"{stem}-{width}w.{hashlib.sha256(data).hexdigest()[:10]}.{extension}"
+            with open(os.path.join(folder, filename), 'wb') as f:
+                f.write(data)
+
+            entry['variants'].setdefault(fmt, []).append({
+                'width': width,
+                'file': f"{IMAGE_PIPELINE_CONFIG['output_folder']}/{filename}",
+                'bytes': len(data)
+            })
+
+    return entry
+
+
+def _remove_stale_variants(manifest: dict):
+    folder = _output_folder()
+    current = {os.path.basename(variant['file'])
+               for entry in manifest.values()
+               for variants in entry['variants'].values() for variant in variants}
+    for filename in os.listdir(folder):
+        if filename != MANIFEST_NAME and filename not in current:
+            os.remove(os.path.join(folder, filename))
+
+
+def build_all(force: bool = False) -> dict:
+    """Build every configured source image and rewrite the manifest"""
+    manifest = {name: build_image_variants(name, force) for name in IMAGE_PIPELINE_CONFIG['sources']}
+
+    path = os.path.join(_output_folder(), MANIFEST_NAME)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+    _remove_stale_variants(manifest)
+    return manifest
+
+
+def _srcset(variants) -> str:
+    return ', '.join(f"{ASSETS_URL}{variant['file']} {variant['width']}w" for variant in variants)
+
+
+def responsive_picture(name: str, alt: str = '', sizes: str = '100vw', img_style: dict = None,
+                       className: str = None):
+    """A <picture> offering the built variants of an asset, or None before they have been built"""
+    entry = load_manifest().get(name)
+    if not entry:
+        return None
+
+    sources = [html.Source(type=mime, srcSet=_srcset(entry['variants'][fmt]), sizes=sizes)
+               for fmt, mime in SOURCE_TYPES.items() if entry['variants'].get(fmt)]
+
+    fallback = entry['variants'].get('jpeg') or entry['variants'].get('png')
+    img = html.Img(src=f"{ASSETS_URL}{fallback[0]['file']}", srcSet=_srcset(fallback), sizes=sizes,
+                   alt=alt, width=entry['width'], height=entry['height'], style=img_style)
+
+    return html.Picture(sources + [img], className=className)
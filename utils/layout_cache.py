@@ -0,0 +1,72 @@
+"""
+Cached layouts for static public pages
+
+The public pages (home, About USC, vision/mission, governance) are the same for
+every visitor, yet the routing callbacks used to rebuild their component trees
+and Dash re-serialized them on every navigation. Each registered page is now
+built once per process and kept as its serialized JSON form: the routing
+callback returns the plain dict (Dash's renderer receives exactly what it would
+have for the component objects). Navigation goes through Dash's POST callback
+requests, which browsers don't revalidate, so there is no ETag to offer.
+
+Pages built from editable content (the data/*.txt narratives) register a
+version function; when it returns something new the page is rebuilt once.
+"""
+
+import json
+import threading
+
+from dash._utils import to_json
+
+
+class StaticLayoutCache:
+    """Builds each registered static layout once and keeps its serialized form"""
+
+    def __init__(self):
+        self._builders = {}
+        self._versions = {}
+        self._payloads = {}  # name -> (layout dict, version)
+        self._lock = threading.Lock()
+
+    def register(self, name: str, builder, version=None):
+        """
+        Register (or replace) the function that builds a static page
+        version: optional callable; the page is rebuilt whenever its value changes
+        """
+        with self._lock:
+            self._builders[name] = builder
+            self._versions[name] = version
+            self._payloads.pop(name, None)
+
+    def _entry(self, name: str):
+        version = self._versions[name]() if self._versions.get(name) else None
+        entry = self._payloads.get(name)
+        if entry is not None and entry[1] == version:
+            return entry
+
+        builder = self._builders[name]
+        entry = (json.loads(to_json(builder())), version)
+
+        with self._lock:
+            # Another thread may have built the same version meanwhile; either copy is identical
+            current = self._payloads.get(name)
+            if current is not None and current[1] == version:
+                return current
+            self._payloads[name] = entry
+            return entry
+
+    def get(self, name: str) -> dict:
+        """The page's layout, ready to return from a callback"""
+        return self._entry(name)[0]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._builders
+
+    def clear(self):
+        """Forget built layouts (they are rebuilt on next use)"""
+        with self._lock:
+            self._payloads.clear()
+
+
+# Global instance shared by the routing callbacks
+static_layouts = StaticLayoutCache()
@@ -0,0 +1,137 @@
+"""
+Scheduled database maintenance
+
+Expired sessions are swept every DATABASE_CONFIG['cleanup_expired_sessions_hours']
+by a background thread, which also takes the daily backup when it is due
+(see utils/backup.py). Deletes run in small batches, each in its own short
+transaction, so a sweep never holds the SQLite write lock long enough to stall
+a login.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from config import DATABASE_CONFIG
+from utils.backup import format_backup_summary, run_scheduled_backup
+from utils.migrations import create_index_if_missing, table_columns
+
+# (database, table, token columns, expiry column) for every session table in use.
+# Tables or columns missing from a database are skipped.
+SESSION_TABLES = [
+    ('usc_ir.db', 'user_sessions', ('session_id', 'session_token'), 'expires_at'),
+    ('usc_ir.db', 'sessions', ('token',), 'expires_at'),
+    ('usc_ir_new.db', 'sessions', ('token',), 'expires_at'),
+    ('usc_portal.db', 'user_sessions', ('session_token',), 'expires_at'),
+    ('usc_access.db', 'admin_sessions', ('session_id',), 'expires_date'),
+]
+
+
+def ensure_session_indexes(db_path: str, table: str, token_columns, expiry_column: str):
+    """Index the token lookup and expiry columns of a session table"""
+    if not os.path.exists(db_path):
+        return
+
+    conn = sqlite3.connect(db_path, timeout=30)
+    cursor = conn.cursor()
+    try:
+        for column in (*token_columns, expiry_column):
+            create_index_if_missing(cursor, table, column)
+
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def sweep_expired_sessions(db_path: str, table: str, expiry_column: str,
+                           batch_size: int = None, pause_seconds: float = 0.05) -> int:
+    """Delete expired rows in batches, committing after each one; returns rows deleted"""
+    batch_size = batch_size or DATABASE_CONFIG['session_sweep_batch_size']
+    if not os.path.exists(db_path):
+        return 0
+
+    conn = sqlite3.connect(db_path, timeout=30)
+    cursor = conn.cursor()
+    deleted = 0
+    try:
+        if expiry_column not in table_columns(cursor, table):
+            return 0
+
+        while True:
+            cursor.execute(f'''
+                DELETE FROM {table} WHERE rowid IN (
+                    SELECT rowid FROM {table}
+                    WHERE {expiry_column} < datetime('now')
+                    LIMIT ?
+                )
+            ''', (batch_size,))
+            conn.commit()
+
+            deleted += cursor.rowcount
+            if cursor.rowcount < batch_size:
+                break
+
+            # Let waiting writers in between batches
+            time.sleep(pause_seconds)
+    finally:
+        conn.close()
+
+    return deleted
+
+
+def run_session_maintenance(tables=None) -> int:
+    """Index and sweep every configured session table once"""
+    total = 0
+    for db_path, table, token_columns, expiry_column in tables or SESSION_TABLES:
+        try:
+            ensure_session_indexes(db_path, table, token_columns, expiry_column)
+            deleted = sweep_expired_sessions(db_path, table, expiry_column)
+            if deleted > 0:
+                print(f"Cleaned up {deleted} expired sessions from {db_path}:{table}")
+            total += deleted
+        except Exception as e:
+            print(f"Error sweeping {db_path}:{table}: {e}")
+
+    return total
+
+
+class MaintenanceScheduler:
+    """Runs session maintenance on a fixed interval in a daemon thread"""
+
+    def __init__(self, interval_hours: float = None):
+        self.interval_seconds = (interval_hours or DATABASE_CONFIG['cleanup_expired_sessions_hours']) * 3600
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def start(self):
+        """Start the scheduler once per process (gunicorn workers call this after forking)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+
+            self._pid = os.getpid()
+            self._stop_event = threading.Event()
+            self._thread = threading.Thread(target=self._run, name="db-maintenance", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        # Sweep once at startup, then on every interval
+        while True:
+            run_session_maintenance()
+            try:
+                for entry in run_scheduled_backup():
+                    print(f"Backup: {format_backup_summary(entry)}")
+            except Exception as e:
+                print(f"Error running scheduled backup: {e}")
+            if self._stop_event.wait(self.interval_seconds):
+                break
+
+    def stop(self):
+        self._stop_event.set()
+
+
+# Global instance started by the server entry points
+maintenance_scheduler = MaintenanceScheduler()
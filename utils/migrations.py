@@ -0,0 +1,379 @@
+"""
+Versioned schema migrations for the portal's SQLite databases
+
+Each database records the last migration applied in PRAGMA user_version, so an
+up-to-date database costs one PRAGMA read at startup instead of a round of
+CREATE TABLE IF NOT EXISTS statements. Every migration is idempotent: it only
+creates what is missing, so it is safe on databases that were built by the
+older per-module init_database functions.
+
+Run once per deploy with: python migrate_db.py
+"""
+
+import os
+import sqlite3
+
+# ==================== TABLE DEFINITIONS ====================
+
+# One users table for every module. Columns that only some modules use are
+# nullable so any module's INSERT works against it.
+USERS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        email TEXT UNIQUE NOT NULL,
+        username TEXT UNIQUE,
+        password_hash TEXT,
+        full_name TEXT,
+        phone_number TEXT,
+        department TEXT,
+        position TEXT,
+        is_usc_employee INTEGER DEFAULT 0,
+        role TEXT DEFAULT 'user',
+        is_admin INTEGER DEFAULT 0,
+        is_active INTEGER DEFAULT 1,
+        is_approved INTEGER DEFAULT 0,
+        approved_by INTEGER,
+        approved_at DATETIME,
+        google_auth INTEGER DEFAULT 0,
+        google_id TEXT,
+        profile_picture TEXT,
+        password_reset_token TEXT,
+        password_reset_expires DATETIME,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        last_login DATETIME
+    )
+'''
+
+# AuthManager keys sessions by session_id, the Google sign-in routes by session_token
+USER_SESSIONS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS user_sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id TEXT UNIQUE,
+        session_token TEXT UNIQUE,
+        user_id INTEGER NOT NULL,
+        user_email TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        expires_at DATETIME NOT NULL,
+        last_used DATETIME,
+        ip_address TEXT,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+'''
+
+SESSIONS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        token TEXT UNIQUE NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        expires_at DATETIME NOT NULL,
+        ip_address TEXT,
+        user_agent TEXT,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+'''
+
+ACCESS_REQUESTS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS access_requests (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        name TEXT NOT NULL,
+        email TEXT NOT NULL,
+        department TEXT,
+        position TEXT,
+        is_usc_employee BOOLEAN DEFAULT 0,
+        access_type TEXT,
+        justification TEXT,
+        requested_duration INTEGER DEFAULT 30,
+        status TEXT DEFAULT 'pending',
+        approved_by TEXT,
+        approved_date DATETIME,
+        approved_duration INTEGER,
+        access_token TEXT,
+        token_expires DATETIME,
+        notes TEXT
+    )
+'''
+
+AUDIT_LOG_TABLE = '''
+    CREATE TABLE IF NOT EXISTS audit_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        user_id INTEGER,
+        action TEXT NOT NULL,
+        resource TEXT,
+        details TEXT,
+        ip_address TEXT,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+'''
+
+ACCESS_LOGS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS access_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        action TEXT NOT NULL,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        ip_address TEXT,
+        details TEXT,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+'''
+
+SYSTEM_SETTINGS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS system_settings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        setting_key TEXT UNIQUE NOT NULL,
+        setting_value TEXT,
+        description TEXT,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_by INTEGER,
+        FOREIGN KEY (updated_by) REFERENCES users (id)
+    )
+'''
+
+ACTIVE_SESSIONS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS active_sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        email TEXT NOT NULL,
+        access_token TEXT NOT NULL,
+        access_type TEXT NOT NULL,
+        created_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+        expires_date DATETIME NOT NULL,
+        last_used DATETIME,
+        ip_address TEXT,
+        notes TEXT
+    )
+'''
+
+ADMIN_SESSIONS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS admin_sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id TEXT UNIQUE NOT NULL,
+        created_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+        expires_date DATETIME NOT NULL,
+        ip_address TEXT
+    )
+'''
+
+# Failed sign-in counters persisted by auth/login_lockout.py
+LOGIN_LOCKOUTS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS login_lockouts (
+        key TEXT PRIMARY KEY,
+        window_index INTEGER NOT NULL,
+        current_failures INTEGER NOT NULL DEFAULT 0,
+        previous_failures INTEGER NOT NULL DEFAULT 0,
+        locked_until REAL NOT NULL DEFAULT 0,
+        updated_at REAL
+    )
+'''
+
+# Tables each database should contain, keyed by database file name
+DATABASE_SCHEMAS = {
+    'usc_ir.db': [USERS_TABLE, USER_SESSIONS_TABLE, SESSIONS_TABLE, ACCESS_REQUESTS_TABLE,
+                  AUDIT_LOG_TABLE, ACCESS_LOGS_TABLE, SYSTEM_SETTINGS_TABLE, LOGIN_LOCKOUTS_TABLE],
+    'usc_ir_new.db': [USERS_TABLE, SESSIONS_TABLE, ACCESS_LOGS_TABLE],
+    'usc_portal.db': [USERS_TABLE, USER_SESSIONS_TABLE],
+    'usc_access.db': [ACCESS_REQUESTS_TABLE, ACTIVE_SESSIONS_TABLE, ADMIN_SESSIONS_TABLE],
+}
+
+# Columns older copies of a table may be missing: (column, declaration for ALTER TABLE).
+# SQLite cannot add UNIQUE/NOT NULL columns or non-constant defaults, so these are plain.
+COLUMN_ADDITIONS = {
+    'users': [
+        ('username', 'TEXT'), ('password_hash', 'TEXT'), ('full_name', 'TEXT'),
+        ('phone_number', 'TEXT'), ('department', 'TEXT'), ('position', 'TEXT'),
+        ('is_usc_employee', 'INTEGER DEFAULT 0'), ('role', "TEXT DEFAULT 'user'"),
+        ('is_admin', 'INTEGER DEFAULT 0'), ('is_active', 'INTEGER DEFAULT 1'),
+        ('is_approved', 'INTEGER DEFAULT 0'), ('approved_by', 'INTEGER'), ('approved_at', 'DATETIME'),
+        ('google_auth', 'INTEGER DEFAULT 0'), ('google_id', 'TEXT'), ('profile_picture', 'TEXT'),
+        ('password_reset_token', 'TEXT'), ('password_reset_expires', 'DATETIME'),
+        ('created_at', 'DATETIME'), ('last_login', 'DATETIME'),
+    ],
+    'user_sessions': [
+        ('session_id', 'TEXT'), ('session_token', 'TEXT'), ('user_email', 'TEXT'),
+        ('last_used', 'DATETIME'), ('ip_address', 'TEXT'),
+    ],
+    'sessions': [('ip_address', 'TEXT'), ('user_agent', 'TEXT')],
+    'access_requests': [
+        ('approved_date', 'DATETIME'), ('approved_duration', 'INTEGER'),
+        ('access_token', 'TEXT'), ('token_expires', 'DATETIME'), ('notes', 'TEXT'),
+    ],
+    'active_sessions': [('notes', 'TEXT')],
+}
+
+# (table, column) pairs the hot queries filter or join on
+HOT_QUERY_INDEXES = [
+    ('users', 'email'),
+    ('users', 'username'),
+    ('users', 'google_id'),
+    ('users', 'is_approved'),
+    ('user_sessions', 'session_id'),
+    ('user_sessions', 'session_token'),
+    ('user_sessions', 'user_id'),
+    ('user_sessions', 'expires_at'),
+    ('sessions', 'token'),
+    ('sessions', 'user_id'),
+    ('sessions', 'expires_at'),
+    ('access_requests', 'status'),
+    ('access_requests', 'timestamp'),
+    ('access_requests', 'email'),
+    ('audit_log', 'timestamp'),
+    ('audit_log', 'user_id'),
+    ('access_logs', 'timestamp'),
+    ('access_logs', 'user_id'),
+    ('active_sessions', 'access_token'),
+    ('active_sessions', 'expires_date'),
+    ('admin_sessions', 'session_id'),
+    ('admin_sessions', 'expires_date'),
+]
+
+# Composite indexes for keyset-paginated log browsing (see utils/audit_log.py).
+# The trailing id comes for free: every SQLite index entry ends with the rowid.
+LOG_FILTER_INDEXES = [
+    ('audit_log', ('user_id', 'timestamp')),
+    ('audit_log', ('action', 'timestamp')),
+    ('access_logs', ('user_id', 'timestamp')),
+    ('access_logs', ('action', 'timestamp')),
+]
+
+
+# ==================== HELPERS ====================
+
+def table_columns(cursor, table: str) -> set:
+    """Column names of a table (empty if the table does not exist)"""
+    cursor.execute(f'PRAGMA table_info({table})')
+    return {row[1] for row in cursor.fetchall()}
+
+
+def has_leading_index(cursor, table: str, column: str) -> bool:
+    """True if some index (including UNIQUE constraints) starts with this column"""
+    cursor.execute(f'PRAGMA index_list({table})')
+    for index in cursor.fetchall():
+        cursor.execute(f'PRAGMA index_info("{index[1]}")')
+        info = cursor.fetchall()
+        if info and info[0][2] == column:
+            return True
+    return False
+
+
+def create_index_if_missing(cursor, table: str, column: str) -> bool:
+    """Index a column unless the table/column is absent or already indexed"""
+    if column not in table_columns(cursor, table) or has_leading_index(cursor, table, column):
+        return False
+
+    cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({column})')
+    return True
+
+
+def create_composite_index_if_missing(cursor, table: str, columns) -> bool:
+    """Create a multi-column index unless the table or any column is absent"""
+    if not set(columns) <= table_columns(cursor, table):
+        return False
+
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{'_'.join(columns)} ON {table} ({', '.join(columns)})")
+    return True
+
+
+# ==================== MIGRATIONS ====================
+
+def _create_tables(cursor, schema: str):
+    for table_sql in DATABASE_SCHEMAS.get(schema, []):
+        cursor.execute(table_sql)
+
+
+def _add_missing_columns(cursor, schema: str):
+    for table, additions in COLUMN_ADDITIONS.items():
+        existing = table_columns(cursor, table)
+        if not existing:
+            continue
+
+        for column, declaration in additions:
+            if column not in existing:
+                cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {declaration}')
+
+    # Some modules check is_admin, others role = 'admin'; keep them in agreement
+    if {'is_admin', 'role'} <= table_columns(cursor, 'users'):
+        cursor.execute("UPDATE users SET is_admin = 1 WHERE role = 'admin' AND COALESCE(is_admin, 0) = 0")
+        cursor.execute("UPDATE users SET role = 'admin' WHERE is_admin = 1 AND COALESCE(role, '') <> 'admin'")
+
+
+def _add_hot_query_indexes(cursor, schema: str):
+    for table, column in HOT_QUERY_INDEXES:
+        create_index_if_missing(cursor, table, column)
+
+
+def _add_log_filter_indexes(cursor, schema: str):
+    for table, columns in LOG_FILTER_INDEXES:
+        create_composite_index_if_missing(cursor, table, columns)
+
+
+# (version, name, function(cursor, schema)); append new migrations, never reorder
+MIGRATIONS = [
+    (1, 'create_tables', _create_tables),
+    (2, 'add_missing_columns', _add_missing_columns),
+    (3, 'add_hot_query_indexes', _add_hot_query_indexes),
+    (4, 'add_log_filter_indexes', _add_log_filter_indexes),
+    (5, 'create_login_lockouts', _create_tables),  # CREATE TABLE IF NOT EXISTS picks up the new table
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# ==================== RUNNER ====================
+
+def get_schema_version(db_path: str) -> int:
+    """Last migration applied to a database (0 if it does not exist yet)"""
+    if not os.path.exists(db_path):
+        return 0
+
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute('PRAGMA user_version').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def migrate_database(db_path: str, schema: str = None, verbose: bool = False) -> int:
+    """
+    Apply pending migrations to one database, each in its own transaction
+    schema names the DATABASE_SCHEMAS entry to use (defaults to the file name)
+    Returns the number of migrations applied
+    """
+    schema = schema or os.path.basename(db_path)
+
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.isolation_level = None  # explicit transactions so DDL is rolled back on failure
+    cursor = conn.cursor()
+    applied = 0
+    try:
+        current = cursor.execute('PRAGMA user_version').fetchone()[0]
+
+        for version, name, migration in MIGRATIONS:
+            if version <= current:
+                continue
+
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                migration(cursor, schema)
+                cursor.execute(f'PRAGMA user_version = {version}')
+                cursor.execute('COMMIT')
+            except Exception:
+                cursor.execute('ROLLBACK')
+                raise
+
+            applied += 1
+            if verbose:
+                print(f"✅ {db_path}: applied migration {version} ({name})")
+    finally:
+        conn.close()
+
+    return applied
+
+
+def migrate_all(databases=None, verbose: bool = False) -> int:
+    """Migrate every known database; returns the total number of migrations applied"""
+    total = 0
+    for db_path in databases or DATABASE_SCHEMAS:
+        total += migrate_database(db_path, verbose=verbose)
+    return total
@@ -0,0 +1,218 @@
+"""
+Request rate limiting
+
+Every request to a Flask server (Dash callbacks on /_dash-update-component
+included) takes one token from the client's IP bucket and, when it has one,
+from its session bucket. A bucket holds a burst of N tokens and refills at
+N per minute, so an abusive client is answered with a 429 before it reaches a
+callback worker. Requests under /api/ also draw from an hourly bucket
+(API_CONFIG['rate_limit_per_hour']). Static files are never limited.
+
+Polling is charged to a separate, larger session bucket
+(SECURITY_CONFIG['max_poll_requests_per_minute']): a running background
+callback is polled about once a second (requests carrying Dash's cacheKey/job
+arguments), and the admin upload form sends chunks and polls its status under
+/upload/. Counted against the ordinary session budget they would answer a
+running job with 429s and starve the user's clicks.
+
+Buckets live in process memory by default. Each bucket is an immutable
+(tokens, updated_at) tuple replaced in a single dict assignment, so no lock is
+taken per request; two threads racing on the same key can at worst let one
+extra request through. With several gunicorn workers the per-worker buckets
+add up, so SECURITY_CONFIG['rate_limit_backend'] = 'sqlite' keeps them in a
+shared database file instead, updated with one atomic UPSERT per bucket.
+"""
+
+import math
+import os
+import sqlite3
+import threading
+import time
+
+from flask import jsonify, request, session
+
+from config import API_CONFIG, SECURITY_CONFIG
+
+# Served by Dash/Flask straight from disk; cheap and requested in bursts on every page load
+EXEMPT_PREFIXES = ('/assets/', '/_dash-component-suites/', '/_favicon.ico', '/static/')
+
+# Chunked uploads and their status polls (utils/data_upload.py), charged to the poll bucket
+POLL_PREFIXES = ('/upload/',)
+
+
+class MemoryBucketStore:
+    """Token buckets in a plain dict of (tokens, updated_at) tuples"""
+
+    def __init__(self, max_keys: int = None):
+        self.max_keys = max_keys or SECURITY_CONFIG['rate_limit_max_tracked_keys']
+        self._buckets = {}
+        self._next_prune = 0
+
+    def take(self, key: str, capacity: float, rate: float, now: float = None) -> float:
+        """Take one token; returns 0 when allowed, else seconds until a token is available"""
+        now = time.monotonic() if now is None else now
+        tokens, updated_at = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * rate)
+
+        if tokens < 1:
+            return (1 - tokens) / rate
+
+        self._buckets[key] = (tokens - 1, now)
+        if len(self._buckets) > self.max_keys and now >= self._next_prune:
+            self._prune(now)
+        return 0
+
+    def _prune(self, now: float):
+        # Drop buckets idle for an hour (refilled by then); recreating them is free.
+        # list() copies the items atomically, so concurrent takes are never blocked
+        self._next_prune = now + 60
+        for key, (tokens, updated_at) in list(self._buckets.items()):
+            if now - updated_at > 3600:
+                self._buckets.pop(key, None)
+
+
+class SQLiteBucketStore:
+    """Token buckets shared by every worker process through one SQLite table"""
+
+    TAKE_SQL = '''
+        INSERT INTO rate_limit_buckets (key, tokens, updated_at) VALUES (:key, :capacity - 1, :now)
+        ON CONFLICT(key) DO UPDATE SET
+            tokens = MIN(:capacity, tokens + (:now - updated_at) * :rate) - 1,
+            updated_at = :now
+        WHERE MIN(:capacity, tokens + (:now - updated_at) * :rate) >= 1
+    '''
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or SECURITY_CONFIG['rate_limit_db']
+        self._local = threading.local()
+        self._calls = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=1, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            # Counters are disposable; losing the last few on a crash is fine
+            conn.execute('PRAGMA synchronous=OFF')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            ''')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def take(self, key: str, capacity: float, rate: float, now: float = None) -> float:
+        """Take one token; returns 0 when allowed, else seconds until a token is available"""
+        # Wall-clock time: monotonic clocks are not comparable across processes
+        now = time.time() if now is None else now
+        conn = self._connection()
+
+        if conn.execute(self.TAKE_SQL, {'key': key, 'capacity': capacity, 'rate': rate, 'now': now}).rowcount:
+            self._calls += 1
+            if self._calls % 1000 == 0:
+                conn.execute('DELETE FROM rate_limit_buckets WHERE updated_at < ?', (now - 3600,))
+            return 0
+
+        row = conn.execute('SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?', (key,)).fetchone()
+        tokens = min(capacity, row[0] + (now - row[1]) * rate) if row else capacity
+        return max((1 - tokens) / rate, 0)
+
+
+class RateLimiter:
+    """Applies the configured per-IP, per-session and API limits to Flask requests"""
+
+    def __init__(self, store=None, per_minute: int = None, ip_per_minute: int = None,
+                 api_per_hour: int = None, poll_per_minute: int = None):
+        self.per_minute = per_minute or SECURITY_CONFIG['max_requests_per_minute']
+        self.ip_per_minute = ip_per_minute or SECURITY_CONFIG['max_requests_per_minute_per_ip']
+        self.api_per_hour = api_per_hour or API_CONFIG['rate_limit_per_hour']
+        self.poll_per_minute = poll_per_minute or SECURITY_CONFIG['max_poll_requests_per_minute']
+        self._store = store
+
+    @property
+    def store(self):
+        # Created on first use so the SQLite backend never opens a connection before fork
+        if self._store is None:
+            if SECURITY_CONFIG['rate_limit_backend'] == 'sqlite':
+                self._store = SQLiteBucketStore()
+            else:
+                self._store = MemoryBucketStore()
+        return self._store
+
+    def limits_for(self, path: str, client_ip: str, session_key: str = None, poll: bool = False):
+        """(bucket key, capacity, refill per second) for every bucket a request draws from"""
+        limits = [(f"ip:{client_ip}", self.ip_per_minute, self.ip_per_minute / 60)]
+        if session_key and poll:
+            limits.append((f"poll:{session_key}", self.poll_per_minute, self.poll_per_minute / 60))
+        elif session_key:
+            limits.append((f"session:{session_key}", self.per_minute, self.per_minute / 60))
+        if path.startswith('/api/'):
+            limits.append((f"api:{session_key or client_ip}", self.api_per_hour, self.api_per_hour / 3600))
+        return limits
+
+    def check(self, path: str, client_ip: str, session_key: str = None, poll: bool = False) -> float:
+        """0 when the request may proceed, else the seconds the client should wait"""
+        retry_after = 0
+        for key, capacity, rate in self.limits_for(path, client_ip, session_key, poll):
+            try:
+                retry_after = max(retry_after, self.store.take(key, capacity, rate))
+            except sqlite3.Error as e:
+                # Fail open: a busy counter database must not take the portal down
+                print(f"Rate limiter error: {e}")
+        return retry_after
+
+
+def is_poll_request() -> bool:
+    """A background callback poll (Dash adds cacheKey/job to the URL) or an upload chunk/status request"""
+    if request.path.startswith(POLL_PREFIXES):
+        return True
+    return request.path == '/_dash-update-component' and 'cacheKey' in request.args and 'job' in request.args
+
+
+def client_ip() -> str:
+    """The requesting client's address, taken from X-Forwarded-For behind a trusted proxy"""
+    if SECURITY_CONFIG['trust_proxy_headers']:
+        forwarded = request.headers.get('X-Forwarded-For', '')
+        if forwarded:
+            # The proxy appends the address it saw; earlier entries are client-supplied
+            return forwarded.split(',')[-1].strip()
+    return request.remote_addr or 'unknown'
+
+
+def _session_key(server):
+    # The auth routes keep the portal session token in the Flask session
+    token = session.get('token') if server.secret_key else None
+    return token or request.cookies.get(server.config['SESSION_COOKIE_NAME'])
+
+
+def install_rate_limiter(server, limiter: RateLimiter = None):
+    """Register the limiter as a before_request hook on a Flask server"""
+    if not SECURITY_CONFIG['rate_limiting']:
+        return
+
+    limiter = limiter or rate_limiter
+
+    @server.before_request
+    def enforce_rate_limit():
+        if request.path.startswith(EXEMPT_PREFIXES):
+            return None
+
+        retry_after = limiter.check(request.path, client_ip(), _session_key(server), is_poll_request())
+        if not retry_after:
+            return None
+
+        if request.path.startswith(('/_dash-', '/api/')) or request.is_json:
+            response = jsonify({'error': 'Too many requests, please slow down'})
+        else:
+            response = server.response_class('Too many requests, please slow down', mimetype='text/plain')
+        response.status_code = 429
+        response.headers['Retry-After'] = str(math.ceil(retry_after))
+        return response
+
+
+# Global instance shared by every server in the process
+rate_limiter = RateLimiter()
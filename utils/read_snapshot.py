@@ -0,0 +1,107 @@
+"""
+Read snapshots for reporting queries
+
+Admin reporting (user lists, request history, audit browsing, dashboard stats)
+reads from a copy of the database instead of the live file. The copy is taken
+with the online backup API, swapped into place atomically, and opened with
+immutable=1, so reporting queries take no locks at all and can never delay a
+login or a session check. Snapshots are refreshed on first use after
+DATABASE_CONFIG['reporting_snapshot_seconds'].
+
+DATABASE_CONFIG['reporting_mode'] selects the behaviour:
+    'snapshot' - read from the periodically refreshed copy (default)
+    'readonly' - read the live file with mode=ro (no writes, but shares its locks)
+    'primary'  - plain connection to the live file
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import quote
+
+from config import DATABASE_CONFIG
+
+_refresh_locks = {}
+_refresh_locks_guard = threading.Lock()
+
+
+def _uri(path: str, **params) -> str:
+    query = '&'.join(f"{key}={value}" for key, value in params.items())
+    return f"file:{quote(os.path.abspath(path))}?{query}"
+
+
+def snapshot_path(db_path: str) -> str:
+    folder = DATABASE_CONFIG['reporting_snapshot_folder']
+    return os.path.join(folder, os.path.basename(db_path))
+
+
+def _refresh_lock(db_path: str) -> threading.Lock:
+    with _refresh_locks_guard:
+        return _refresh_locks.setdefault(db_path, threading.Lock())
+
+
+def refresh_snapshot(db_path: str) -> str:
+    """Copy the live database to its snapshot file and swap it in atomically"""
+    path = snapshot_path(db_path)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    partial = f"{path}.{os.getpid()}.{threading.get_ident()}.partial"
+
+    source = sqlite3.connect(_uri(db_path, mode='ro'), uri=True, timeout=30)
+    target = sqlite3.connect(partial)
+    try:
+        source.backup(target, pages=DATABASE_CONFIG['backup_pages_per_step'],
+                      sleep=DATABASE_CONFIG['backup_step_sleep_seconds'])
+    finally:
+        target.close()
+        source.close()
+
+    # Connections already open keep reading the old file until they close
+    os.replace(partial, path)
+    return path
+
+
+def _snapshot_is_fresh(path: str) -> bool:
+    try:
+        age = time.time() - os.path.getmtime(path)
+    except OSError:
+        return False
+    return age < DATABASE_CONFIG['reporting_snapshot_seconds']
+
+
+def get_snapshot(db_path: str) -> str:
+    """Path to a snapshot no older than the configured age, refreshing it if needed"""
+    path = snapshot_path(db_path)
+    if _snapshot_is_fresh(path):
+        return path
+
+    have_previous = os.path.exists(path)
+    lock = _refresh_lock(db_path)
+    if not lock.acquire(blocking=not have_previous):
+        # Another thread is refreshing; the previous snapshot is good enough meanwhile
+        return path
+
+    try:
+        if not _snapshot_is_fresh(path):
+            refresh_snapshot(db_path)
+    finally:
+        lock.release()
+
+    return path
+
+
+def reporting_connection(db_path: str) -> sqlite3.Connection:
+    """Open a connection for read-only reporting queries (see module docstring)"""
+    mode = DATABASE_CONFIG['reporting_mode']
+
+    if mode == 'snapshot' and os.path.exists(db_path):
+        try:
+            return sqlite3.connect(_uri(get_snapshot(db_path), mode='ro', immutable=1), uri=True)
+        except (sqlite3.Error, OSError) as e:
+            print(f"Reporting snapshot unavailable for {db_path}, reading live database: {e}")
+            mode = 'readonly'
+
+    if mode == 'readonly' and os.path.exists(db_path):
+        return sqlite3.connect(_uri(db_path, mode='ro'), uri=True)
+
+    return sqlite3.connect(db_path)
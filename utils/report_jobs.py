@@ -0,0 +1,79 @@
+"""
+Admin report generation
+
+The report runs as a background callback (see utils/background_jobs.py), so it
+is a plain function that reports progress through a progress(done, total,
+message) callable. Database tables are read through reporting_connection (the
+read snapshot, no locks on the live file). The workbook is written by
+utils/streaming_export.py, the same writer as the data exports: rows capped at
+EXPORT_CONFIG['max_export_rows'], an About sheet and the watermark.
+"""
+
+import os
+import tempfile
+from datetime import datetime
+
+import pandas as pd
+
+from utils.database import get_user_stats
+from utils.read_snapshot import reporting_connection
+from utils.streaming_export import DATABASE, MIMETYPES, TABLE_QUERIES, frame_source, sql_source, write_xlsx
+
+REPORT_QUERIES = {
+    'Requests by Status': '''
+        SELECT status, COUNT(*) AS requests FROM access_requests GROUP BY status ORDER BY requests DESC
+    ''',
+    'Requests by Month': '''
+        SELECT strftime('%Y-%m', timestamp) AS month, COUNT(*) AS requests,
+               SUM(status = 'approved') AS approved, SUM(status = 'rejected') AS rejected
+        FROM access_requests GROUP BY month ORDER BY month
+    ''',
+    'Users by Department': '''
+        SELECT COALESCE(department, '(none)') AS department, COUNT(*) AS users, SUM(is_active = 1) AS active
+        FROM users GROUP BY 1 ORDER BY users DESC
+    '''
+}
+
+
+def _query_sheets(queries: dict, db_path: str) -> dict:
+    conn = reporting_connection(db_path)
+    try:
+        return {name: pd.read_sql_query(query, conn) for name, query in queries.items()}
+    finally:
+        conn.close()
+
+
+def _report(progress, done: int, total: int, message: str):
+    if progress is not None:
+        progress(done, total, message)
+
+
+def build_admin_report(progress=None, db_path: str = DATABASE):
+    """The admin 'Generate Report' workbook: (filename, bytes, mimetype)"""
+    total = 4
+
+    _report(progress, 0, total, "Computing statistics")
+    stats = get_user_stats(db_path)
+    summary = pd.DataFrame({'metric': [key.replace('_', ' ').title() for key in stats],
+                            'value': list(stats.values())})
+
+    _report(progress, 1, total, "Summarising requests and users")
+    sheets = {'Summary': summary, **_query_sheets(REPORT_QUERIES, db_path)}
+    exports = [frame_source(name, df) for name, df in sheets.items()]
+
+    _report(progress, 2, total, "Loading users and requests")
+    exports += [sql_source(name, query, db_path) for name, query in TABLE_QUERIES.items()]
+
+    _report(progress, 3, total, "Writing workbook")
+    handle, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(handle)
+    try:
+        write_xlsx(path, 'Admin Report', exports)
+        with open(path, 'rb') as f:
+            data = f.read()
+    finally:
+        os.remove(path)
+
+    _report(progress, total, total, "Done")
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return f"usc_ir_admin_report_{stamp}.xlsx", data, MIMETYPES['xlsx']
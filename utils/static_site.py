@@ -0,0 +1,314 @@
+"""
+Static HTML export of the public pages
+
+The public pages carry no user-specific data, so the build step
+(python export_static.py) renders their component trees to plain HTML with the
+app's own index template, stylesheets and Bootstrap classes. Flask then answers
+GET requests for those pages straight from disk, without loading the Dash
+renderer or running a routing callback. Signed-in visitors, whose navbar
+differs, still get the Dash app.
+
+Only the components the public pages use are translated (html.*, and the
+layout/navigation parts of dash-bootstrap-components); anything else raises
+ValueError at export time instead of producing a broken page.
+"""
+
+import html as html_escape
+import json
+import os
+import re
+
+from flask import request, send_file, session
+
+from config import STATIC_SITE_CONFIG
+
+# Bootstrap's own script for the navbar toggler and dropdowns (version matches dbc.themes.BOOTSTRAP)
+BOOTSTRAP_BUNDLE = 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.6/dist/js/bootstrap.bundle.min.js'
+
+THEME_COLORS = {'primary', 'secondary', 'success', 'info', 'warning', 'danger', 'light', 'dark', 'body', 'white'}
+
+VOID_TAGS = {'br', 'hr', 'img', 'input', 'meta', 'link', 'source'}
+
+# Dash prop -> HTML attribute (props not listed are emitted as-is)
+ATTRIBUTE_NAMES = {'className': 'class', 'htmlFor': 'for', 'srcSet': 'srcset', 'n_clicks': None,
+                   'n_clicks_timestamp': None, 'disable_n_clicks': None, 'loading_state': None}
+
+
+def _css(style: dict) -> str:
+    # React style keys are camelCase: fontWeight -> font-weight
+    declarations = []
+    for key, value in style.items():
+        name = re.sub('([A-Z])', r'-\1', key).lower()
+        declarations.append(f"{name}: {value}")
+    return '; '.join(declarations)
+
+
+def _classes(*names) -> str:
+    return ' '.join(name for name in names if name)
+
+
+def _tag(name: str, attrs: dict, children: str = '') -> str:
+    parts = [name]
+    for key, value in attrs.items():
+        if value is None or value is False:
+            continue
+        if value is True:
+            parts.append(key)
+        else:
+            parts.append(f'{key}="{html_escape.escape(str(value), quote=True)}"')
+
+    opening = f"<{' '.join(parts)}>"
+    return opening if name in VOID_TAGS else f"{opening}{children}</{name}>"
+
+
+def _html_attrs(props: dict) -> dict:
+    attrs = {}
+    for key, value in props.items():
+        if key == 'children':
+            continue
+        name = ATTRIBUTE_NAMES.get(key, key)
+        if name is None:
+            continue
+        if key == 'style':
+            value = _css(value) if value else None
+        elif isinstance(value, (dict, list)):
+            continue
+        attrs[name] = value
+    return attrs
+
+
+def _col_classes(props: dict) -> list:
+    classes = []
+    for breakpoint in ('width', 'xs', 'sm', 'md', 'lg', 'xl', 'xxl'):
+        value = props.get(breakpoint)
+        if value is None:
+            continue
+
+        infix = '' if breakpoint in ('width', 'xs') else f"-{breakpoint}"
+        if isinstance(value, dict):
+            if value.get('size') is not None:
+                classes.append(f"col{infix}-{value['size']}" if value['size'] is not True else f"col{infix}")
+            if value.get('offset') is not None:
+                classes.append(f"offset{infix}-{value['offset']}")
+        else:
+            classes.append(f"col{infix}-{value}" if value is not True else f"col{infix}")
+    return classes or ['col']
+
+
+class StaticRenderer:
+    """Renders serialized Dash component trees (see utils/layout_cache.py) to HTML"""
+
+    def __init__(self, current_path: str = '/'):
+        self.current_path = current_path
+
+    def render(self, node) -> str:
+        if node is None or node is False:
+            return ''
+        if isinstance(node, (list, tuple)):
+            return ''.join(self.render(child) for child in node)
+        if not isinstance(node, dict):
+            return html_escape.escape(str(node))
+
+        namespace, component = node.get('namespace'), node.get('type')
+        props = node.get('props', {})
+
+        if namespace == 'dash_html_components':
+            return _tag(component.lower(), _html_attrs(props), self.render(props.get('children')))
+        if namespace == 'dash_bootstrap_components':
+            method = getattr(self, f"_dbc_{component}", None)
+            if method is not None:
+                return method(props, self.render(props.get('children')))
+
+        raise ValueError(f"No static rendering for {namespace}.{component}")
+
+    # ---------- dash-bootstrap-components ----------
+
+    def _div(self, props, children, *classes):
+        return _tag('div', {'id': props.get('id'), 'class': _classes(*classes, props.get('className')),
+                            'style': _css(props['style']) if props.get('style') else None}, children)
+
+    def _dbc_Container(self, props, children):
+        return self._div(props, children, 'container-fluid' if props.get('fluid') else 'container')
+
+    def _dbc_Row(self, props, children):
+        return self._div(props, children, 'row',
+                         f"align-items-{props['align']}" if props.get('align') else None,
+                         f"justify-content-{props['justify']}" if props.get('justify') else None)
+
+    def _dbc_Col(self, props, children):
+        return self._div(props, children, *_col_classes(props))
+
+    def _dbc_Card(self, props, children):
+        return self._div(props, children, 'card')
+
+    def _dbc_CardBody(self, props, children):
+        return self._div(props, children, 'card-body')
+
+    def _dbc_CardHeader(self, props, children):
+        return self._div(props, children, 'card-header')
+
+    def _dbc_Alert(self, props, children):
+        return self._div(props, children, 'alert', f"alert-{props.get('color', 'success')}")
+
+    def _dbc_Button(self, props, children):
+        classes = _classes('btn', f"btn-{'outline-' if props.get('outline') else ''}{props.get('color', 'primary')}",
+                           f"btn-{props['size']}" if props.get('size') else None, props.get('className'))
+        attrs = {'id': props.get('id'), 'class': classes,
+                 'style': _css(props['style']) if props.get('style') else None}
+        if props.get('href'):
+            return _tag('a', {**attrs, 'href': props['href'], 'target': props.get('target')}, children)
+        return _tag('button', {**attrs, 'type': 'button'}, children)
+
+    def _dbc_ListGroup(self, props, children):
+        return _tag('ul', {'class': _classes('list-group', props.get('className'))}, children)
+
+    def _dbc_ListGroupItem(self, props, children):
+        return _tag('li', {'class': _classes('list-group-item', props.get('className'))}, children)
+
+    def _nav_link(self, props, children, base_class):
+        active = props.get('active')
+        if active == 'exact':
+            active = props.get('href') == self.current_path
+        return _tag('a', {'class': _classes(base_class, 'active' if active is True else None, props.get('className')),
+                          'href': props.get('href'), 'target': props.get('target')}, children)
+
+    def _dbc_Nav(self, props, children):
+        return _tag('ul', {'class': _classes('navbar-nav' if props.get('navbar') else 'nav',
+                                             props.get('className'))}, children)
+
+    def _dbc_NavItem(self, props, children):
+        return _tag('li', {'class': _classes('nav-item', props.get('className'))}, children)
+
+    def _dbc_NavLink(self, props, children):
+        return self._nav_link(props, children, 'nav-link')
+
+    def _dbc_NavbarBrand(self, props, children):
+        return _tag('a', {'class': _classes('navbar-brand', props.get('className')),
+                          'href': props.get('href')}, children)
+
+    def _dbc_DropdownMenuItem(self, props, children):
+        return _tag('li', {}, self._nav_link(props, children, 'dropdown-item'))
+
+    def _dbc_DropdownMenu(self, props, children):
+        toggle = _tag('a', {'class': 'nav-link dropdown-toggle', 'href': '#', 'role': 'button',
+                            'data-bs-toggle': 'dropdown', 'aria-expanded': 'false'},
+                      html_escape.escape(str(props.get('label', ''))))
+        menu = _tag('ul', {'class': 'dropdown-menu dropdown-menu-end'}, children)
+        return _tag('li', {'class': _classes('nav-item dropdown', props.get('className'))}, toggle + menu)
+
+    def _navbar_attrs(self, props):
+        # color is a Bootstrap theme color or any CSS color, as in dbc
+        color = props.get('color')
+        style = dict(props.get('style') or {})
+        if color and color not in THEME_COLORS:
+            style['backgroundColor'] = color
+
+        classes = _classes('navbar navbar-expand-md', 'navbar-dark' if props.get('dark') else 'navbar-light',
+                           f"bg-{color}" if color in THEME_COLORS else None, props.get('className'))
+        return {'class': classes, 'style': _css(style) if style else None}
+
+    def _dbc_Navbar(self, props, children):
+        return _tag('nav', self._navbar_attrs(props), children)
+
+    def _dbc_NavbarSimple(self, props, children):
+        brand = _tag('a', {'class': 'navbar-brand', 'href': props.get('brand_href', '/')},
+                     html_escape.escape(str(props.get('brand', ''))))
+        toggler = _tag('button', {'class': 'navbar-toggler', 'type': 'button', 'data-bs-toggle': 'collapse',
+                                  'data-bs-target': '#static-navbar-collapse'},
+                       '<span class="navbar-toggler-icon"></span>')
+        collapse = _tag('div', {'class': 'collapse navbar-collapse', 'id': 'static-navbar-collapse'},
+                        _tag('ul', {'class': 'navbar-nav ms-auto'}, children))
+        container = _tag('div', {'class': 'container-fluid' if props.get('fluid') else 'container'},
+                         brand + toggler + collapse)
+        return _tag('nav', self._navbar_attrs(props), container)
+
+
+def render_page(app, layout, path: str = '/') -> str:
+    """A complete HTML document for a layout, using the app's index template but no Dash scripts"""
+    body = _tag('div', {'id': 'react-entry-point'}, StaticRenderer(path).render(layout))
+
+    with app.server.test_request_context(path):
+        metas = '\n      '.join(_tag('meta', meta) for meta in app._generate_meta())
+        css = app._generate_css_dist_html()
+
+    return app.interpolate_index(metas=metas, title=app.title, css=css, config='',
+                                 scripts=f'<script src="{BOOTSTRAP_BUNDLE}"></script>',
+                                 app_entry=body, favicon='', renderer='')
+
+
+def export_pages(app, pages: dict, folder: str) -> list:
+    """
+    Write each page to folder as HTML
+    pages: {URL path: layout (component or serialized dict)}
+    Returns the written file paths
+    """
+    from dash._utils import to_json
+
+    os.makedirs(folder, exist_ok=True)
+    written = []
+    manifest = {}
+    for path, layout in pages.items():
+        if not isinstance(layout, dict):
+            layout = json.loads(to_json(layout))
+
+        filename = 'index.html' if path == '/' else f"{path.strip('/')}.html"
+        target = os.path.join(folder, filename)
+        with open(target + '.tmp', 'w', encoding='utf-8') as f:
+            f.write(render_page(app, layout, path))
+        os.replace(target + '.tmp', target)
+
+        manifest[path] = filename
+        written.append(target)
+
+    with open(os.path.join(folder, 'pages.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return written
+
+
+def _is_signed_in(server) -> bool:
+    return bool(server.secret_key and session.get('authenticated'))
+
+
+def install_static_pages(server, folder: str, content_version=None):
+    """
+    Serve exported pages for anonymous GET requests (no query string) before Dash sees them
+    Does nothing until export_static.py has written folder/pages.json
+    content_version: optional callable returning the mtime of the content the pages are
+    built from; once it is newer than the export, Dash serves the pages until the next export
+    """
+    if not STATIC_SITE_CONFIG['enabled']:
+        return
+
+    folder = os.path.abspath(folder)
+    manifest_path = os.path.join(folder, 'pages.json')
+    max_age = STATIC_SITE_CONFIG['max_age_seconds']
+    manifest = {'mtime': None, 'pages': {}}
+
+    def exported_pages() -> dict:
+        # Re-read only when a new export has been written
+        try:
+            mtime = os.path.getmtime(manifest_path)
+            if mtime != manifest['mtime']:
+                with open(manifest_path) as f:
+                    manifest.update(mtime=mtime, pages=json.load(f))
+        except (OSError, ValueError):
+            manifest.update(mtime=None, pages={})
+        return manifest['pages']
+
+    @server.before_request
+    def serve_static_page():
+        if request.method != 'GET' or request.query_string:
+            return None
+
+        filename = exported_pages().get(request.path)
+        if filename is None or _is_signed_in(server):
+            return None
+        if content_version is not None and content_version() > manifest['mtime']:
+            return None
+
+        response = send_file(os.path.join(folder, filename), mimetype='text/html', conditional=True,
+                             etag=True, max_age=max_age)
+        response.cache_control.public = True
+        # The Dash version of these pages is served to signed-in users from the same URL
+        response.vary.add('Cookie')
+        return response
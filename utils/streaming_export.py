@@ -0,0 +1,373 @@
+"""
+Streaming data exports
+
+GET /export/<source>.<fmt>[?sheet=<name>] sends data as CSV or XLSX without
+holding the whole file in memory:
+
+    users, access_requests          - tables read from the reporting snapshot
+                                      with fetchmany (admins only)
+    enrollment, graduation,         - sheets of the DataLoader dataset cache,
+    financial                         walked in slices (all sheets, or ?sheet=)
+    statements                      - the extracted financial statements
+    complete, user_data, academic   - several of the above in one file
+                                      (EXPORT_GROUPS; admins only when they
+                                      include a table)
+
+CSV is encoded and yielded EXPORT_CONFIG['stream_chunk_rows'] rows at a time;
+several sheets become a zip of one CSV each. XLSX is written row by row with
+openpyxl's write-only mode, which spools the sheets to a temporary file. Zip
+and XLSX files are then streamed back in blocks (a zip container can only be
+sent once it is complete). Rows are capped at EXPORT_CONFIG['max_export_rows'],
+and the metadata and watermark follow EXPORT_CONFIG. This is the only export
+writer: the admin Export button links here and the admin report
+(utils/report_jobs.py) is written with write_xlsx.
+"""
+
+import csv
+import io
+import os
+import re
+import tempfile
+import zipfile
+from datetime import datetime
+
+import pandas as pd
+from flask import Response, request, stream_with_context
+
+from config import APP_CONFIG, EXPORT_CONFIG
+from data_loader import data_loader
+from utils.database import log_user_action
+from utils.rate_limit import client_ip
+from utils.read_snapshot import reporting_connection
+
+DATABASE = 'usc_ir.db'
+
+STREAM_FORMATS = ('csv', 'xlsx')
+FILE_BLOCK_SIZE = 64 * 1024
+
+MIMETYPES = {
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'csv': 'text/csv',
+    'zip': 'application/zip'
+}
+
+# Sheet name -> query (no password hashes or reset tokens)
+TABLE_QUERIES = {
+    'Users': '''
+        SELECT id, username, full_name, email, department, position, role, is_active, created_at, last_login
+        FROM users ORDER BY id
+    ''',
+    'Access Requests': '''
+        SELECT id, name, email, department, position, access_type, requested_duration, status, timestamp, approved_at
+        FROM access_requests ORDER BY id
+    '''
+}
+
+# Source -> database query (admin only)
+SQL_SOURCES = {
+    'users': TABLE_QUERIES['Users'],
+    'access_requests': TABLE_QUERIES['Access Requests']
+}
+
+# Source -> DataLoader method returning {sheet: frame}
+FRAME_SOURCES = {
+    'enrollment': 'load_enrollment_data',
+    'graduation': 'load_graduation_data',
+    'financial': 'load_financial_data'
+}
+
+# Source -> the sources exported together (the admin dashboard's export types)
+EXPORT_GROUPS = {
+    'complete': ['users', 'access_requests', 'enrollment', 'graduation', 'financial'],
+    'user_data': ['users', 'access_requests'],
+    'academic': ['enrollment', 'graduation']
+}
+
+
+class ExportError(Exception):
+    """An export that can't be served; status is the HTTP status to answer with"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+class ExportSource:
+    """Columns, row count and a lazy row iterator for one dataset"""
+
+    def __init__(self, title: str, columns: list, total_rows: int, rows):
+        self.title = title
+        self.columns = columns
+        self.total_rows = total_rows
+        self.exported_rows = min(total_rows, EXPORT_CONFIG['max_export_rows'])
+        self._rows = rows
+
+    def rows(self):
+        """Rows as tuples, stopping at the export cap"""
+        remaining = self.exported_rows
+        for row in self._rows(remaining):
+            if remaining <= 0:
+                break
+            remaining -= 1
+            yield row
+
+
+def _clean(value):
+    # NaN/NaT become empty cells; numpy scalars become Python ones
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+
+def sql_source(title: str, query: str, db_path: str = DATABASE) -> ExportSource:
+    conn = reporting_connection(db_path)
+    try:
+        total = conn.execute(f"SELECT COUNT(*) FROM ({query})").fetchone()[0]
+        cursor = conn.execute(f"{query} LIMIT 0")
+        columns = [column[0] for column in cursor.description]
+    finally:
+        conn.close()
+
+    def rows(limit):
+        conn = reporting_connection(db_path)
+        try:
+            cursor = conn.execute(f"{query} LIMIT ?", (limit,))
+            while True:
+                chunk = cursor.fetchmany(EXPORT_CONFIG['stream_chunk_rows'])
+                if not chunk:
+                    break
+                yield from chunk
+        finally:
+            conn.close()
+
+    return ExportSource(title, columns, total, rows)
+
+
+def frame_source(title: str, frame: pd.DataFrame) -> ExportSource:
+    def rows(limit):
+        step = EXPORT_CONFIG['stream_chunk_rows']
+        for start in range(0, min(limit, len(frame)), step):
+            for row in frame.iloc[start:start + step].itertuples(index=False, name=None):
+                yield tuple(_clean(value) for value in row)
+
+    return ExportSource(title, [str(column) for column in frame.columns], len(frame), rows)
+
+
+def requires_admin(source: str) -> bool:
+    """Exports that include a database table are for admins only"""
+    return any(name in SQL_SOURCES for name in EXPORT_GROUPS.get(source, [source]))
+
+
+def _open_sources(source: str, sheet: str = None) -> list:
+    if source in SQL_SOURCES:
+        return [sql_source(source.replace('_', ' ').title(), SQL_SOURCES[source])]
+
+    if source == 'statements':
+        from utils.financial_statements import load_statements
+        frame = load_statements()
+        if frame is None:
+            raise ExportError('Financial statements have not been extracted yet', 404)
+        return [frame_source('Financial Statements', frame)]
+
+    if source not in FRAME_SOURCES:
+        raise ExportError(f"Unknown export source: {source}", 404)
+
+    sheets = getattr(data_loader, FRAME_SOURCES[source])() or {}
+    sheets = {name: frame for name, frame in sheets.items() if isinstance(frame, pd.DataFrame)}
+    if sheet is None:
+        return [frame_source(f"{source.title()} {name}", frame) for name, frame in sheets.items()]
+    if sheet not in sheets:
+        raise ExportError(f"Choose a sheet for {source}: {', '.join(sorted(sheets)) or 'none available'}")
+    return [frame_source(f"{source.title()} {sheet}", sheets[sheet])]
+
+
+def open_export(source: str, sheet: str = None):
+    """Resolve /export/<source>?sheet=<sheet> to (title, [ExportSource])"""
+    if source in EXPORT_GROUPS:
+        if sheet is not None:
+            raise ExportError(f"?sheet= picks one sheet of a single dataset, not of {source}")
+        exports = [export for name in EXPORT_GROUPS[source] for export in _open_sources(name)]
+        title = f"{source.replace('_', ' ').title()} Export"
+    else:
+        exports = _open_sources(source, sheet)
+        title = source.title() if len(exports) != 1 else exports[0].title
+
+    if not exports:
+        raise ExportError(f"No {source} data available", 404)
+    return title, exports
+
+
+def _rows_summary(export: ExportSource) -> str:
+    return f"{export.exported_rows} of {export.total_rows}" + (
+        f" (limited to {EXPORT_CONFIG['max_export_rows']})" if export.exported_rows < export.total_rows else '')
+
+
+def export_metadata(title: str, exports: list) -> list:
+    """(label, value) rows describing an export, per EXPORT_CONFIG"""
+    rows = []
+    if EXPORT_CONFIG['watermark_exports']:
+        rows.append(('Watermark', EXPORT_CONFIG['watermark_text']))
+    if EXPORT_CONFIG['include_metadata']:
+        rows.extend([
+            ('Source', f"{APP_CONFIG['title']} {APP_CONFIG['version']}"),
+            ('Export', title),
+            ('Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        ])
+        if len(exports) == 1:
+            rows.append(('Rows', _rows_summary(exports[0])))
+        else:
+            rows.extend((f"Rows: {export.title}", _rows_summary(export)) for export in exports)
+    return rows
+
+
+def sheet_name(name: str, taken: set) -> str:
+    """A valid, unique Excel sheet name: at most 31 characters, none of []:*?/\\"""
+    base = re.sub(r'[\[\]:*?/\\]', ' ', str(name)).strip()[:31] or 'Data'
+    candidate, n = base, 2
+    while candidate.lower() in taken:
+        suffix = f" ({n})"
+        candidate, n = base[:31 - len(suffix)] + suffix, n + 1
+    taken.add(candidate.lower())
+    return candidate
+
+
+def _csv_chunks(export: ExportSource, metadata: list):
+    """One CSV in chunks of encoded text; metadata comes first as '# label: value' lines"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    for label, value in metadata:
+        buffer.write(f"# {label}: {value}\n")
+    writer.writerow(export.columns)
+
+    pending = 0
+    for row in export.rows():
+        writer.writerow(row)
+        pending += 1
+        if pending >= EXPORT_CONFIG['stream_chunk_rows']:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    yield buffer.getvalue().encode('utf-8')
+
+
+def _stream_file(path: str):
+    """A temporary file's content in blocks; the file is removed afterwards"""
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(FILE_BLOCK_SIZE), b''):
+                yield block
+    finally:
+        os.remove(path)
+
+
+def _temp_path(suffix: str) -> str:
+    handle, path = tempfile.mkstemp(suffix=suffix)
+    os.close(handle)
+    return path
+
+
+def stream_csv(title: str, exports: list):
+    """A CSV, or a zip of one CSV per sheet (each with its own metadata) spooled to a temporary file"""
+    if len(exports) == 1:
+        yield from _csv_chunks(exports[0], export_metadata(title, exports))
+        return
+
+    path = _temp_path('.zip')
+    try:
+        taken = set()
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for export in exports:
+                with archive.open(f"{sheet_name(export.title, taken)}.csv", 'w') as member:
+                    for chunk in _csv_chunks(export, export_metadata(export.title, [export])):
+                        member.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    yield from _stream_file(path)
+
+
+def write_xlsx(path: str, title: str, exports: list):
+    """A write-only workbook: an About sheet with the metadata, then one sheet per export"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    taken = set()
+    metadata = export_metadata(title, exports)
+    if metadata:
+        about = workbook.create_sheet(sheet_name('About', taken))
+        for row in metadata:
+            about.append(row)
+
+    for export in exports:
+        sheet = workbook.create_sheet(sheet_name(export.title, taken))
+        if EXPORT_CONFIG['watermark_exports']:
+            sheet.oddHeader.center.text = EXPORT_CONFIG['watermark_text']
+            sheet.oddFooter.center.text = EXPORT_CONFIG['watermark_text']
+        sheet.append(export.columns)
+        for row in export.rows():
+            sheet.append(row)
+
+    workbook.save(path)
+
+
+def stream_xlsx(title: str, exports: list):
+    """A workbook spooled to a temporary file, then sent in blocks"""
+    path = _temp_path('.xlsx')
+    try:
+        write_xlsx(path, title, exports)
+    except BaseException:
+        os.remove(path)
+        raise
+    yield from _stream_file(path)
+
+
+WRITERS = {
+    'csv': stream_csv,
+    'xlsx': stream_xlsx
+}
+
+
+def export_response(source: str, fmt: str, sheet: str = None) -> Response:
+    """A streamed attachment for one dataset or export group (raises ExportError)"""
+    if fmt not in EXPORT_CONFIG['formats']:
+        raise ExportError(f"Unsupported export format: {fmt}")
+    if fmt not in STREAM_FORMATS:
+        raise ExportError(f"{fmt.upper()} exports can't be streamed; use {' or '.join(STREAM_FORMATS)}")
+
+    title, exports = open_export(source, sheet)
+    extension = 'zip' if fmt == 'csv' and len(exports) > 1 else fmt
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = re.sub(r'\W+', '_', title.lower()).strip('_') + f"_{stamp}.{extension}"
+
+    response = Response(stream_with_context(WRITERS[fmt](title, exports)), mimetype=MIMETYPES[extension])
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response.headers['Cache-Control'] = 'no-store'
+    response.headers['X-Export-Rows'] = str(sum(export.exported_rows for export in exports))
+    return response
+
+
+def install_export_routes(server, session_payload):
+    """
+    Serve /export/<source>.<fmt> on a Flask server
+    session_payload() returns the signed-in user's session summary (auth_routes.get_session_payload)
+    """
+
+    @server.route('/export/<source>.<fmt>')
+    def stream_export(source, fmt):
+        user = session_payload() or {}
+        if not user.get('authenticated'):
+            return server.response_class('Sign in to export data', status=401, mimetype='text/plain')
+        if requires_admin(source) and user.get('role') != 'admin':
+            return server.response_class('Admin access required', status=403, mimetype='text/plain')
+
+        try:
+            response = export_response(source, fmt, request.args.get('sheet'))
+        except ExportError as e:
+            return server.response_class(str(e), status=e.status, mimetype='text/plain')
+
+        log_user_action(user.get('user_id'), 'export', source,
+                        f"{fmt}, {response.headers['X-Export-Rows']} rows", client_ip())
+        return response
@@ -0,0 +1,136 @@
+"""
+Server-side paging, filtering and sorting for Dash DataTables
+
+Tables with page_action/sort_action/filter_action='custom' send their
+page_current, page_size, sort_by and filter_query to a callback. These helpers
+turn them into one parameterized SQL query (plus a COUNT for page_count), so
+only the visible page ever leaves the database.
+
+Column ids are looked up in a whitelist of SQL expressions; anything else in a
+filter or sort is ignored rather than interpolated.
+"""
+
+import math
+import re
+import sqlite3
+
+from utils.read_snapshot import reporting_connection
+
+# DataTable operator (without its s/i case prefix) -> SQL operator
+COMPARISON_OPERATORS = {
+    '=': '=', 'eq': '=',
+    '!=': '!=', 'ne': '!=',
+    '<': '<', 'lt': '<',
+    '<=': '<=', 'le': '<=',
+    '>': '>', 'gt': '>',
+    '>=': '>=', 'ge': '>=',
+}
+
+FILTER_PART = re.compile(r'^\{(?P<column>[^}]+)\}\s+(?P<operator>\S+)(?:\s+(?P<value>.*))?$')
+
+
+def _parse_value(raw: str):
+    """Strip DataTable quoting, or convert bare numbers"""
+    raw = raw.strip()
+    if len(raw) >= 2 and raw[0] == raw[-1] and raw[0] in ('"', "'", '`'):
+        return raw[1:-1].replace('\\' + raw[0], raw[0])
+
+    try:
+        return float(raw) if '.' in raw else int(raw)
+    except ValueError:
+        return raw
+
+
+def _escape_like(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def build_where_clause(filter_query: str, columns: dict):
+    """Translate a DataTable filter_query into a WHERE clause and its parameters"""
+    conditions = []
+    params = []
+
+    for part in (filter_query or '').split(' && '):
+        match = FILTER_PART.match(part.strip())
+        if not match or match.group('column') not in columns:
+            continue
+
+        expression = columns[match.group('column')]
+        operator = match.group('operator').lower()
+        raw_value = match.group('value') or ''
+
+        if operator == 'is':
+            if raw_value.strip() in ('blank', 'nil'):
+                conditions.append(f"({expression} IS NULL OR {expression} = '')")
+            continue
+
+        # s= / i= / scontains / icontains ... only change case sensitivity client-side
+        if operator[:1] in ('s', 'i') and (operator[1:] in COMPARISON_OPERATORS
+                                            or operator[1:] in ('contains', 'datestartswith')):
+            operator = operator[1:]
+
+        value = _parse_value(raw_value)
+
+        if operator in COMPARISON_OPERATORS:
+            conditions.append(f"{expression} {COMPARISON_OPERATORS[operator]} ?")
+            params.append(value)
+        elif operator == 'contains':
+            conditions.append(f"{expression} LIKE ? ESCAPE '\\'")
+            params.append(f"%{_escape_like(value)}%")
+        elif operator == 'datestartswith':
+            conditions.append(f"{expression} LIKE ? ESCAPE '\\'")
+            params.append(f"{_escape_like(value)}%")
+
+    where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    return where_sql, params
+
+
+def build_order_clause(sort_by, columns: dict, default_order: str) -> str:
+    """Translate DataTable sort_by into ORDER BY, keeping the default order as a tie-breaker"""
+    terms = []
+    for sort in sort_by or []:
+        expression = columns.get(sort.get('column_id'))
+        if expression:
+            direction = 'DESC' if sort.get('direction') == 'desc' else 'ASC'
+            terms.append(f"{expression} {direction}")
+
+    terms.append(default_order)
+    return f"ORDER BY {', '.join(terms)}"
+
+
+def fetch_table_page(db_path: str, table_spec: dict, page_current: int = 0, page_size: int = 10,
+                     sort_by=None, filter_query: str = '', base_filter: tuple = None):
+    """
+    Fetch one page of rows for a DataTable
+    table_spec: {'from': FROM clause, 'columns': {column id: SQL expression},
+                 'default_order': ORDER BY terms that end in a unique column}
+    base_filter: optional (condition, params) always applied, e.g. ("status = ?", ['pending'])
+    Returns (records, page_count)
+    """
+    columns = table_spec['columns']
+    where_sql, params = build_where_clause(filter_query, columns)
+
+    if base_filter:
+        condition, base_params = base_filter
+        where_sql = f"{where_sql} AND ({condition})" if where_sql else f"WHERE {condition}"
+        params = params + list(base_params)
+
+    order_sql = build_order_clause(sort_by, columns, table_spec['default_order'])
+    select_sql = ', '.join(f"{expression} AS {column_id}" for column_id, expression in columns.items())
+
+    page_current = max(int(page_current or 0), 0)
+    page_size = max(int(page_size or 10), 1)
+
+    conn = reporting_connection(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        total = conn.execute(f"SELECT COUNT(*) FROM {table_spec['from']} {where_sql}", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT {select_sql} FROM {table_spec['from']} {where_sql} {order_sql} LIMIT ? OFFSET ?",
+            params + [page_size, page_current * page_size]
+        ).fetchall()
+    finally:
+        conn.close()
+
+    page_count = max(math.ceil(total / page_size), 1)
+    return [dict(row) for row in rows], page_count